@@ -2,10 +2,12 @@
  * TanStack Start Custom Server Entry
  *
  * 이 파일은 서버 요청을 처리하는 진입점입니다.
- * API 라우트(sitemap, offline-db)를 먼저 처리하고 나머지는 TanStack Start로 전달합니다.
+ * 사이트맵(빌드 때 만든 정적 파일)과 API 라우트(offline-db)를 먼저 처리하고
+ * 나머지는 TanStack Start로 전달합니다.
  */
 
 import tanstackHandler from '@tanstack/react-start/server-entry';
+import { loadIdRedirects } from './services/id-redirects';
 
 // ============================================================================
 // Helpers
@@ -13,52 +15,15 @@ import tanstackHandler from '@tanstack/react-start/server-entry';
 
 const SITE_URL = 'https://context.soundbluemusic.com';
 
-function getCurrentDateString(): string {
-  return new Date().toISOString().slice(0, 10);
-}
-
-function generateBilingualUrl(
-  path: string,
-  priority: string,
-  changefreq: string,
-  now: string,
-): string {
-  const enUrl = `${SITE_URL}${path}`;
-  const koUrl = `${SITE_URL}/ko${path === '/' ? '' : path}`;
-
-  return `  <url>
-    <loc>${enUrl}</loc>
-    <lastmod>${now}</lastmod>
-    <changefreq>${changefreq}</changefreq>
-    <priority>${priority}</priority>
-    <xhtml:link rel="alternate" hreflang="en" href="${enUrl}"/>
-    <xhtml:link rel="alternate" hreflang="ko" href="${koUrl}"/>
-    <xhtml:link rel="alternate" hreflang="x-default" href="${enUrl}"/>
-  </url>
-  <url>
-    <loc>${koUrl}</loc>
-    <lastmod>${now}</lastmod>
-    <changefreq>${changefreq}</changefreq>
-    <priority>${priority}</priority>
-    <xhtml:link rel="alternate" hreflang="en" href="${enUrl}"/>
-    <xhtml:link rel="alternate" hreflang="ko" href="${koUrl}"/>
-    <xhtml:link rel="alternate" hreflang="x-default" href="${enUrl}"/>
-  </url>`;
-}
-
 interface CloudflareEnv {
   DB?: D1Database;
+  ASSETS?: Fetcher;
 }
 
 function getD1Database(env: CloudflareEnv): D1Database | null {
   return env?.DB ?? null;
 }
 
-const xmlHeaders = {
-  'Content-Type': 'application/xml; charset=utf-8',
-  'Cache-Control': 'public, max-age=3600, s-maxage=86400',
-};
-
 const jsonHeaders = {
   'Content-Type': 'application/json',
   'Cache-Control': 'public, max-age=3600',
@@ -68,151 +33,6 @@ const jsonHeaders = {
 // API Route Handlers
 // ============================================================================
 
-const STATIC_PAGES = [
-  { path: '/', priority: '1.0', changefreq: 'weekly' },
-  { path: '/about', priority: '0.8', changefreq: 'monthly' },
-  { path: '/browse', priority: '0.9', changefreq: 'weekly' },
-  { path: '/download', priority: '0.7', changefreq: 'monthly' },
-  { path: '/built-with', priority: '0.5', changefreq: 'monthly' },
-  { path: '/license', priority: '0.3', changefreq: 'yearly' },
-  { path: '/privacy', priority: '0.3', changefreq: 'yearly' },
-  { path: '/terms', priority: '0.3', changefreq: 'yearly' },
-];
-
-async function handleSitemapIndex(env: CloudflareEnv): Promise<Response> {
-  const db = getD1Database(env);
-
-  if (!db) {
-    return new Response('Database not available', {
-      status: 503,
-      headers: { 'Content-Type': 'text/plain' },
-    });
-  }
-
-  try {
-    const { results: categories } = await db
-      .prepare('SELECT id FROM categories ORDER BY sort_order')
-      .all<{ id: string }>();
-
-    const now = getCurrentDateString();
-    const sitemaps = [
-      { loc: `${SITE_URL}/sitemap-pages.xml`, lastmod: now },
-      { loc: `${SITE_URL}/sitemap-categories.xml`, lastmod: now },
-      ...categories.map((cat) => ({
-        loc: `${SITE_URL}/sitemaps/entries/${cat.id}.xml`,
-        lastmod: now,
-      })),
-    ];
-
-    const xml = `<?xml version="1.0" encoding="UTF-8"?>
-<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>
-<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-${sitemaps
-  .map(
-    (s) => `  <sitemap>
-    <loc>${s.loc}</loc>
-    <lastmod>${s.lastmod}</lastmod>
-  </sitemap>`,
-  )
-  .join('\n')}
-</sitemapindex>`;
-
-    return new Response(xml, { headers: xmlHeaders });
-  } catch (error) {
-    console.error('Failed to generate sitemap index:', error);
-    return new Response('Failed to generate sitemap', { status: 500 });
-  }
-}
-
-function handleSitemapPages(): Response {
-  const now = getCurrentDateString();
-  const urls = STATIC_PAGES.map((page) =>
-    generateBilingualUrl(page.path, page.priority, page.changefreq, now),
-  ).join('\n');
-
-  const xml = `<?xml version="1.0" encoding="UTF-8"?>
-<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
-        xmlns:xhtml="http://www.w3.org/1999/xhtml">
-${urls}
-</urlset>`;
-
-  return new Response(xml, { headers: xmlHeaders });
-}
-
-async function handleSitemapCategories(env: CloudflareEnv): Promise<Response> {
-  const db = getD1Database(env);
-
-  if (!db) {
-    return new Response('Database not available', {
-      status: 503,
-      headers: { 'Content-Type': 'text/plain' },
-    });
-  }
-
-  try {
-    const { results: categories } = await db
-      .prepare('SELECT id FROM categories ORDER BY sort_order')
-      .all<{ id: string }>();
-
-    const now = getCurrentDateString();
-    const urls = categories
-      .map((cat) => generateBilingualUrl(`/category/${cat.id}`, '0.8', 'weekly', now))
-      .join('\n');
-
-    const xml = `<?xml version="1.0" encoding="UTF-8"?>
-<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
-        xmlns:xhtml="http://www.w3.org/1999/xhtml">
-${urls}
-</urlset>`;
-
-    return new Response(xml, { headers: xmlHeaders });
-  } catch (error) {
-    console.error('Failed to generate categories sitemap:', error);
-    return new Response('Failed to generate sitemap', { status: 500 });
-  }
-}
-
-async function handleSitemapEntries(env: CloudflareEnv, categoryId: string): Promise<Response> {
-  const db = getD1Database(env);
-
-  if (!db) {
-    return new Response('Database not available', {
-      status: 503,
-      headers: { 'Content-Type': 'text/plain' },
-    });
-  }
-
-  try {
-    const { results: entries } = await db
-      .prepare('SELECT id FROM entries WHERE category_id = ?')
-      .bind(categoryId)
-      .all<{ id: string }>();
-
-    if (entries.length === 0) {
-      return new Response('Category not found or empty', { status: 404 });
-    }
-
-    const now = getCurrentDateString();
-    const urls = entries
-      .map((entry) => generateBilingualUrl(`/entry/${entry.id}`, '0.6', 'monthly', now))
-      .join('\n');
-
-    const xml = `<?xml version="1.0" encoding="UTF-8"?>
-<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
-        xmlns:xhtml="http://www.w3.org/1999/xhtml">
-${urls}
-</urlset>`;
-
-    return new Response(xml, { headers: xmlHeaders });
-  } catch (error) {
-    console.error(`Failed to generate entry sitemap for ${categoryId}:`, error);
-    return new Response('Failed to generate sitemap', { status: 500 });
-  }
-}
-
 async function handleOfflineDb(env: CloudflareEnv): Promise<Response> {
   const db = getD1Database(env);
 
@@ -275,6 +95,32 @@ async function handleOfflineDb(env: CloudflareEnv): Promise<Response> {
   }
 }
 
+async function handleLegacyEntryId(
+  assets: Fetcher,
+  url: URL,
+  localePrefix: string,
+  encodedId: string,
+): Promise<Response | null> {
+  let id: string;
+  try {
+    id = decodeURIComponent(encodedId);
+  } catch {
+    return null;
+  }
+
+  const table = await loadIdRedirects(assets, url.origin);
+  const newId = table?.lookup(id);
+  if (!newId) {
+    return null;
+  }
+  return new Response(null, {
+    status: 301,
+    headers: {
+      Location: `${SITE_URL}${localePrefix}/entry/${encodeURIComponent(newId)}${url.search}`,
+    },
+  });
+}
+
 // ============================================================================
 // API Router
 // ============================================================================
@@ -283,23 +129,14 @@ async function handleApiRoute(request: Request, env: CloudflareEnv): Promise<Res
   const url = new URL(request.url);
   const pathname = url.pathname;
 
-  // Sitemap routes
-  if (pathname === '/sitemap.xml') {
-    return handleSitemapIndex(env);
-  }
-
-  if (pathname === '/sitemap-pages.xml') {
-    return handleSitemapPages();
-  }
-
-  if (pathname === '/sitemap-categories.xml') {
-    return handleSitemapCategories(env);
-  }
-
-  // /sitemaps/entries/:categoryId.xml
-  const entrySitemapMatch = pathname.match(/^\/sitemaps\/entries\/([^/]+)\.xml$/);
-  if (entrySitemapMatch?.[1]) {
-    return handleSitemapEntries(env, entrySitemapMatch[1]);
+  // Sitemap routes: scripts/generate-sitemaps.py 가 빌드 전에 public/ 에 만든 정적 파일
+  if (
+    env.ASSETS &&
+    (pathname === '/sitemap.xml' ||
+      /^\/sitemap-(pages|categories)(-\d+)?\.xml$/.test(pathname) ||
+      /^\/sitemaps\/entries\/[^/]+\.xml$/.test(pathname))
+  ) {
+    return env.ASSETS.fetch(request);
   }
 
   // Legacy sitemap URL redirect: /sitemap-entry-{categoryId}.xml → /sitemaps/entries/{categoryId}.xml
@@ -312,6 +149,17 @@ async function handleApiRoute(request: Request, env: CloudflareEnv): Promise<Res
     });
   }
 
+  // Legacy entry ID redirect: /entry/w-블rogeu → /entry/w-beulrogeu
+  // 마이그레이션된 ID 와 병합으로 지운 ID (ASCII 일 수 있음) 모두 테이블에 있음.
+  // 테이블은 isolate 당 한 번만 읽고, 조회는 고정된 횟수의 읽기
+  const entryMatch = pathname.match(/^(\/ko)?\/entry\/([^/]+)$/);
+  if (entryMatch?.[2] && env.ASSETS) {
+    const redirect = await handleLegacyEntryId(env.ASSETS, url, entryMatch[1] ?? '', entryMatch[2]);
+    if (redirect) {
+      return redirect;
+    }
+  }
+
   // API routes
   if (pathname === '/api/offline-db') {
     return handleOfflineDb(env);
@@ -241,8 +241,24 @@ export interface HomonymEntryFromD1 {
   word: { ko: string; en: string };
 }
 
+/** 동음이의어 조회 결과 행 (translations 는 entry_translations 행이 없을 때만 채워짐) */
+interface HomonymRow {
+  id: string;
+  korean: string;
+  romanization: string;
+  category_id: string;
+  word_ko: string | null;
+  word_en: string | null;
+  translations: string | null;
+}
+
 /**
  * D1에서 동음이의어 조회 (같은 korean, 다른 id)
+ *
+ * 단어는 entry_translations 에서 읽습니다. 그 행이 없는 엔트리 (내보내기 전) 만
+ * translations JSON 을 함께 받아 행마다 파싱하므로, 잘못된 JSON 한 행이 전체 조회를
+ * 실패시키지 않습니다. entry_translations 테이블은 migrations/0004 가 만들므로
+ * 마이그레이션을 배포보다 먼저 적용해야 합니다.
  */
 export async function getHomonymsByKoreanFromD1(
   db: D1Database,
@@ -251,43 +267,46 @@ export async function getHomonymsByKoreanFromD1(
   try {
     const { results } = await db
       .prepare(
-        'SELECT id, korean, romanization, category_id, translations FROM entries WHERE korean = ?',
+        `SELECT e.id, e.korean, e.romanization, e.category_id,
+           ko.word AS word_ko, en.word AS word_en,
+           CASE WHEN ko.word IS NULL OR en.word IS NULL THEN e.translations END AS translations
+         FROM entries e
+         LEFT JOIN entry_translations ko ON ko.entry_id = e.id AND ko.locale = 'ko'
+         LEFT JOIN entry_translations en ON en.entry_id = e.id AND en.locale = 'en'
+         WHERE e.korean = ?`,
       )
       .bind(korean)
-      .all<{
-        id: string;
-        korean: string;
-        romanization: string;
-        category_id: string;
-        translations: string;
-      }>();
-
-    return results.map((row) => {
-      let word = { ko: '', en: '' };
-      try {
-        const translations = JSON.parse(row.translations);
-        word = {
-          ko: translations.ko?.word || '',
-          en: translations.en?.word || '',
-        };
-      } catch {
-        // translations 파싱 실패 시 빈 값 사용
-      }
+      .all<HomonymRow>();
 
-      return {
-        id: row.id,
-        korean: row.korean,
-        romanization: row.romanization,
-        categoryId: row.category_id,
-        word,
-      };
-    });
+    return results.map((row) => ({
+      id: row.id,
+      korean: row.korean,
+      romanization: row.romanization,
+      categoryId: row.category_id,
+      word: homonymWord(row),
+    }));
   } catch (error) {
     logD1Error(`getHomonymsByKorean(${korean})`, error);
     return [];
   }
 }
 
+/** entry_translations 의 단어, 없으면 translations JSON 의 단어 */
+function homonymWord(row: HomonymRow): { ko: string; en: string } {
+  let fallback: { ko?: { word?: string }; en?: { word?: string } } = {};
+  if (row.translations) {
+    try {
+      fallback = JSON.parse(row.translations) ?? {};
+    } catch {
+      // translations 파싱 실패 시 빈 값 사용
+    }
+  }
+  return {
+    ko: row.word_ko ?? fallback.ko?.word ?? '',
+    en: row.word_en ?? fallback.en?.word ?? '',
+  };
+}
+
 // ============================================================================
 // 태그 관련 함수
 // ============================================================================
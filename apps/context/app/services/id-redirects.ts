@@ -0,0 +1,114 @@
+/**
+ * 이전 엔트리 ID → 새 ID 리다이렉트 테이블
+ *
+ * scripts/migrate-ids.py (ASCII 로 바꾼 ID) 와 scripts/find-near-duplicates.py --merge
+ * (병합으로 지운 ID) 가 만든 /data/id-redirects.bin (최소 완전 해시 테이블) 을 읽습니다.
+ * ID 하나를 찾는 데 버킷 시드, 슬롯, 문자열 두 개만 읽으므로
+ * 리다이렉트 규칙 목록을 훑거나 D1 을 조회하지 않습니다.
+ * 형식은 scripts/pipeline/id_migration.py 와 같습니다.
+ *
+ * @environment server-only
+ */
+
+export const ID_REDIRECTS_PATH = '/data/id-redirects.bin';
+
+const MAGIC = 0x54524449; // "IDRT" (little-endian)
+const TABLE_VERSION = 1;
+const HEADER_SIZE = 24;
+const GOLDEN = 0x9e3779b9;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+function fnv1a(bytes: Uint8Array, salt: number): number {
+  let h = (0x811c9dc5 ^ salt) >>> 0;
+  for (const byte of bytes) {
+    h = Math.imul(h ^ byte, 0x01000193) >>> 0;
+  }
+  return h;
+}
+
+function fmix32(value: number): number {
+  let h = value >>> 0;
+  h ^= h >>> 16;
+  h = Math.imul(h, 0x85ebca6b);
+  h ^= h >>> 13;
+  h = Math.imul(h, 0xc2b2ae35);
+  h ^= h >>> 16;
+  return h >>> 0;
+}
+
+function slotHash(base: number, seed: number): number {
+  return fmix32(base + Math.imul(seed, GOLDEN));
+}
+
+/**
+ * 리다이렉트 테이블 (이전 ID → 새 ID)
+ */
+export class IdRedirectTable {
+  private readonly view: DataView;
+  private readonly bytes: Uint8Array;
+  private readonly count: number;
+  private readonly buckets: number;
+  private readonly salt: number;
+  private readonly strings: number;
+
+  constructor(buffer: ArrayBuffer) {
+    this.view = new DataView(buffer);
+    this.bytes = new Uint8Array(buffer);
+    if (
+      this.view.getUint32(0, true) !== MAGIC ||
+      this.view.getUint16(4, true) !== TABLE_VERSION
+    ) {
+      throw new Error(`Not an ID redirect table (version ${TABLE_VERSION})`);
+    }
+    this.count = this.view.getUint32(8, true);
+    this.buckets = this.view.getUint32(12, true);
+    this.salt = this.view.getUint32(16, true);
+    this.strings = this.view.getUint32(20, true);
+  }
+
+  get size(): number {
+    return this.count;
+  }
+
+  private stringAt(offset: number): Uint8Array {
+    const start = this.strings + offset;
+    const length = this.view.getUint16(start, true);
+    return this.bytes.subarray(start + 2, start + 2 + length);
+  }
+
+  /**
+   * 이전 ID 의 새 ID (테이블에 없으면 null)
+   */
+  lookup(id: string): string | null {
+    if (this.count === 0) return null;
+    const key = encoder.encode(id);
+    const base = fnv1a(key, this.salt);
+    const seed = this.view.getUint32(HEADER_SIZE + 4 * (slotHash(base, 0) % this.buckets), true);
+    const slot = slotHash(base, seed) % this.count;
+    const slotOffset = HEADER_SIZE + 4 * this.buckets + 8 * slot;
+    const old = this.stringAt(this.view.getUint32(slotOffset, true));
+    if (old.length !== key.length || old.some((byte, i) => byte !== key[i])) return null;
+    return decoder.decode(this.stringAt(this.view.getUint32(slotOffset + 4, true)));
+  }
+}
+
+let tablePromise: Promise<IdRedirectTable | null> | null = null;
+
+/**
+ * 리다이렉트 테이블을 isolate 당 한 번만 읽어 캐시 (없으면 null)
+ */
+export function loadIdRedirects(assets: Fetcher, origin: string): Promise<IdRedirectTable | null> {
+  tablePromise ??= assets
+    .fetch(new URL(ID_REDIRECTS_PATH, origin))
+    .then(async (response) =>
+      response.ok ? new IdRedirectTable(await response.arrayBuffer()) : null,
+    )
+    .catch(() => {
+      // 일시적인 실패는 다음 요청에서 다시 시도
+      tablePromise = null;
+      return null;
+    });
+  return tablePromise;
+}
@@ -2,6 +2,7 @@
 -- WARNING: This will delete all data!
 
 DROP TABLE IF EXISTS conversations;
+DROP TABLE IF EXISTS entry_translations;
 DROP TABLE IF EXISTS entries;
 DROP TABLE IF EXISTS categories;
 DROP INDEX IF EXISTS idx_entries_category;
@@ -0,0 +1,20 @@
+-- D1 Schema for Context App
+-- Migration: 0004_entry_translations
+-- Created: 2026-10-17
+-- Note: per-locale entry text, written by scripts/export-d1.py alongside entries.translations
+
+-- ============================================
+-- Entry Translations Table
+-- ============================================
+-- One row per entry and locale, so the per-locale text can be read
+-- without parsing the entries.translations JSON
+CREATE TABLE IF NOT EXISTS entry_translations (
+  entry_id TEXT NOT NULL,
+  locale TEXT NOT NULL,   -- "ko" | "en"
+  word TEXT,
+  explanation TEXT,
+  examples TEXT,          -- JSON object: { beginner: "...", ... }
+  variations TEXT,        -- JSON object: { formal: [...], casual: [...], short: [...] }
+  dialogue TEXT,          -- JSON object: { context, dialogue: [...] }
+  PRIMARY KEY (entry_id, locale)
+);
@@ -3,6 +3,20 @@
  */
 
 export { SearchEngine } from './engine';
+export type {
+  HangulGramIndex,
+  PrebuiltManifest,
+  PrebuiltResult,
+  PrebuiltShard,
+} from './prebuilt';
+export {
+  PREBUILT_INDEX_VERSION,
+  PrebuiltIndex,
+  chosungSequence,
+  jamoSequence,
+  prebuiltShardKey,
+  tokenizePrebuilt,
+} from './prebuilt';
 export type { SearchableItem, SearchConfig, SearchResult, WorkerMessage } from './types';
 export {
   createSearchHandler,
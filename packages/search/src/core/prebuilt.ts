@@ -0,0 +1,444 @@
+/**
+ * @fileoverview Prebuilt Sharded Search Index
+ * @environment universal
+ *
+ * 데이터 파이프라인(`scripts/build-search-index.py`)이 미리 만든 역색인을 읽어
+ * 검색 / 자동완성을 수행합니다. 런타임에 `addAll`로 인덱스를 만들지 않으므로
+ * 콜드 스타트에 전체 어휘를 토큰화하는 비용이 없습니다.
+ *
+ * 샤드는 용어의 첫 글자(한글은 초성, 영문은 글자)로 나뉘어 있어,
+ * 쿼리의 각 단어마다 샤드 하나만 받으면 됩니다.
+ *
+ * @example
+ * ```typescript
+ * import { PrebuiltIndex } from '@soundblue/search';
+ *
+ * const base = '/data/context/';
+ * const index = await PrebuiltIndex.load(base + 'search/manifest.json', (file) =>
+ *   fetch(base + file).then((r) => r.json()),
+ * );
+ *
+ * const results = await index.search('출발', 10);
+ * const suggestions = await index.suggest('chul', 5);
+ *
+ * // 초성 검색 / 덜 조합된 입력, 오타 허용 검색
+ * const byChosung = await index.searchChosung('ㅊㅂ');
+ * const fuzzy = await index.searchJamo('안녕하새요', 5);
+ * ```
+ */
+
+/** `search/manifest.json` */
+export interface PrebuiltManifest {
+  version: number;
+  fields: string[];
+  fieldBits: number;
+  storeFields: string[];
+  documentCount: number;
+  documents: { file: string; bytes: number; sha256: string };
+  shards: Record<string, { file: string; bytes: number; sha256: string; terms: number }>;
+  /** docs.json 에서 대화가 시작하는 위치와 개수 (엔트리 뒤에 이어짐) */
+  conversations: { start: number; count: number };
+  hangul: Partial<
+    Record<'chosung' | 'jamo', { file: string; bytes: number; sha256: string; grams: number }>
+  >;
+}
+
+/** `search/chosung.json`, `search/jamo.json` - n-gram 별 인코딩된 포스팅 */
+export interface HangulGramIndex {
+  version: number;
+  kind: 'chosung' | 'jamo';
+  grams: string[];
+  /** 문서마다 `문서 - 이전 문서` */
+  postings: number[][];
+  /** chosung: 문서별 초성 열 (후보 검증용) */
+  sequences?: string[];
+  /** jamo: 문서별 n-gram 수 (유사도 계산용) */
+  gramCounts?: number[];
+}
+
+/** `search/<key>.json` - 정렬된 용어와 용어별 인코딩된 포스팅 */
+export interface PrebuiltShard {
+  version: number;
+  key: string;
+  terms: string[];
+  /** 문서마다 `(문서 - 이전 문서) << fieldBits | 필드 마스크` */
+  postings: number[][];
+}
+
+/** 검색 결과 - `item`은 storeFields 값 */
+export interface PrebuiltResult {
+  id: string;
+  score: number;
+  /** 매칭된 용어 → 필드 목록 */
+  match: Record<string, string[]>;
+  item: Record<string, unknown>;
+}
+
+/** 파이프라인이 지원하는 인덱스 형식 버전 */
+export const PREBUILT_INDEX_VERSION = 1;
+
+const HANGUL_BASE = 0xac00;
+const HANGUL_END = 0xd7a3;
+const SYLLABLES_PER_CHOSUNG = 21 * 28;
+
+/** 접두어로만 매칭된 용어의 점수 비율 */
+const PREFIX_WEIGHT = 0.5;
+
+const CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+const JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ';
+const JONGSUNG = ['', ...'ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'];
+/** 두벌식 키보드로 입력하는 순서대로 나눈 겹모음 / 겹받침 */
+const COMPOUND_JAMO: Record<string, string> = {
+  ㅘ: 'ㅗㅏ', ㅙ: 'ㅗㅐ', ㅚ: 'ㅗㅣ', ㅝ: 'ㅜㅓ', ㅞ: 'ㅜㅔ', ㅟ: 'ㅜㅣ', ㅢ: 'ㅡㅣ',
+  ㄳ: 'ㄱㅅ', ㄵ: 'ㄴㅈ', ㄶ: 'ㄴㅎ', ㄺ: 'ㄹㄱ', ㄻ: 'ㄹㅁ', ㄼ: 'ㄹㅂ',
+  ㄽ: 'ㄹㅅ', ㄾ: 'ㄹㅌ', ㄿ: 'ㄹㅍ', ㅀ: 'ㄹㅎ', ㅄ: 'ㅂㅅ',
+};
+const COMPAT_JAMO_FIRST = 0x3131;
+const COMPAT_JAMO_LAST = 0x3163;
+const JAMO_GRAM = 3;
+const JAMO_START = '^';
+
+/** MiniSearch 기본 토크나이저와 같은 구분자 (파이프라인의 tokenize 와 일치) */
+const SPACE_OR_PUNCTUATION = /[\n\r\p{Z}\p{P}]+/u;
+
+/**
+ * 텍스트를 소문자 용어로 나눕니다. 파이프라인의 `tokenize`와 같습니다.
+ */
+export function tokenizePrebuilt(text: string): string[] {
+  return text
+    .split(SPACE_OR_PUNCTUATION)
+    .filter((term) => term.length > 0)
+    .map((term) => term.toLowerCase());
+}
+
+/**
+ * 용어(와 그 용어로 시작하는 모든 용어)가 들어 있는 샤드 키.
+ * 파이프라인의 `shard_key`와 같습니다.
+ */
+export function prebuiltShardKey(term: string): string {
+  const code = term.charCodeAt(0);
+  if (code >= HANGUL_BASE && code <= HANGUL_END) {
+    const chosung = Math.floor((code - HANGUL_BASE) / SYLLABLES_PER_CHOSUNG);
+    return `ko-${String(chosung).padStart(2, '0')}`;
+  }
+  const first = term[0] ?? '';
+  if (first >= 'a' && first <= 'z') return first;
+  if (first >= '0' && first <= '9') return '0';
+  return 'other';
+}
+
+function isCompatJamo(char: string): boolean {
+  const code = char.charCodeAt(0);
+  return code >= COMPAT_JAMO_FIRST && code <= COMPAT_JAMO_LAST;
+}
+
+/**
+ * 음절의 초성 열. 입력 중인 자음은 그대로 둡니다 (`'출석'` → `'ㅊㅅ'`).
+ * 파이프라인의 `chosung_sequence`와 같습니다.
+ */
+export function chosungSequence(text: string): string {
+  let out = '';
+  for (const char of text) {
+    const code = char.charCodeAt(0) - HANGUL_BASE;
+    if (code >= 0 && code <= HANGUL_END - HANGUL_BASE) {
+      out += CHOSUNG[Math.floor(code / SYLLABLES_PER_CHOSUNG)];
+    } else if (isCompatJamo(char) && CHOSUNG.includes(char)) {
+      out += char;
+    }
+  }
+  return out;
+}
+
+/**
+ * 입력 순서대로 나눈 자모 열 (`'출석'` → `'ㅊㅜㄹㅅㅓㄱ'`).
+ * 파이프라인의 `jamo_sequence`와 같습니다.
+ */
+export function jamoSequence(text: string): string {
+  let out = '';
+  for (const char of text) {
+    const code = char.charCodeAt(0) - HANGUL_BASE;
+    if (code >= 0 && code <= HANGUL_END - HANGUL_BASE) {
+      const jung = JUNGSUNG[Math.floor(code / 28) % 21] as string;
+      const jong = JONGSUNG[code % 28] as string;
+      out += CHOSUNG[Math.floor(code / SYLLABLES_PER_CHOSUNG)];
+      out += COMPOUND_JAMO[jung] ?? jung;
+      out += COMPOUND_JAMO[jong] ?? jong;
+    } else if (isCompatJamo(char)) {
+      out += COMPOUND_JAMO[char] ?? char;
+    }
+  }
+  return out;
+}
+
+function ngrams(sequence: string, n: number): Set<string> {
+  const grams = new Set<string>();
+  for (let i = 0; i + n <= sequence.length; i++) grams.add(sequence.slice(i, i + n));
+  return grams;
+}
+
+function jamoGrams(sequence: string): Set<string> {
+  const grams = ngrams(sequence, JAMO_GRAM);
+  if (sequence.length >= 2) grams.add(JAMO_START + sequence.slice(0, 2));
+  return grams;
+}
+
+function decodeDocs(encoded: number[]): number[] {
+  const docs: number[] = [];
+  let doc = 0;
+  for (const delta of encoded) {
+    doc += delta;
+    docs.push(doc);
+  }
+  return docs;
+}
+
+function lowerBound(terms: string[], target: string): number {
+  let low = 0;
+  let high = terms.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if ((terms[mid] as string) < target) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+}
+
+/**
+ * 미리 만든 샤드 인덱스
+ *
+ * 매니페스트와 문서 표만 먼저 받고, 샤드는 처음 필요할 때 받아 캐시합니다.
+ * 점수는 쿼리 단어마다 매칭된 필드의 boost 중 최댓값(접두어 매칭은 절반)의 합입니다.
+ */
+export class PrebuiltIndex {
+  private shards = new Map<string, Promise<PrebuiltShard | null>>();
+  private hangul = new Map<string, Promise<HangulGramIndex | null>>();
+
+  /**
+   * @param manifest - `search/manifest.json`
+   * @param documents - `docs.json` (storeFields 순서의 값 배열)
+   * @param fetchFile - 매니페스트의 `file` 경로를 받아 JSON을 반환하는 함수
+   * @param boost - 필드별 가중치 (기본 1)
+   */
+  constructor(
+    private manifest: PrebuiltManifest,
+    private documents: unknown[][],
+    private fetchFile: (file: string) => Promise<unknown>,
+    private boost: Record<string, number> = {},
+  ) {
+    if (manifest.version !== PREBUILT_INDEX_VERSION) {
+      throw new Error(
+        `Unsupported search index version ${manifest.version} (expected ${PREBUILT_INDEX_VERSION})`,
+      );
+    }
+  }
+
+  /**
+   * 매니페스트와 문서 표를 받아 인덱스를 만듭니다.
+   *
+   * @param manifestFile - 매니페스트 경로 (`fetchFile`에 그대로 전달)
+   * @param fetchFile - 경로를 받아 JSON을 반환하는 함수
+   * @param boost - 필드별 가중치
+   */
+  static async load(
+    manifestFile: string,
+    fetchFile: (file: string) => Promise<unknown>,
+    boost: Record<string, number> = {},
+  ): Promise<PrebuiltIndex> {
+    const manifest = (await fetchFile(manifestFile)) as PrebuiltManifest;
+    const documents = (await fetchFile(manifest.documents.file)) as unknown[][];
+    return new PrebuiltIndex(manifest, documents, fetchFile, boost);
+  }
+
+  /** 인덱스에 포함된 문서 수 */
+  get documentCount(): number {
+    return this.manifest.documentCount;
+  }
+
+  private shard(key: string): Promise<PrebuiltShard | null> {
+    let shard = this.shards.get(key);
+    if (!shard) {
+      const record = this.manifest.shards[key];
+      shard = record
+        ? (this.fetchFile(record.file) as Promise<PrebuiltShard>)
+        : Promise.resolve(null);
+      this.shards.set(key, shard);
+    }
+    return shard;
+  }
+
+  private hangulIndex(kind: 'chosung' | 'jamo'): Promise<HangulGramIndex | null> {
+    let index = this.hangul.get(kind);
+    if (!index) {
+      const record = this.manifest.hangul?.[kind];
+      index = record
+        ? (this.fetchFile(record.file) as Promise<HangulGramIndex>)
+        : Promise.resolve(null);
+      this.hangul.set(kind, index);
+    }
+    return index;
+  }
+
+  private gramPostings(index: HangulGramIndex, gram: string): number[] {
+    const position = lowerBound(index.grams, gram);
+    return index.grams[position] === gram ? decodeDocs(index.postings[position] ?? []) : [];
+  }
+
+  /** prefix로 시작하는 용어의 [시작, 끝) 범위 */
+  private range(shard: PrebuiltShard, prefix: string): [number, number] {
+    const start = lowerBound(shard.terms, prefix);
+    let end = start;
+    while (end < shard.terms.length && (shard.terms[end] as string).startsWith(prefix)) end++;
+    return [start, end];
+  }
+
+  private item(doc: number): Record<string, unknown> {
+    const row = this.documents[doc] ?? [];
+    const item: Record<string, unknown> = {};
+    this.manifest.storeFields.forEach((field, i) => {
+      item[field] = row[i];
+    });
+    return item;
+  }
+
+  /**
+   * 쿼리의 모든 단어와 매칭되는 문서를 점수순으로 반환합니다.
+   * 마지막 단어는 접두어로도 매칭합니다 (입력 중인 단어).
+   *
+   * @param query - 검색 쿼리
+   * @param limit - 반환할 최대 결과 수 (선택사항)
+   */
+  async search(query: string, limit?: number): Promise<PrebuiltResult[]> {
+    const words = tokenizePrebuilt(query);
+    if (words.length === 0) return [];
+    const { fields, fieldBits } = this.manifest;
+    const maskBits = (1 << fieldBits) - 1;
+
+    let scores: Map<number, number> | null = null;
+    const matches = new Map<number, Record<string, string[]>>();
+
+    for (const [w, word] of words.entries()) {
+      const shard = await this.shard(prebuiltShardKey(word));
+      const wordScores = new Map<number, number>();
+      if (shard) {
+        const [start, end] =
+          w === words.length - 1
+            ? this.range(shard, word)
+            : [lowerBound(shard.terms, word), lowerBound(shard.terms, word) + 1];
+        for (let t = start; t < end; t++) {
+          const term = shard.terms[t] as string;
+          if (w !== words.length - 1 && term !== word) continue;
+          const weight = term === word ? 1 : PREFIX_WEIGHT;
+          let doc = 0;
+          for (const value of shard.postings[t] ?? []) {
+            doc += Math.floor(value / (maskBits + 1));
+            const mask = value & maskBits;
+            const matched = fields.filter((_, bit) => mask & (1 << bit));
+            const score = weight * Math.max(...matched.map((field) => this.boost[field] ?? 1));
+            wordScores.set(doc, Math.max(wordScores.get(doc) ?? 0, score));
+            const match = matches.get(doc) ?? {};
+            match[term] = matched;
+            matches.set(doc, match);
+          }
+        }
+      }
+      // 모든 단어가 매칭된 문서만 남김
+      const previous: Map<number, number> | null = scores;
+      scores = new Map();
+      for (const [doc, score] of wordScores) {
+        if (previous === null) scores.set(doc, score);
+        else if (previous.has(doc)) scores.set(doc, (previous.get(doc) as number) + score);
+      }
+    }
+
+    const ranked = [...(scores ?? new Map<number, number>())].sort(
+      (a, b) => b[1] - a[1] || a[0] - b[0],
+    );
+    const limited = limit ? ranked.slice(0, limit) : ranked;
+    return limited.map(([doc, score]) => {
+      const item = this.item(doc);
+      return { id: String(item.id), score, match: matches.get(doc) ?? {}, item };
+    });
+  }
+
+  /**
+   * 입력 중인 단어로 시작하는 용어를 문서 수가 많은 순으로 반환합니다.
+   *
+   * @param query - 현재 입력 중인 검색어 (마지막 단어만 사용)
+   * @param limit - 반환할 최대 제안 수 (기본값: 5)
+   */
+  async suggest(query: string, limit = 5): Promise<string[]> {
+    const word = tokenizePrebuilt(query).at(-1);
+    if (!word) return [];
+    const shard = await this.shard(prebuiltShardKey(word));
+    if (!shard) return [];
+    const [start, end] = this.range(shard, word);
+    const candidates: [string, number][] = [];
+    for (let t = start; t < end; t++) {
+      candidates.push([shard.terms[t] as string, shard.postings[t]?.length ?? 0]);
+    }
+    candidates.sort((a, b) => b[1] - a[1] || (a[0] < b[0] ? -1 : 1));
+    return candidates.slice(0, limit).map(([term]) => term);
+  }
+
+  /**
+   * 초성 열에 쿼리의 초성 열이 들어 있는 문서(엔트리와 대화 제목)를 반환합니다.
+   * 쿼리의 초성 2-gram 포스팅을 교집합한 뒤 후보만 초성 열로 확인합니다.
+   *
+   * @param query - 초성 또는 한글 (예: `'ㅊㅂ'`, `'출ㅂ'`)
+   * @param limit - 반환할 최대 결과 수 (선택사항)
+   * @returns 문서 순서대로 정렬된 storeFields 값
+   */
+  async searchChosung(query: string, limit?: number): Promise<Record<string, unknown>[]> {
+    const sequence = chosungSequence(query);
+    const index = sequence ? await this.hangulIndex('chosung') : null;
+    if (!index) return [];
+    const grams = sequence.length >= 2 ? [...ngrams(sequence, 2)] : [sequence];
+    const lists = grams
+      .map((gram) => this.gramPostings(index, gram))
+      .sort((a, b) => a.length - b.length);
+    let candidates = lists[0] ?? [];
+    for (const list of lists.slice(1)) {
+      const members = new Set(list);
+      candidates = candidates.filter((doc) => members.has(doc));
+    }
+    const matched = candidates.filter((doc) => index.sequences?.[doc]?.includes(sequence));
+    return (limit ? matched.slice(0, limit) : matched).map((doc) => this.item(doc));
+  }
+
+  /**
+   * 자모 3-gram을 공유하는 문서를 유사도순으로 반환합니다.
+   * 덜 조합된 입력(`'출바'`)과 오타(`'안녕하새요'`)도 찾습니다.
+   * 유사도는 n-gram 집합의 Dice 계수이며, 쿼리가 문서의 앞부분이면
+   * 쿼리 n-gram 중 찾은 비율(×0.9)을 씁니다. 파이프라인의 `search_jamo`와 같습니다.
+   *
+   * @param query - 검색어
+   * @param limit - 반환할 최대 결과 수 (선택사항)
+   * @param minSimilarity - 쿼리 n-gram 중 공유해야 하는 최소 비율 (기본값: 0.5)
+   */
+  async searchJamo(
+    query: string,
+    limit?: number,
+    minSimilarity = 0.5,
+  ): Promise<{ score: number; item: Record<string, unknown> }[]> {
+    const grams = jamoGrams(jamoSequence(query));
+    const index = grams.size > 0 ? await this.hangulIndex('jamo') : null;
+    if (!index) return [];
+    const shared = new Map<number, number>();
+    for (const gram of grams) {
+      for (const doc of this.gramPostings(index, gram)) shared.set(doc, (shared.get(doc) ?? 0) + 1);
+    }
+    const needed = Math.ceil(grams.size * minSimilarity);
+    const scored: [number, number][] = [];
+    for (const [doc, count] of shared) {
+      if (count < needed) continue;
+      const dice = (2 * count) / (grams.size + (index.gramCounts?.[doc] ?? 0));
+      const coverage = count / grams.size;
+      scored.push([doc, Math.max(dice, coverage * 0.9)]);
+    }
+    scored.sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+    return (limit ? scored.slice(0, limit) : scored).map(([doc, score]) => ({
+      score,
+      item: this.item(doc),
+    }));
+  }
+}
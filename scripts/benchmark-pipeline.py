@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+어휘 파이프라인 벤치마크
+결정적인 합성 한글 코퍼스 (15k / 150k / 1.5M) 로 함수별, 단계별 처리량과 최대 RSS 측정
+
+각 벤치마크는 별도 프로세스에서 코퍼스를 만든 뒤 실행하므로 lru_cache 와
+최대 RSS 가 서로 섞이지 않는다. 결과는 JSON 으로 저장해 실행 간 비교한다.
+
+사용 예:
+  python3 scripts/benchmark-pipeline.py --sizes 15k,150k
+  python3 scripts/benchmark-pipeline.py --only convert,enrich --compare old.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from pipeline.jsonstream import JsonArrayWriter  # noqa: E402
+from pipeline.manifest import CACHE_DIR  # noqa: E402
+from pipeline.trace import max_rss_kb  # noqa: E402
+
+RESULTS_VERSION = 1
+
+SIZES = {"15k": 15_000, "150k": 150_000, "1.5m": 1_500_000}
+DEFAULT_SEED = 20260101
+
+# 코퍼스 음절 풀 크기 (실제 어휘처럼 음절이 반복되도록)
+SYLLABLE_POOL = 1200
+
+
+def load_script(name: str):
+    """하이픈이 들어간 스크립트 파일을 모듈로 로드 (convert-vocabulary → convert_vocabulary)"""
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    # 프로세스 풀에서 함수를 피클할 수 있도록 등록
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_corpus(size: int, seed: int) -> list[tuple[str, str, str]]:
+    """(한국어, 영어, 도메인) 목록. 같은 size/seed 면 항상 같은 코퍼스"""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + i) for i in rng.sample(range(11172), SYLLABLE_POOL)]
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    domains = sorted(load_script("convert-vocabulary").DOMAIN_TO_CATEGORY)
+
+    corpus = []
+    for _ in range(size):
+        length = rng.choices((1, 2, 3, 4, 5), weights=(8, 40, 30, 15, 7))[0]
+        korean = "".join(rng.choice(syllables) for _ in range(length))
+        if rng.random() < 0.1:
+            korean += " " + "".join(rng.choice(syllables) for _ in range(2))
+        english = " ".join(
+            "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+            for _ in range(rng.choices((1, 2, 3), weights=(70, 25, 5))[0])
+        )
+        corpus.append((korean, english, rng.choice(domains)))
+    return corpus
+
+
+def write_sources(corpus: list[tuple[str, str, str]], source_base: Path) -> None:
+    """코퍼스를 convert-vocabulary.py 의 SOURCES 소스 파일들로 나눠 저장"""
+    cv = load_script("convert-vocabulary")
+    sources = [source.path for source in cv.SOURCES]
+    # 도메인 파일이 절반, 나머지는 고르게
+    buckets: dict[str, list] = {source: [] for source in sources}
+    for i, (korean, english, domain) in enumerate(corpus):
+        source = "domains/all-domains.json" if i % 2 else sources[(i // 2) % (len(sources) - 1)]
+        buckets[source].append((korean, english, domain))
+
+    for source, items in buckets.items():
+        path = source_base / source
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if source == "words/stems.json":
+            data = [{"stem": ko, "en": en, "type": "verb" if i % 3 else "adjective"}
+                    for i, (ko, en, _) in enumerate(items)]
+        elif source == "words/colors.json":
+            data = {"koToEn": [{"ko": ko, "en": en} for ko, en, _ in items], "enToKo": []}
+        elif source == "domains/all-domains.json":
+            data = {"all": [{"ko": ko, "en": en, "domain": domain} for ko, en, domain in items]}
+        else:
+            data = [{"ko": ko, "en": en} for ko, en, _ in items]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def write_entries(corpus: list[tuple[str, str, str]], entries_dir: Path, per_file: int = 5000) -> list[Path]:
+    """enrich 전 상태의 카테고리 파일들 (romanization 빈 값)"""
+    from pipeline.templates import create_entry
+
+    entries_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for start in range(0, len(corpus), per_file):
+        path = entries_dir / f"bench-{start // per_file:04d}.json"
+        with JsonArrayWriter(path) as writer:
+            for korean, english, _ in corpus[start:start + per_file]:
+                writer.append(create_entry(korean, english, "basic-words", "noun", "w"))
+        paths.append(path)
+    return paths
+
+
+# === 벤치마크 ===
+# 각 함수는 (준비, 측정) 을 돌려준다. 준비는 시간 측정에서 빠지고, 측정은 처리한 항목 수를 반환
+
+def bench_korean_to_id(corpus, workdir, args):
+    cv = load_script("convert-vocabulary")
+    words = [korean for korean, _, _ in corpus]
+
+    def run():
+        for korean in words:
+            cv.korean_to_id(korean, "w")
+        return len(words)
+    return run
+
+
+def bench_korean_to_romanization(corpus, workdir, args):
+    en = load_script("enrich-entries")
+    words = [korean for korean, _, _ in corpus]
+
+    def run():
+        for korean in words:
+            en.korean_to_romanization(korean)
+        return len(words)
+    return run
+
+
+def bench_create_entry(corpus, workdir, args):
+    from pipeline.templates import create_entry
+
+    def run():
+        for korean, english, _ in corpus:
+            create_entry(korean, english, "basic-words", "noun", "w")
+        return len(corpus)
+    return run
+
+
+def bench_generate_dialogue(corpus, workdir, args):
+    from pipeline.templates import generate_dialogue
+
+    def run():
+        for korean, english, _ in corpus:
+            generate_dialogue(korean, english, "basic-words")
+        return len(corpus)
+    return run
+
+
+def _entry_batches(corpus, size=5000):
+    """create_entry 로 만든 항목을 size 개씩 (enrich 단계처럼 파일 단위로 메모리에 올린 상태)"""
+    from pipeline.templates import create_entry
+
+    for start in range(0, len(corpus), size):
+        yield [create_entry(korean, english, "basic-words", "noun", "w")
+               for korean, english, _ in corpus[start:start + size]]
+
+
+def bench_enrich_entry(corpus, workdir, args):
+    from pipeline.templates import enrich_entry
+
+    def run():
+        # 항목 생성 비용 포함 (enrich_batch 와 같은 조건)
+        for entries in _entry_batches(corpus):
+            for entry in entries:
+                enrich_entry(entry)
+        return len(corpus)
+    return run
+
+
+def bench_enrich_batch(corpus, workdir, args):
+    from pipeline.columnar import enrich_batch
+
+    def run():
+        # 항목 생성 비용 포함 (enrich_entry 와 같은 조건)
+        for entries in _entry_batches(corpus):
+            enrich_batch(entries, range(len(entries)))
+        return len(corpus)
+    return run
+
+
+def bench_enrich_cached(corpus, workdir, args):
+    """enrich_batch 를 채워진 EnrichmentCache 와 함께 (다시 실행할 때처럼 전부 적중)"""
+    from pipeline.columnar import enrich_batch
+    from pipeline.enrich_cache import EnrichmentCache
+
+    cache = EnrichmentCache(maxsize=len(corpus))
+    for entries in _entry_batches(corpus):
+        enrich_batch(entries, range(len(entries)), cache)
+
+    def run():
+        for entries in _entry_batches(corpus):
+            enrich_batch(entries, range(len(entries)), cache)
+        return len(corpus)
+    return run
+
+
+def bench_save_json(corpus, workdir, args):
+    """enrich 된 항목 파일 저장 (PIPELINE_JSON_BACKEND=json 으로 stdlib 과 비교)"""
+    from pipeline import jsonio
+    from pipeline.columnar import enrich_batch
+
+    batches = list(_entry_batches(corpus))
+    for entries in batches:
+        enrich_batch(entries, range(len(entries)))
+
+    def run():
+        for index, entries in enumerate(batches):
+            jsonio.dump(entries, workdir / f"bench-{index:04d}.json")
+        return len(corpus)
+    return run
+
+
+def bench_assign_ids(corpus, workdir, args):
+    """
+    deduplicate_entries 대신 (레지스트리로 대체됨) IdRegistry.assign 으로 ID 중복 제거 측정
+    """
+    from pipeline.id_registry import IdRegistry
+    from pipeline.romanization import make_id
+
+    keys = [(korean, english, make_id(korean, "w")) for korean, english, _ in corpus]
+
+    def run():
+        with IdRegistry(workdir / "ids.sqlite") as registry:
+            for korean, english, base_id in keys:
+                registry.assign("bench:basic-words", korean, english, base_id)
+        return len(keys)
+    return run
+
+
+def _convert(corpus, workdir, args, stream):
+    cv = load_script("convert-vocabulary")
+    source_base = workdir / "sources"
+    target_base = workdir / "entries"
+    target_base.mkdir()
+    write_sources(corpus, source_base)
+    (workdir / "categories.json").write_text("[]", encoding="utf-8")
+
+    def run():
+        sys.argv = ["convert-vocabulary.py", "--force",
+                    "--source", str(source_base), "--target", str(target_base),
+                    "--manifest", str(workdir / "manifest.json"),
+                    "--id-registry", str(workdir / "ids.sqlite")]
+        if stream:
+            sys.argv.append("--stream")
+        with contextlib.redirect_stdout(io.StringIO()):
+            cv.main()
+        return len(corpus)
+    return run
+
+
+def bench_convert(corpus, workdir, args):
+    return _convert(corpus, workdir, args, stream=False)
+
+
+def bench_convert_stream(corpus, workdir, args):
+    return _convert(corpus, workdir, args, stream=True)
+
+
+def bench_enrich(corpus, workdir, args):
+    en = load_script("enrich-entries")
+    paths = write_entries(corpus, workdir / "entries")
+
+    def run():
+        for _ in en.process_files(paths, args.jobs):
+            pass
+        return len(corpus)
+    return run
+
+
+BENCHMARKS = {
+    "korean_to_id": bench_korean_to_id,
+    "korean_to_romanization": bench_korean_to_romanization,
+    "create_entry": bench_create_entry,
+    "generate_dialogue": bench_generate_dialogue,
+    "enrich_entry": bench_enrich_entry,
+    "enrich_batch": bench_enrich_batch,
+    "enrich_cached": bench_enrich_cached,
+    "save_json": bench_save_json,
+    "assign_ids": bench_assign_ids,
+    "convert": bench_convert,
+    "convert_stream": bench_convert_stream,
+    "enrich": bench_enrich,
+}
+
+
+def run_one(name: str, size: int, args) -> dict:
+    """자식 프로세스에서 실행: 코퍼스 생성 → 준비 → 측정"""
+    corpus = make_corpus(size, args.seed)
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+        run = BENCHMARKS[name](corpus, Path(tmp), args)
+        setup_rss = max_rss_kb()
+        started = time.perf_counter()
+        count = run()
+        seconds = time.perf_counter() - started
+    return {
+        "benchmark": name,
+        "size": size,
+        "count": count,
+        "seconds": round(seconds, 4),
+        "entriesPerSec": round(count / seconds, 1) if seconds else None,
+        "setupRssKb": setup_rss,
+        "peakRssKb": max_rss_kb(),
+    }
+
+
+def _child(queue, name, size, args):
+    try:
+        queue.put(("ok", run_one(name, size, args)))
+    except BaseException as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def run_isolated(name: str, size: int, args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(queue, name, size, args))
+    process.start()
+    status, result = queue.get()
+    process.join()
+    if status != "ok":
+        raise RuntimeError(f"{name} ({size}): {result}")
+    return result
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results: list[dict], previous_path: Path) -> None:
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {(r["benchmark"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\n=== 비교: {previous_path} ===")
+    for result in results:
+        old = previous.get((result["benchmark"], result["size"]))
+        if not old or not old["entriesPerSec"] or not result["entriesPerSec"]:
+            continue
+        speedup = result["entriesPerSec"] / old["entriesPerSec"]
+        rss = result["peakRssKb"] / old["peakRssKb"] if old["peakRssKb"] else 0
+        print(f"   {result['benchmark']:<24} {result['size']:>9,}  "
+              f"처리량 {speedup:5.2f}x  RSS {rss:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="어휘 파이프라인 벤치마크 (처리량, 최대 RSS)")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"코퍼스 크기 ({', '.join(SIZES)} 또는 숫자, 쉼표 구분)")
+    parser.add_argument("--only", default="",
+                        help=f"실행할 벤치마크 (쉼표 구분): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="코퍼스 시드")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="enrich 단계 워커 프로세스 수")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="결과 JSON 경로 (기본: pipeline/.cache/benchmarks/<시각>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    sizes = [SIZES[s.lower()] if s.lower() in SIZES else int(s.replace("_", ""))
+             for s in args.sizes.split(",") if s]
+    names = [n for n in args.only.split(",") if n] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"알 수 없는 벤치마크: {', '.join(unknown)}")
+
+    print("=== 파이프라인 벤치마크 ===\n")
+    results = []
+    for size in sizes:
+        for name in names:
+            result = run_isolated(name, size, args)
+            results.append(result)
+            print(f"   {name:<24} {size:>9,}  {result['seconds']:9.3f}s  "
+                  f"{result['entriesPerSec']:>12,.0f}/s  RSS {result['peakRssKb'] / 1024:8.1f} MB")
+
+    report = {
+        "version": RESULTS_VERSION,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "results": results,
+    }
+    output = args.output or CACHE_DIR / "benchmarks" / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과: {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+엔트리 / 대화 → "이 단어가 쓰인 곳" 역색인
+data/context/entries/*.json, conversations.json → data/context/appears-in.json
+
+모든 엔트리의 korean (동사 / 형용사는 '-다' 를 뗀 어간도) 을 Aho-Corasick 오토마톤 하나로 묶어
+대화 한 줄, 엔트리 예문 / 대화문 한 줄을 한 번씩만 훑는다 (단어 1만 2천 개를 하나씩 찾지 않음).
+앱은 이 파일로 런타임 검색 없이 "이 단어가 나오는 대화" 를 보여줄 수 있다.
+(형식: pipeline/appears_in.py)
+
+meta.json 의 files.appearsIn 에 파일 위치와 개수를 기록한다.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.appears_in import (
+    APPEARS_IN_VERSION,
+    MAX_ENTRY_OCCURRENCES,
+    MIN_PATTERN_LENGTH,
+    build_appears_in,
+)
+from pipeline.jsonstream import iter_array
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+
+def update_meta(meta_path: Path, index_file: str, stats: dict) -> None:
+    try:
+        meta = jsonio.load(meta_path)
+    except FileNotFoundError:
+        meta = {"version": "1.0.0", "files": {}, "counts": {}}
+
+    meta.setdefault("files", {})["appearsIn"] = {
+        "version": APPEARS_IN_VERSION,
+        "file": index_file,
+        "entries": stats["entriesFound"],
+        "conversationOccurrences": stats["conversationOccurrences"],
+        "entryOccurrences": stats["entryOccurrences"],
+    }
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 단어가 쓰인 대화 / 예문 역색인 만들기 (Aho-Corasick)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/, conversations.json, meta.json 이 있는 디렉터리")
+    parser.add_argument("--min-length", type=int, default=MIN_PATTERN_LENGTH,
+                        help=f"찾을 단어의 최소 글자 수 (기본 {MIN_PATTERN_LENGTH}, 한 글자 단어는 잡음이 많음)")
+    parser.add_argument("--max-entries", type=int, default=MAX_ENTRY_OCCURRENCES,
+                        help=f"단어마다 기록할 엔트리 예문 수 (기본 {MAX_ENTRY_OCCURRENCES}, 전체 수는 entryCount)")
+    args = parser.parse_args()
+
+    print("=== 쓰인 곳 색인 생성 ===\n")
+    started = time.perf_counter()
+
+    data_dir = args.data_dir
+    entries = [entry for filepath in sorted((data_dir / "entries").glob("*.json"))
+               for entry in iter_array(filepath)]
+    conversations = jsonio.load(data_dir / "conversations.json")
+    index, stats = build_appears_in(entries, conversations, args.min_length, args.max_entries)
+    print(f"   단어 {stats['patterns']}개 → 오토마톤 상태 {stats['states']}개")
+    print(f"   대화 {len(conversations)}개, 문장 {stats['texts']}개 ({stats['characters']}자) 스캔")
+    print(f"   쓰인 곳이 있는 엔트리 {stats['entriesFound']}개: "
+          f"대화 {stats['conversationOccurrences']}곳, 엔트리 예문 {stats['entryOccurrences']}곳")
+
+    index_path = data_dir / "appears-in.json"
+    written = jsonio.write_bytes(index_path, jsonio.dumps(index, pretty=False))
+    update_meta(data_dir / "meta.json", index_path.relative_to(data_dir).as_posix(), stats)
+
+    print(f"\n{index_path.name}: {index_path.stat().st_size // 1024} KB{'' if written else ' (변경 없음)'}")
+    print(f"=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+엔트리 → 미리 만든 검색 인덱스 (첫 글자별 샤드)
+data/context/entries/*.json → data/context/search/{manifest,docs,chosung,jamo,<샤드>}.json
+
+korean / romanization / translations.en.word 를 MiniSearch 기본 토크나이저와 같게 나눠
+역색인을 만든다. 샤드는 용어의 첫 글자 (한글은 초성, 영문은 글자) 로 나누므로
+클라이언트는 입력한 글자의 샤드만 받아 바로 검색 / 자동완성할 수 있다.
+(packages/search 의 PrebuiltIndex 가 읽는 형식)
+
+엔트리 korean 과 대화 제목 (title.ko) 으로 초성 인덱스 (chosung.json, 'ㅊㅅ' → 출석) 와
+자모 3-gram 인덱스 (jamo.json, 덜 조합된 입력 / 오타 허용) 도 만든다.
+
+meta.json 의 files.search 에 매니페스트 위치와 개수를 기록한다.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.hangul_index import build_hangul_indexes
+from pipeline.jsonstream import iter_array
+from pipeline.search_index import (
+    SEARCH_INDEX_VERSION,
+    STORE_FIELDS,
+    SearchIndexBuilder,
+    write_search_index,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+
+def update_meta(meta_path: Path, manifest: dict, manifest_file: str) -> None:
+    try:
+        meta = jsonio.load(meta_path)
+    except FileNotFoundError:
+        meta = {"version": "1.0.0", "files": {}, "counts": {}}
+
+    meta.setdefault("files", {})["search"] = {
+        "version": SEARCH_INDEX_VERSION,
+        "manifest": manifest_file,
+        "documents": manifest["documentCount"],
+        "conversations": manifest["conversations"]["count"],
+        "shards": len(manifest["shards"]),
+    }
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리로 첫 글자별로 샤딩된 검색 인덱스 만들기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/ 와 meta.json 이 있는 디렉터리")
+    args = parser.parse_args()
+
+    print("=== 검색 인덱스 생성 ===\n")
+    started = time.perf_counter()
+
+    builder = SearchIndexBuilder()
+    for filepath in sorted((args.data_dir / "entries").glob("*.json")):
+        for entry in iter_array(filepath):
+            builder.add(entry)
+    conversations = jsonio.load(args.data_dir / "conversations.json")
+    for conversation in conversations:
+        builder.add_conversation(conversation)
+    documents, shards = builder.build()
+
+    korean = STORE_FIELDS.index("korean")
+    hangul = build_hangul_indexes([row[korean] or "" for row in documents])
+
+    out_dir = args.data_dir / "search"
+    manifest, written = write_search_index(documents, shards, out_dir, args.data_dir,
+                                           conversations=len(conversations), hangul=hangul)
+    update_meta(args.data_dir / "meta.json", manifest, (out_dir / "manifest.json").relative_to(args.data_dir).as_posix())
+
+    terms = sum(record["terms"] for record in manifest["shards"].values())
+    total = sum(record["bytes"] for record in manifest["shards"].values())
+    largest = max(manifest["shards"].items(), key=lambda item: item[1]["bytes"])
+    print(f"   문서 {manifest['documentCount']}개, 용어 {terms}개, 샤드 {len(manifest['shards'])}개")
+    print(f"   샤드 합계 {total / 1024:.1f} KB (최대 {largest[0]}: {largest[1]['bytes'] / 1024:.1f} KB), "
+          f"문서 표 {manifest['documents']['bytes'] / 1024:.1f} KB")
+    for kind, record in manifest["hangul"].items():
+        print(f"   {kind}: n-gram {record['grams']}개, {record['bytes'] / 1024:.1f} KB")
+    print(f"   다시 쓴 파일: {written}개")
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) → {out_dir} ===")
+
+
+if __name__ == "__main__":
+    main()
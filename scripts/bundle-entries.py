@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+엔트리 파일 → JSON Lines 번들 + ID 오프셋 인덱스
+data/context/entries/<카테고리>.json → data/context/bundles/<카테고리>.jsonl, bundles/index.json
+
+엔트리 하나를 보려고 카테고리 파일 전체 (medical.json 은 3MB) 를 파싱하지 않도록,
+카테고리별로 한 줄에 엔트리 하나씩 쓰고 ID → (파일, 바이트 오프셋, 길이) 인덱스를 만든다.
+파일 수는 카테고리 수만큼이라 Cloudflare 20,000 파일 제한과 무관하다.
+워커는 인덱스로 R2 에 Range 요청 한 번, Python 은 BundleReader (mmap) 로 읽는다.
+
+meta.json 의 files.bundles 에 번들별 개수, 바이트, 해시를 기록한다.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.bundles import BUNDLE_FORMAT_VERSION, BundleReader, build_index, write_category_bundle
+from pipeline.jsonstream import iter_array
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+
+def update_meta(meta_path: Path, categories: dict, index_file: str) -> None:
+    try:
+        meta = jsonio.load(meta_path)
+    except FileNotFoundError:
+        meta = {"version": "1.0.0", "files": {}, "counts": {}}
+
+    meta.setdefault("files", {})["bundles"] = {
+        "version": BUNDLE_FORMAT_VERSION,
+        "index": index_file,
+        "categories": categories,
+    }
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카테고리 파일을 JSON Lines 번들과 ID 오프셋 인덱스로 쓰기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/ 와 meta.json 이 있는 디렉터리")
+    parser.add_argument("--get", metavar="ID", default=None,
+                        help="번들을 만들지 않고 인덱스로 엔트리 하나만 읽어 출력")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir
+    if args.get:
+        with BundleReader(data_dir) as reader:
+            location = reader.locate(args.get)
+            if location is None:
+                raise SystemExit(f"없는 ID: {args.get}")
+            file, offset, length = location
+            print(f"{file} bytes={offset}-{offset + length - 1}")
+            print(jsonio.dumps(reader.get(args.get)).decode("utf-8"))
+        return
+
+    print("=== 번들 생성 시작 ===\n")
+    started = time.perf_counter()
+
+    bundles_dir = data_dir / "bundles"
+    categories = {}
+    records = []
+    locations = []
+    written = 0
+    for filepath in sorted((data_dir / "entries").glob("*.json")):
+        category = filepath.stem
+        record, bundle, changed = write_category_bundle(category, iter_array(filepath), bundles_dir, data_dir)
+        categories[category] = record
+        records.append(record)
+        locations.append(bundle)
+        written += changed
+        print(f"   {category}: {record['count']}개, {record['bytes'] // 1024} KB")
+
+    # 없어진 카테고리의 번들 정리
+    for path in bundles_dir.glob("*.jsonl"):
+        if path.stem not in categories:
+            path.unlink()
+
+    index = build_index(records, locations)
+    index_path = bundles_dir / "index.json"
+    written += jsonio.write_bytes(index_path, jsonio.dumps(index, pretty=False))
+    update_meta(data_dir / "meta.json", categories, index_path.relative_to(data_dir).as_posix())
+
+    print(f"\n번들 {len(records)}개, 엔트리 {len(index['ids'])}개, "
+          f"인덱스 {index_path.stat().st_size // 1024} KB ({written}개 파일 갱신)")
+    print(f"=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
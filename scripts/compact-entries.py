@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+엔트리 파일 ↔ 템플릿 압축 형식 변환
+data/context/entries/*.json → data/context/compact/*.json (encode)
+data/context/compact/*.json → entries/*.json (expand)
+
+생성된 엔트리는 템플릿 ID와 파라미터만, 직접 쓴 텍스트만 그대로 저장한다.
+형식은 pipeline/compact.py 참고. expand 결과는 원본 파일과 바이트 단위로 같다.
+
+앱과 다른 스크립트는 entries/*.json 만 읽는다. 압축 파일은 보관 / 전송용이며
+이 스크립트의 expand 가 유일한 소비자다. 압축할 때의 pipeline/templates.py 버전
+(TEMPLATE_VERSION) 이 문서에 기록되고, 버전이 다르면 expand 는 거부한다
+(템플릿을 바꾸기 전에 expand 해 둘 것).
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.compact import LITERAL, dump_document, encode_document, expand_document, render_entries
+from pipeline.writer import WRITE_THREADS, AtomicWriter
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ENTRIES_DIR = REPO_ROOT / "data" / "context" / "entries"
+COMPACT_DIR = REPO_ROOT / "data" / "context" / "compact"
+
+
+def encode(source_dir: Path, target_dir: Path, writer: AtomicWriter) -> tuple[int, int, int]:
+    """(엔트리 수, 원본 바이트, 압축 바이트)"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    total = source_bytes = target_bytes = 0
+    for filepath in sorted(source_dir.glob("*.json")):
+        raw = filepath.read_bytes()
+        entries = jsonio.loads(raw)
+        document = encode_document(entries, trailing_newline=raw.endswith(b"\n"))
+        # 다시 펼친 결과가 원본과 다르면 쓰지 않음
+        if render_entries(document) != raw:
+            raise ValueError(f"{filepath.name}: 압축 형식으로 되돌릴 수 없음")
+        compact = dump_document(document)
+        writer.submit(target_dir / filepath.name, compact)
+
+        literal = sum(1 for row in document["rows"] if row[8] == LITERAL)
+        print(f"   {filepath.name}: {len(entries)}개 (literal {literal}), "
+              f"{len(raw) // 1024} KB → {len(compact) // 1024} KB")
+        total += len(entries)
+        source_bytes += len(raw)
+        target_bytes += len(compact)
+    return total, source_bytes, target_bytes
+
+
+def expand(source_dir: Path, target_dir: Path, writer: AtomicWriter) -> int:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for filepath in sorted(source_dir.glob("*.json")):
+        document = jsonio.load(filepath)
+        entries = expand_document(document)
+        writer.submit(target_dir / filepath.name, render_entries(document, entries))
+        print(f"   {filepath.name}: {len(entries)}개")
+        total += len(entries)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 파일을 템플릿 압축 형식으로 저장하거나 다시 펼치기")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    encode_parser = subparsers.add_parser("encode", help="entries/*.json → 압축 형식")
+    encode_parser.add_argument("--source", type=Path, default=ENTRIES_DIR)
+    encode_parser.add_argument("--target", type=Path, default=COMPACT_DIR)
+
+    expand_parser = subparsers.add_parser("expand", help="압축 형식 → entries/*.json")
+    expand_parser.add_argument("--source", type=Path, default=COMPACT_DIR)
+    expand_parser.add_argument("--target", type=Path, default=ENTRIES_DIR)
+
+    for sub in (encode_parser, expand_parser):
+        sub.add_argument("--write-threads", type=int, default=WRITE_THREADS,
+                         help=f"파일을 쓰는 스레드 수 (기본 {WRITE_THREADS})")
+        sub.add_argument("--no-fsync", action="store_true",
+                         help="쓴 파일을 fsync 하지 않음 (빠르지만 중단 시 마지막 쓰기가 유실될 수 있음)")
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    writer = AtomicWriter(max(1, args.write_threads), durable=not args.no_fsync)
+    try:
+        if args.command == "encode":
+            print("=== 압축 형식으로 저장 ===\n")
+            total, source_bytes, target_bytes = encode(args.source, args.target, writer)
+            writer.close()
+            ratio = source_bytes / target_bytes if target_bytes else 0
+            print(f"\n총 {total}개: {source_bytes / 1024 / 1024:.1f} MB → "
+                  f"{target_bytes / 1024 / 1024:.1f} MB ({ratio:.1f}x)")
+        else:
+            print("=== 압축 형식 펼치기 ===\n")
+            total = expand(args.source, args.target, writer)
+            writer.close()
+            print(f"\n총 {total}개")
+    except BaseException:
+        writer.abort()
+        raise
+
+    print(f"=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+데이터 파일 → gzip / Brotli / zstd 사전 압축본
+data/context/entries/actions.json → actions.json.gz, actions.json.br, actions.json.zst
+
+배포 단위로 한 번만 최대 압축 레벨로 압축해 두고, CDN 은 요청마다 압축하는 대신
+Accept-Encoding 에 맞는 파일을 그대로 내보낸다.
+meta.json 의 files.compressed 에 원본과 압축본의 크기, 해시를 기록한다.
+원본 해시가 그대로인 파일은 다시 압축하지 않는다.
+원본이 바뀌거나 없어지면 이번에 만들지 않는 형식 (모듈 없음, --codecs 로 제외) 의
+압축본도 지운다 (--force 일 때도 마찬가지).
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.compress import (
+    CODECS,
+    COMPRESS_FORMAT_VERSION,
+    available_codecs,
+    compress_file,
+    remove_orphans,
+    remove_variants,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data"
+META_PATH = DATA_DIR / "context" / "meta.json"
+
+# 압축 대상 (data/ 기준). meta.json 과 이미 압축된 zip 은 제외
+DATA_GLOBS = (
+    "context/categories.json",
+    "context/conversations.json",
+    "context/entries/*.json",
+    "context/shards/*/*.json",
+    "context/search/*.json",
+    "context/appears-in.json",
+    "roots/concepts/*.json",
+)
+
+
+def find_files(data_dir: Path) -> list[Path]:
+    files = []
+    for pattern in DATA_GLOBS:
+        files.extend(sorted(data_dir.glob(pattern)))
+    return files
+
+
+def manifest_key(path: Path, meta_dir: Path) -> str:
+    """meta.json 기준 상대 경로 (baseUrl 에 이어 붙이면 되는 형태)"""
+    return Path(os.path.relpath(path, meta_dir)).as_posix()
+
+
+def load_meta(meta_path: Path) -> dict:
+    try:
+        return jsonio.load(meta_path)
+    except FileNotFoundError:
+        return {"version": "1.0.0", "files": {}, "counts": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 파일의 gzip / Brotli / zstd 압축본을 만들고 meta.json 에 기록")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="context/ 와 roots/ 가 있는 디렉터리")
+    parser.add_argument("--meta", type=Path, default=None,
+                        help="기록할 meta.json (기본: <data-dir>/context/meta.json)")
+    parser.add_argument("--codecs", default=",".join(CODECS),
+                        help=f"만들 압축 형식 (쉼표 구분, 기본 {','.join(CODECS)})")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="동시에 압축할 파일 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true",
+                        help="원본이 바뀌지 않은 파일도 다시 압축")
+    args = parser.parse_args()
+
+    meta_path = args.meta or args.data_dir / "context" / "meta.json"
+    requested = [c for c in args.codecs.split(",") if c]
+    unknown = [c for c in requested if c not in CODECS]
+    if unknown:
+        parser.error(f"알 수 없는 압축 형식: {', '.join(unknown)}")
+    codecs = [c for c in requested if c in available_codecs()]
+    for codec in requested:
+        if codec not in codecs:
+            print(f"⚠️  {codec}: 모듈이 설치되지 않아 건너뜀")
+
+    print("=== 사전 압축 시작 ===\n")
+    started = time.perf_counter()
+
+    meta = load_meta(meta_path)
+    # --force 여도 이전 기록은 넘긴다 (재사용은 하지 않고, 다른 형식의 압축본이 유효한지 판단용)
+    previous = meta.get("files", {}).get("compressed", {}).get("files", {})
+
+    files = find_files(args.data_dir)
+    keys = [manifest_key(path, meta_path.parent) for path in files]
+    jobs = args.jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(compress_file, path, codecs, previous.get(key), args.force)
+                   for path, key in zip(files, keys)]
+        results = [future.result() for future in futures]
+
+    records = {}
+    written = removed = 0
+    for key, (record, changed, deleted) in zip(keys, results):
+        records[key] = record
+        written += changed
+        removed += deleted
+
+    # 원본이 없어진 파일의 압축본 정리 (기록에 있던 것 + 디스크에 남은 것)
+    for key in previous:
+        if key not in records and not (meta_path.parent / key).exists():
+            removed += remove_variants(meta_path.parent / key)
+    removed += remove_orphans(args.data_dir, DATA_GLOBS)
+
+    totals = {"bytes": sum(r["bytes"] for r in records.values())}
+    for codec in codecs:
+        totals[codec] = sum(r["variants"][codec]["bytes"] for r in records.values())
+
+    meta.setdefault("files", {})["compressed"] = {
+        "version": COMPRESS_FORMAT_VERSION,
+        "codecs": {
+            codec: {"extension": CODECS[codec][0], "encoding": CODECS[codec][1], "level": CODECS[codec][2]}
+            for codec in codecs
+        },
+        "totals": totals,
+        "files": records,
+    }
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+    print(f"파일 {len(records)}개, 압축본 {written}개 갱신" + (f", 오래된 압축본 {removed}개 삭제" if removed else ""))
+    print(f"   원본  {totals['bytes'] / 1048576:8.2f} MB")
+    for codec in codecs:
+        print(f"   {codec:<5} {totals[codec] / 1048576:8.2f} MB ({totals[codec] / max(totals['bytes'], 1):.1%})")
+    print(f"=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,29 @@ soundblue-monorepo/data → public-monorepo/data/context/entries
 15,182개 어휘를 Context 앱 스키마로 변환
 """
 
-import json
+import argparse
+import glob
 import os
-import re
-from typing import Any
+import shutil
+import tempfile
+from typing import Any, Iterator
 from collections import defaultdict
 
-# 경로 설정
-SOURCE_BASE = "/Volumes/X10 Pro/monorepo-project/soundblue-monorepo/data/dictionaries"
-TARGET_BASE = "/Volumes/X10 Pro/monorepo-project/public-monorepo/data/context/entries"
-CATEGORIES_PATH = "/Volumes/X10 Pro/monorepo-project/public-monorepo/data/context/categories.json"
+from pipeline import jsonio
+from pipeline.jsonstream import JsonArrayWriter, iter_array
+from pipeline.id_registry import IdRegistry
+from pipeline.manifest import CACHE_DIR, Manifest
+from pipeline.romanization import make_id
+from pipeline.sources import ARRAY, OBJECT_ARRAYS, SOURCE_LOAD_JOBS, Source, load_sources
+from pipeline.templates import create_entry
+from pipeline.trace import Tracer
+from pipeline.writer import WRITE_THREADS, AtomicWriter
+
+# 경로 설정 (기본값: 이 저장소와 나란히 있는 soundblue-monorepo, --source/--target 으로 변경)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_BASE = os.path.join(os.path.dirname(REPO_ROOT), "soundblue-monorepo", "data", "dictionaries")
+TARGET_BASE = os.path.join(REPO_ROOT, "data", "context", "entries")
+CATEGORIES_PATH = os.path.join(REPO_ROOT, "data", "context", "categories.json")
 
 # 도메인 → 카테고리 매핑
 DOMAIN_TO_CATEGORY = {
@@ -183,537 +196,449 @@ NEW_CATEGORIES = [
 
 
 def korean_to_id(korean: str, prefix: str = "") -> str:
-    """한국어를 kebab-case ID로 변환"""
-    # 특수문자 제거, 공백을 하이픈으로
-    cleaned = re.sub(r'[^\w\s가-힣a-zA-Z0-9]', '', korean)
-    cleaned = cleaned.strip().lower()
-    cleaned = re.sub(r'\s+', '-', cleaned)
-
-    # 한글을 로마자로 (간단한 변환)
-    romanization_map = {
-        '가': 'ga', '나': 'na', '다': 'da', '라': 'ra', '마': 'ma',
-        '바': 'ba', '사': 'sa', '아': 'a', '자': 'ja', '차': 'cha',
-        '카': 'ka', '타': 'ta', '파': 'pa', '하': 'ha',
-        '거': 'geo', '너': 'neo', '더': 'deo', '러': 'reo', '머': 'meo',
-        '버': 'beo', '서': 'seo', '어': 'eo', '저': 'jeo', '처': 'cheo',
-        '커': 'keo', '터': 'teo', '퍼': 'peo', '허': 'heo',
-        '고': 'go', '노': 'no', '도': 'do', '로': 'ro', '모': 'mo',
-        '보': 'bo', '소': 'so', '오': 'o', '조': 'jo', '초': 'cho',
-        '코': 'ko', '토': 'to', '포': 'po', '호': 'ho',
-        '구': 'gu', '누': 'nu', '두': 'du', '루': 'ru', '무': 'mu',
-        '부': 'bu', '수': 'su', '우': 'u', '주': 'ju', '추': 'chu',
-        '쿠': 'ku', '투': 'tu', '푸': 'pu', '후': 'hu',
-        '그': 'geu', '느': 'neu', '드': 'deu', '르': 'reu', '므': 'meu',
-        '브': 'beu', '스': 'seu', '으': 'eu', '즈': 'jeu', '츠': 'cheu',
-        '크': 'keu', '트': 'teu', '프': 'peu', '흐': 'heu',
-        '기': 'gi', '니': 'ni', '디': 'di', '리': 'ri', '미': 'mi',
-        '비': 'bi', '시': 'si', '이': 'i', '지': 'ji', '치': 'chi',
-        '키': 'ki', '티': 'ti', '피': 'pi', '히': 'hi',
-        '개': 'gae', '내': 'nae', '대': 'dae', '래': 'rae', '매': 'mae',
-        '배': 'bae', '새': 'sae', '애': 'ae', '재': 'jae', '채': 'chae',
-        '게': 'ge', '네': 'ne', '데': 'de', '레': 're', '메': 'me',
-        '베': 'be', '세': 'se', '에': 'e', '제': 'je', '체': 'che',
-        '과': 'gwa', '놔': 'nwa', '돠': 'dwa', '롸': 'rwa', '뫄': 'mwa',
-        '봐': 'bwa', '솨': 'swa', '와': 'wa', '좌': 'jwa', '촤': 'chwa',
-        '괴': 'goe', '뇌': 'noe', '되': 'doe', '뢰': 'roe', '뫼': 'moe',
-        '뵈': 'boe', '쇠': 'soe', '외': 'oe', '죄': 'joe', '최': 'choe',
-        '권': 'gwon', '눈': 'nun', '둔': 'dun', '룬': 'run', '문': 'mun',
-        '분': 'bun', '순': 'sun', '운': 'un', '준': 'jun', '춘': 'chun',
-        '균': 'gyun', '뉸': 'nyun', '듄': 'dyun', '륜': 'ryun', '뮨': 'myun',
-        '뷴': 'byun', '슌': 'syun', '윤': 'yun', '쥰': 'jyun', '츈': 'chyun',
-        '끼': 'kki', '삐': 'ppi', '씨': 'ssi', '찌': 'jji', '띠': 'tti',
-        '까': 'kka', '빠': 'ppa', '싸': 'ssa', '짜': 'jja', '따': 'tta',
-        '꺼': 'kkeo', '뻐': 'ppeo', '써': 'sseo', '쩌': 'jjeo', '떠': 'tteo',
-        '꼬': 'kko', '뽀': 'ppo', '쏘': 'sso', '쪼': 'jjo', '또': 'tto',
-        '꾸': 'kku', '뿌': 'ppu', '쑤': 'ssu', '쭈': 'jju', '뚜': 'ttu',
-        '끄': 'kkeu', '쁘': 'ppeu', '쓰': 'sseu', '쯔': 'jjeu', '뜨': 'tteu',
-        '긴': 'gin', '닌': 'nin', '딘': 'din', '린': 'rin', '민': 'min',
-        '빈': 'bin', '신': 'sin', '인': 'in', '진': 'jin', '친': 'chin',
-        '킨': 'kin', '틴': 'tin', '핀': 'pin', '힌': 'hin',
-        '간': 'gan', '난': 'nan', '단': 'dan', '란': 'ran', '만': 'man',
-        '반': 'ban', '산': 'san', '안': 'an', '잔': 'jan', '찬': 'chan',
-        '칸': 'kan', '탄': 'tan', '판': 'pan', '한': 'han',
-        '건': 'geon', '넌': 'neon', '던': 'deon', '런': 'reon', '먼': 'meon',
-        '번': 'beon', '선': 'seon', '언': 'eon', '전': 'jeon', '천': 'cheon',
-        '곤': 'gon', '논': 'non', '돈': 'don', '론': 'ron', '몬': 'mon',
-        '본': 'bon', '손': 'son', '온': 'on', '존': 'jon', '촌': 'chon',
-        '점': 'jeom', '검': 'geom', '넘': 'neom', '덤': 'deom', '럼': 'reom',
-        '범': 'beom', '섬': 'seom', '엄': 'eom', '점': 'jeom', '첨': 'cheom',
-        '곰': 'gom', '놈': 'nom', '돔': 'dom', '롬': 'rom', '몸': 'mom',
-        '봄': 'bom', '솜': 'som', '옴': 'om', '좀': 'jom', '촘': 'chom',
-        '김': 'gim', '님': 'nim', '딤': 'dim', '림': 'rim', '밈': 'mim',
-        '빔': 'bim', '심': 'sim', '임': 'im', '짐': 'jim', '침': 'chim',
-        '감': 'gam', '남': 'nam', '담': 'dam', '람': 'ram', '맘': 'mam',
-        '밤': 'bam', '삼': 'sam', '암': 'am', '잠': 'jam', '참': 'cham',
-        '검': 'geom', '넘': 'neom', '덤': 'deom', '럼': 'reom', '멈': 'meom',
-        '법': 'beob', '섭': 'seob', '엽': 'yeob', '접': 'jeob', '첩': 'cheob',
-        '곱': 'gob', '놉': 'nob', '돕': 'dob', '롭': 'rob', '몹': 'mob',
-        '볍': 'byeob', '솝': 'sob', '옵': 'ob', '좁': 'job', '촙': 'chob',
-        '읍': 'eub', '급': 'geub', '늡': 'neub', '듭': 'deub', '릅': 'reub',
-        '쁨': 'ppeum', '슴': 'seum', '음': 'eum', '즘': 'jeum', '츰': 'cheum',
-        '각': 'gak', '낙': 'nak', '닥': 'dak', '락': 'rak', '막': 'mak',
-        '박': 'bak', '삭': 'sak', '악': 'ak', '작': 'jak', '착': 'chak',
-        '격': 'gyeok', '녁': 'nyeok', '덕': 'deok', '력': 'ryeok', '멱': 'myeok',
-        '벽': 'byeok', '석': 'seok', '역': 'yeok', '적': 'jeok', '척': 'cheok',
-        '곡': 'gok', '녹': 'nok', '독': 'dok', '록': 'rok', '목': 'mok',
-        '복': 'bok', '속': 'sok', '옥': 'ok', '족': 'jok', '촉': 'chok',
-        '국': 'guk', '눅': 'nuk', '둑': 'duk', '룩': 'ruk', '묵': 'muk',
-        '북': 'buk', '숙': 'suk', '욱': 'uk', '죽': 'juk', '축': 'chuk',
-        '극': 'geuk', '늑': 'neuk', '득': 'deuk', '륵': 'reuk', '믁': 'meuk',
-        '븍': 'beuk', '슥': 'seuk', '윽': 'euk', '즉': 'jeuk', '측': 'cheuk',
-        '픽': 'pik', '힉': 'hik', '킥': 'kik', '틱': 'tik',
-        '팍': 'pak', '학': 'hak', '칵': 'kak', '탁': 'tak',
-        '폭': 'pok', '혹': 'hok', '콕': 'kok', '톡': 'tok',
-        '풀': 'pul', '훌': 'hul', '쿨': 'kul', '툴': 'tul',
-        '플': 'peul', '흘': 'heul', '클': 'keul', '틀': 'teul',
-        '필': 'pil', '힐': 'hil', '킬': 'kil', '틸': 'til',
-        '팔': 'pal', '할': 'hal', '칼': 'kal', '탈': 'tal',
-        '펄': 'peol', '헐': 'heol', '컬': 'keol', '털': 'teol',
-        '폴': 'pol', '홀': 'hol', '콜': 'kol', '톨': 'tol',
-        '말': 'mal', '발': 'bal', '살': 'sal', '알': 'al',
-        '갈': 'gal', '날': 'nal', '달': 'dal', '랄': 'ral',
-        '걸': 'geol', '널': 'neol', '덜': 'deol', '렬': 'ryeol',
-        '골': 'gol', '놀': 'nol', '돌': 'dol', '롤': 'rol',
-        '굴': 'gul', '눌': 'nul', '둘': 'dul', '룰': 'rul',
-        '글': 'geul', '늘': 'neul', '들': 'deul', '를': 'reul',
-        '길': 'gil', '닐': 'nil', '딜': 'dil', '릴': 'ril',
-        '밀': 'mil', '빌': 'bil', '실': 'sil', '일': 'il',
-        '질': 'jil', '칠': 'chil', '킬': 'kil', '틸': 'til',
-        '멀': 'meol', '벌': 'beol', '설': 'seol', '열': 'yeol',
-        '절': 'jeol', '철': 'cheol', '켤': 'kyeol', '텰': 'tyeol',
-        '몰': 'mol', '볼': 'bol', '솔': 'sol', '올': 'ol',
-        '졸': 'jol', '촐': 'chol', '콜': 'kol', '톨': 'tol',
-        '물': 'mul', '불': 'bul', '술': 'sul', '울': 'ul',
-        '줄': 'jul', '출': 'chul', '쿨': 'kul', '툴': 'tul',
-        '뭘': 'mwol', '뷸': 'bwol', '쉴': 'swil', '윌': 'wil',
-        '쥴': 'jwil', '췰': 'chwil', '퀼': 'kwil', '튈': 'twil',
-        '왕': 'wang', '광': 'gwang', '낭': 'nang', '당': 'dang',
-        '랑': 'rang', '망': 'mang', '방': 'bang', '상': 'sang',
-        '장': 'jang', '창': 'chang', '캉': 'kang', '탕': 'tang',
-        '팡': 'pang', '항': 'hang',
-        '웅': 'ung', '궁': 'gung', '눙': 'nung', '둥': 'dung',
-        '룽': 'rung', '뭉': 'mung', '붕': 'bung', '숭': 'sung',
-        '중': 'jung', '충': 'chung', '쿵': 'kung', '퉁': 'tung',
-        '풍': 'pung', '훙': 'hung',
-        '응': 'eung', '긍': 'geung', '능': 'neung', '등': 'deung',
-        '릉': 'reung', '믕': 'meung', '븡': 'beung', '승': 'seung',
-        '증': 'jeung', '층': 'cheung', '큥': 'keung', '틍': 'teung',
-        '픙': 'peung', '흥': 'heung',
-        '영': 'yeong', '경': 'gyeong', '녕': 'nyeong', '덩': 'deong',
-        '령': 'ryeong', '명': 'myeong', '병': 'byeong', '성': 'seong',
-        '정': 'jeong', '청': 'cheong', '켱': 'kyeong', '텽': 'tyeong',
-        '평': 'pyeong', '형': 'hyeong',
-        '용': 'yong', '공': 'gong', '농': 'nong', '동': 'dong',
-        '롱': 'rong', '몽': 'mong', '봉': 'bong', '송': 'song',
-        '종': 'jong', '총': 'chong', '콩': 'kong', '통': 'tong',
-        '퐁': 'pong', '홍': 'hong',
-        '앙': 'ang', '강': 'gang', '낭': 'nang', '당': 'dang',
-        '랑': 'rang', '망': 'mang', '방': 'bang', '상': 'sang',
-        '양': 'yang', '장': 'jang', '창': 'chang',
-        '엉': 'eong', '겅': 'geong', '넝': 'neong', '덩': 'deong',
-        '렁': 'reong', '멍': 'meong', '벙': 'beong', '성': 'seong',
-        '영': 'yeong', '정': 'jeong', '청': 'cheong',
-        '옹': 'ong', '공': 'gong', '농': 'nong', '동': 'dong',
-        '롱': 'rong', '몽': 'mong', '봉': 'bong', '송': 'song',
-        '요': 'yo', '교': 'gyo', '뇨': 'nyo', '됴': 'dyo',
-        '료': 'ryo', '묘': 'myo', '뵤': 'byo', '쇼': 'syo',
-        '야': 'ya', '갸': 'gya', '냐': 'nya', '댜': 'dya',
-        '랴': 'rya', '먀': 'mya', '뱌': 'bya', '샤': 'sya',
-        '여': 'yeo', '겨': 'gyeo', '녀': 'nyeo', '뎌': 'dyeo',
-        '려': 'ryeo', '며': 'myeo', '벼': 'byeo', '셔': 'syeo',
-        '유': 'yu', '규': 'gyu', '뉴': 'nyu', '듀': 'dyu',
-        '류': 'ryu', '뮤': 'myu', '뷰': 'byu', '슈': 'syu',
-        '얘': 'yae', '걔': 'gyae', '냬': 'nyae', '뎨': 'dyae',
-        '례': 'ryae', '몌': 'myae', '볘': 'byae', '셰': 'syae',
-        '예': 'ye', '계': 'gye', '녜': 'nye', '뎨': 'dye',
-        '례': 'rye', '몌': 'mye', '볘': 'bye', '셰': 'sye',
-    }
-
-    result = []
-    i = 0
-    while i < len(cleaned):
-        found = False
-        # 2글자 매칭 시도
-        if i + 2 <= len(cleaned):
-            two_char = cleaned[i:i+2]
-            if two_char in romanization_map:
-                result.append(romanization_map[two_char])
-                i += 2
-                found = True
-        # 1글자 매칭
-        if not found:
-            char = cleaned[i]
-            if char in romanization_map:
-                result.append(romanization_map[char])
-            elif char.isalnum() or char == '-':
-                result.append(char)
-            i += 1
-
-    base_id = ''.join(result)
-    if not base_id:
-        base_id = 'unknown'
-
-    # prefix 추가
-    if prefix:
-        base_id = f"{prefix}-{base_id}"
-
-    # 길이 제한 (100자)
-    if len(base_id) > 100:
-        base_id = base_id[:100]
-
-    return base_id
-
-
-def create_entry(korean: str, english: str, category_id: str,
-                 part_of_speech: str = "noun", prefix: str = "") -> dict[str, Any]:
-    """Context 앱 Entry 스키마로 변환"""
-    entry_id = korean_to_id(korean, prefix)
-
-    return {
-        "id": entry_id,
-        "korean": korean,
-        "romanization": "",  # 빈 값으로 설정
-        "partOfSpeech": part_of_speech,
-        "categoryId": category_id,
-        "difficulty": "beginner",
-        "frequency": "common",
-        "tags": [],
-        "translations": {
-            "ko": {
-                "word": korean,
-                "explanation": f"{korean}의 뜻은 '{english}'입니다.",
-                "examples": {
-                    "beginner": f"\"{korean}\"는 한국어로 말해요.",
-                    "intermediate": f"한국에서는 \"{korean}\"를 자주 써요.",
-                    "advanced": f"\"{korean}\"는 한국어에서 중요한 표현입니다.",
-                    "master": f"\"{korean}\"의 문화적 맥락을 이해하면 더 자연스럽게 소통할 수 있습니다."
-                },
-                "variations": {
-                    "formal": [],
-                    "casual": [],
-                    "short": []
-                }
-            },
-            "en": {
-                "word": english,
-                "explanation": f"'{korean}' means '{english}' in English.",
-                "examples": {
-                    "beginner": f"We say \"{korean}\" in Korean.",
-                    "intermediate": f"In Korea, people often say \"{korean}\".",
-                    "advanced": f"\"{korean}\" is an important expression in Korean.",
-                    "master": f"Understanding the cultural context of \"{korean}\" makes communication more natural."
-                },
-                "variations": {
-                    "formal": [],
-                    "casual": [],
-                    "short": []
-                }
-            }
-        }
-    }
+    """한국어를 kebab-case ID로 변환 (pipeline.romanization.make_id)"""
+    return make_id(korean, prefix)
 
 
 def load_json(filepath: str) -> Any:
     """JSON 파일 로드"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return jsonio.load(filepath)
 
 
 def save_json(filepath: str, data: Any) -> None:
-    """JSON 파일 저장"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-def convert_words_ko_to_en() -> list[dict]:
-    """ko-to-en.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/words/ko-to-en.json")
-    entries = []
-
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            # 감탄사 분류
-            if ko in ['와', '와우', '우와', '음', '음음', '아', '아아', '오오', '어', '어어', '에', '아이고', '아이쿠', '아이구', '헉', '헐', '어머', '어머나', '세상에', '맙소사', '오호', '오', '아하', '유레카']:
-                category = 'interjections'
-                pos = 'interjection'
-            else:
-                category = 'basic-words'
-                pos = 'noun'
-
-            entries.append(create_entry(ko, en, category, pos, "w"))
-
-    return entries
-
-
-def convert_words_en_to_ko() -> list[dict]:
-    """en-to-ko.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/words/en-to-ko.json")
-    entries = []
-
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            entries.append(create_entry(ko, en, 'basic-words', 'noun', "ek"))
-
-    return entries
-
-
-def convert_stems() -> list[dict]:
-    """stems.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/words/stems.json")
-    entries = []
+    """JSON 파일 저장 (내용이 같으면 다시 쓰지 않음)"""
+    jsonio.dump(data, filepath)
 
-    for item in data:
-        stem = item.get('stem', '')
-        en = item.get('en', '')
-        word_type = item.get('type', 'verb')
 
-        if stem and en:
-            pos = 'verb' if word_type == 'verb' else 'adjective'
-            entries.append(create_entry(stem, en, 'verb-stems', pos, "st"))
+# ko-to-en.json 에서 감탄사로 분류할 단어
+INTERJECTIONS = frozenset([
+    '와', '와우', '우와', '음', '음음', '아', '아아', '오오', '어', '어어', '에', '아이고', '아이쿠', '아이구',
+    '헉', '헐', '어머', '어머나', '세상에', '맙소사', '오호', '오', '아하', '유레카',
+])
 
-    return entries
 
+def classify_ko_to_en(item: dict) -> tuple[str, str, str]:
+    """감탄사 분류"""
+    if item.get('ko', '') in INTERJECTIONS:
+        return 'interjections', 'interjection', "w"
+    return 'basic-words', 'noun', "w"
 
-def convert_colors() -> list[dict]:
-    """colors.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/words/colors.json")
-    entries = []
 
-    # 구조 확인: dict with koToEn/enToKo keys
-    if isinstance(data, dict):
-        for key, items in data.items():
-            if isinstance(items, list):
-                for item in items:
-                    ko = item.get('ko', '')
-                    en = item.get('en', '')
-                    if ko and en:
-                        entries.append(create_entry(ko, en, 'colors', 'noun', "col"))
+def classify_stem(item: dict) -> tuple[str, str, str]:
+    pos = 'verb' if item.get('type', 'verb') == 'verb' else 'adjective'
+    return 'verb-stems', pos, "st"
 
-    return entries
 
+def classify_domain(item: dict) -> tuple[str, str, str]:
+    """도메인별 카테고리 지정"""
+    domain = item.get('domain', '')
+    return DOMAIN_TO_CATEGORY.get(domain, 'basic-words'), 'noun', f"d-{domain.split('/')[-1][:3]}"
 
-def convert_idioms() -> list[dict]:
-    """idioms.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/idioms/idioms.json")
-    entries = []
 
-    for item in data:
-        ko = item.get('ko', '')
+def convert_items(source: Source, items: Iterator[dict]) -> Iterator[dict]:
+    """소스 항목 → 엔트리 (한국어, 영어가 모두 있는 항목만)"""
+    for item in items:
+        ko = item.get(source.korean_field, '')
         en = item.get('en', '')
         if ko and en:
-            entries.append(create_entry(ko, en, 'idioms', 'phrase', "id"))
-
-    return entries
-
-
-def convert_compound_words() -> list[dict]:
-    """compound-words.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/expressions/compound-words.json")
-    entries = []
-
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            entries.append(create_entry(ko, en, 'compound-words', 'noun', "cw"))
-
-    return entries
-
-
-def convert_phrasal_verbs() -> list[dict]:
-    """phrasal-verbs.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/expressions/phrasal-verbs.json")
-    entries = []
-
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            entries.append(create_entry(ko, en, 'phrasal-verbs', 'verb', "pv"))
-
-    return entries
-
-
-def convert_cultural() -> list[dict]:
-    """cultural.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/expressions/cultural.json")
-    entries = []
-
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            entries.append(create_entry(ko, en, 'cultural-expressions', 'phrase', "cu"))
+            category, pos, prefix = source.entry_fields(item)
+            yield create_entry(ko, en, category, pos, prefix)
+
+
+class CategoryStreamWriter:
+    """
+    카테고리별 append-only writer
+
+    카테고리의 첫 항목이 들어올 때 기존 파일을 먼저 스트리밍으로 옮겨 쓴다.
+    기존 파일이 있으면 이번 실행에서 레지스트리에 새로 등록된 항목만 추가한다.
+    """
+
+    def __init__(self, target_base: str) -> None:
+        self.target_base = target_base
+        self.writers: dict[str, JsonArrayWriter] = {}
+        self.merging: dict[str, bool] = {}
+
+    def _open(self, category_id: str) -> None:
+        filepath = f"{self.target_base}/{category_id}.json"
+
+        # tmp 파일에 쓰므로 기존 파일을 읽는 동안 덮어쓰지 않는다
+        writer = JsonArrayWriter(filepath)
+        merging = os.path.exists(filepath)
+        if merging:
+            for entry in iter_array(filepath):
+                writer.append(entry)
+
+        self.writers[category_id] = writer
+        self.merging[category_id] = merging
+
+    def write(self, entry: dict, created: bool) -> None:
+        category_id = entry['categoryId']
+        if category_id not in self.writers:
+            self._open(category_id)
+
+        if created or not self.merging[category_id]:
+            self.writers[category_id].append(entry)
+
+    def close(self) -> dict[str, int]:
+        """모든 파일을 확정하고 카테고리별 항목 수 반환"""
+        counts = {}
+        for category_id, writer in self.writers.items():
+            writer.close()
+            counts[category_id] = writer.count
+        return counts
+
+    def abort(self) -> None:
+        for writer in self.writers.values():
+            writer.abort()
+
+
+def seed_registry(registry: IdRegistry) -> tuple[int, int]:
+    """기존 출력 파일의 ID 를 레지스트리에 legacy 로 등록. (등록 수, 중복 ID 수) 반환"""
+    reserved = duplicates = 0
+    for filepath in sorted(glob.glob(f"{TARGET_BASE}/*.json")):
+        for entry in iter_array(filepath):
+            english = entry.get('translations', {}).get('en', {}).get('word', '')
+            if registry.reserve(entry['id'], entry.get('korean', ''), english):
+                reserved += 1
+            else:
+                duplicates += 1
+    return reserved, duplicates
+
+
+# 소스 레지스트리: 사전 하나 추가 = 한 줄 추가. 이 순서대로 ID 를 발급한다
+SOURCES: list[Source] = [
+    Source("words/ko-to-en.json", ARRAY, 'basic-words', 'noun', "w", classify=classify_ko_to_en),
+    Source("words/en-to-ko.json", ARRAY, 'basic-words', 'noun', "ek"),
+    Source("words/stems.json", ARRAY, 'verb-stems', 'verb', "st", korean_field='stem', classify=classify_stem),
+    Source("words/colors.json", OBJECT_ARRAYS, 'colors', 'noun', "col"),
+    Source("idioms/idioms.json", ARRAY, 'idioms', 'phrase', "id"),
+    Source("expressions/compound-words.json", ARRAY, 'compound-words', 'noun', "cw"),
+    Source("expressions/phrasal-verbs.json", ARRAY, 'phrasal-verbs', 'verb', "pv"),
+    Source("expressions/cultural.json", ARRAY, 'cultural-expressions', 'phrase', "cu"),
+    Source("expressions/onomatopoeia.json", ARRAY, 'onomatopoeia', 'adverb', "on"),
+    Source("domains/all-domains.json", OBJECT_ARRAYS, 'basic-words', 'noun', "d-", classify=classify_domain),
+]
 
-    return entries
 
+class CategorySetChanged(Exception):
+    """변경된 소스가 이전 실행에 없던 카테고리에 항목을 만들었을 때"""
 
-def convert_onomatopoeia() -> list[dict]:
-    """onomatopoeia.json 변환"""
-    data = load_json(f"{SOURCE_BASE}/expressions/onomatopoeia.json")
-    entries = []
 
-    for item in data:
-        ko = item.get('ko', '')
-        en = item.get('en', '')
-        if ko and en:
-            entries.append(create_entry(ko, en, 'onomatopoeia', 'adverb', "on"))
+def source_path(source: str) -> str:
+    return f"{SOURCE_BASE}/{source}"
 
-    return entries
 
+def target_path(category_id: str) -> str:
+    return f"{TARGET_BASE}/{category_id}.json"
 
-def convert_domains() -> dict[str, list[dict]]:
-    """all-domains.json 변환 - 카테고리별로 분류"""
-    data = load_json(f"{SOURCE_BASE}/domains/all-domains.json")
-    categorized: dict[str, list[dict]] = defaultdict(list)
 
-    if isinstance(data, dict):
-        for key, items in data.items():
-            if isinstance(items, list):
-                for item in items:
-                    ko = item.get('ko', '')
-                    en = item.get('en', '')
-                    domain = item.get('domain', '')
+def update_categories(dry_run: bool = False) -> list[dict]:
+    """기존 카테고리 로드 및 새 카테고리 추가"""
+    categories = load_json(CATEGORIES_PATH)
+    existing_ids = {c['id'] for c in categories}
+    added = False
 
-                    if ko and en:
-                        category = DOMAIN_TO_CATEGORY.get(domain, 'basic-words')
-                        entry = create_entry(ko, en, category, 'noun', f"d-{domain.split('/')[-1][:3]}")
-                        categorized[category].append(entry)
+    for new_cat in NEW_CATEGORIES:
+        if new_cat['id'] not in existing_ids:
+            categories.append(new_cat)
+            added = True
+            print(f"   + 새 카테고리: {new_cat['id']}")
 
-    return categorized
+    if added and not dry_run:
+        save_json(CATEGORIES_PATH, categories)
+    return categories
 
 
-def deduplicate_entries(entries: list[dict]) -> list[dict]:
-    """중복 ID 제거 및 고유 ID 생성"""
-    seen_ids: dict[str, int] = {}
-    result = []
+def plan_conversion(manifest: Manifest, force: bool) -> tuple[set[str], set[str] | None, set[str]]:
+    """
+    manifest 기준으로 다시 변환할 범위 결정
 
-    for entry in entries:
-        original_id = entry['id']
+    변경된 소스가 기여하던 카테고리와 외부에서 바뀐 출력 파일의 카테고리만
+    다시 쓴다. 그 카테고리에 기여하는 소스는 변경이 없어도 읽어야 ID 접미사가
+    전체 변환과 같아진다. 반환값: (읽을 소스, 다시 쓸 카테고리 또는 None=전체, 변경된 소스)
+    """
+    sources = [source.path for source in SOURCES]
+    if force:
+        return set(sources), None, set(sources)
 
-        if original_id in seen_ids:
-            seen_ids[original_id] += 1
-            entry['id'] = f"{original_id}-{seen_ids[original_id]}"
+    changed = {source for source in sources if manifest.file_changed(source_path(source))}
+    recorded = {
+        source: set((manifest.file_meta(source_path(source)) or {}).get('categories', []))
+        for source in sources
+        if manifest.file_meta(source_path(source)) is not None
+    }
+    if any(source not in recorded for source in changed):
+        return set(sources), None, changed
+
+    affected: set[str] = set()
+    for source in changed:
+        affected |= recorded[source]
+    for category_id in set().union(*recorded.values()):
+        if manifest.file_changed(target_path(category_id)):
+            affected.add(category_id)
+
+    run = {source for source in sources if source in changed or recorded[source] & affected}
+    return run, affected, changed
+
+
+def iter_stage_entries(registry: IdRegistry, run: set[str], only: set[str] | None, changed: set[str],
+                       source_categories: dict[str, set[str]], tracer: Tracer,
+                       streaming: bool = False, load_jobs: int = SOURCE_LOAD_JOBS) -> Iterator[tuple[dict, bool]]:
+    """
+    SOURCES 순서대로 변환하며 다시 쓸 카테고리의 항목만 전달
+
+    읽을 소스는 변환 중인 소스보다 최대 load_jobs 개 앞서 스레드에서 읽어 두며
+    (파일 읽기만 겹치고 JSON 파싱은 GIL 때문에 차례로 실행됨), 변환과 ID 발급은
+    레지스트리 순서대로 한다 (스트리밍이면 소스를 하나씩 점진적으로 읽음).
+
+    ID 는 레지스트리에서 (소스:카테고리, 한국어, 영어) 키로 정해진다.
+    (항목, 이번 실행에서 새로 등록됐는지) 를 넘기고, 같은 키가 반복되면 버린다.
+    소스에서 영어만 바뀐 항목은 소스 끝까지 미뤘다가 이번 실행에서 나오지 않은
+    같은 한국어의 기존 ID 를 이어받는다 (-1 이 붙은 새 엔트리를 만들지 않음).
+    source_categories 에는 소스별로 만든 카테고리가 기록된다.
+    소스마다 tracer 단계를 하나씩 기록한다 (스트리밍이면 파일 쓰기 시간 포함).
+    """
+    loaded = load_sources([s for s in SOURCES if s.path in run], SOURCE_BASE, load_jobs, streaming)
+    try:
+        for step, spec in enumerate(SOURCES, start=2):
+            source = spec.path
+            if source not in run:
+                print(f"{step}. {source}: 변경 없음, 건너뜀\n")
+                continue
+
+            _, items, load_seconds = next(loaded)
+            print(f"{step}. {source} 변환{' (스트리밍)' if streaming else ''}...")
+            categories = source_categories[source] = set()
+            count = repeated = 0
+            deferred = []
+            with tracer.stage(source, loadSeconds=round(load_seconds, 4) if load_seconds is not None else None) as stage:
+                stage.read(source_path(source))
+                for entry in convert_items(spec, items):
+                    category_id = entry['categoryId']
+                    categories.add(category_id)
+                    count += 1
+                    if only is not None and category_id not in only:
+                        if source in changed:
+                            raise CategorySetChanged(category_id)
+                        continue
+
+                    key = (f"{source}:{category_id}", entry['korean'], entry['translations']['en']['word'])
+                    # 영어가 바뀐 항목: 기존 키가 아직 뒤에 나올 수 있으므로 (동음이의어) 소스 끝에서 발급
+                    if registry.has_stale(*key):
+                        deferred.append((key, entry))
+                        continue
+                    assigned = registry.assign(*key, entry['id'])
+                    if assigned is None:
+                        repeated += 1
+                        continue
+                    entry['id'], created = assigned
+                    yield entry, created
+
+                for key, entry in deferred:
+                    assigned = registry.assign(*key, entry['id'], reuse=True)
+                    if assigned is None:
+                        repeated += 1
+                        continue
+                    entry['id'], created = assigned
+                    yield entry, created
+                stage.entries = count
+            print(f"   → {count}개 변환" + (f" (반복 항목 {repeated}개 제외)" if repeated else "") + "\n")
+    finally:
+        # 아직 읽는 중인 소스 취소 (CategorySetChanged 등으로 중단된 경우)
+        loaded.close()
+
+
+def convert_in_memory(entries_iter: Iterator[tuple[dict, bool]], tracer: Tracer,
+                      dry_run: bool = False, write_threads: int = WRITE_THREADS,
+                      durable: bool = True) -> dict[str, int]:
+    """
+    모든 소스를 메모리에 모은 뒤 카테고리별로 병합 저장
+    파일 쓰기는 AtomicWriter 스레드가 맡아 다음 카테고리 병합과 겹친다 (write_threads=0 이면 순서대로).
+    """
+    all_entries: dict[str, list[tuple[dict, bool]]] = defaultdict(list)
+
+    for e, created in entries_iter:
+        all_entries[e['categoryId']].append((e, created))
+
+    print(f"{len(SOURCES) + 2}. JSON 파일 저장{' (dry-run: 쓰지 않음)' if dry_run else ''}...")
+    counts = {}
+
+    writer = AtomicWriter(write_threads, durable=durable) if write_threads > 0 and not dry_run else None
+    with tracer.stage("save") as stage:
+        try:
+            for category_id, converted in all_entries.items():
+                filepath = target_path(category_id)
+
+                # 기존 파일이 있으면 레지스트리에 새로 등록된 항목만 추가
+                if os.path.exists(filepath):
+                    stage.read(filepath)
+                    entries = load_json(filepath) + [e for e, created in converted if created]
+                else:
+                    entries = [e for e, _ in converted]
+
+                if writer is not None:
+                    writer.submit(filepath, entries)
+                elif not dry_run:
+                    save_json(filepath, entries)
+                    stage.wrote(filepath)
+                print(f"   {category_id}.json: {len(entries)}개")
+                counts[category_id] = len(entries)
+            if writer is not None:
+                # manifest 가 새 내용을 해시하도록 모든 쓰기가 끝날 때까지 기다림
+                writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        stage.entries = sum(counts.values())
+    if writer is not None:
+        writer.trace(tracer)
+
+    return counts
+
+
+def convert_streaming(entries_iter: Iterator[tuple[dict, bool]], tracer: Tracer,
+                      dry_run: bool = False) -> dict[str, int]:
+    """소스를 항목 단위로 읽어 카테고리 파일에 바로 추가 (메모리 사용량 일정)"""
+    writer = CategoryStreamWriter(TARGET_BASE)
+
+    try:
+        for entry, created in entries_iter:
+            writer.write(entry, created)
+    except BaseException:
+        writer.abort()
+        raise
+
+    print(f"{len(SOURCES) + 2}. JSON 파일 확정{' (dry-run: 임시 파일 삭제)' if dry_run else ''}...")
+    with tracer.stage("save") as stage:
+        if dry_run:
+            counts = {category_id: w.count for category_id, w in writer.writers.items()}
+            writer.abort()
         else:
-            seen_ids[original_id] = 0
+            counts = writer.close()
+            for category_id in counts:
+                stage.wrote(target_path(category_id))
+        stage.entries = sum(counts.values())
+    for category_id, count in counts.items():
+        print(f"   {category_id}.json: {count}개")
 
-        result.append(entry)
-
-    return result
+    return counts
 
 
 def main():
-    print("=== 어휘 데이터 변환 시작 ===\n")
+    global SOURCE_BASE, TARGET_BASE, CATEGORIES_PATH
+
+    parser = argparse.ArgumentParser(description="어휘 데이터 변환")
+    parser.add_argument("--source", default=SOURCE_BASE,
+                        help="soundblue-monorepo 의 data/dictionaries 디렉터리")
+    parser.add_argument("--target", default=TARGET_BASE,
+                        help="카테고리별 엔트리 JSON 을 쓸 디렉터리")
+    parser.add_argument("--categories", default=None,
+                        help="categories.json 경로 (기본: --target 의 상위 디렉터리)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="변환만 하고 엔트리, 카테고리, 레지스트리, manifest 를 쓰지 않음")
+    parser.add_argument("--stream", action="store_true",
+                        help="소스를 스트리밍으로 읽고 카테고리 파일에 바로 기록 (대용량 소스용)")
+    parser.add_argument("--load-jobs", type=int, default=SOURCE_LOAD_JOBS,
+                        help=f"소스를 동시에 읽을 스레드 수 (기본 {SOURCE_LOAD_JOBS}, 1 = 순서대로; --stream 이면 무시)")
+    parser.add_argument("--manifest", default=str(CACHE_DIR / "convert-manifest.json"),
+                        help="변경 없는 소스/출력을 건너뛰기 위한 해시 manifest 경로")
+    parser.add_argument("--force", action="store_true",
+                        help="manifest 를 무시하고 전체 변환")
+    parser.add_argument("--id-registry", default=str(CACHE_DIR / "id-registry.sqlite"),
+                        help="(소스, 한국어, 영어) → ID 레지스트리 경로")
+    parser.add_argument("--seed-ids", action="store_true",
+                        help="기존 출력 파일의 ID 를 레지스트리에 다시 등록")
+    parser.add_argument("--write-threads", type=int, default=WRITE_THREADS,
+                        help=f"카테고리 파일을 쓰는 스레드 수 (기본 {WRITE_THREADS}, 0 = 순서대로; --stream 이면 무시)")
+    parser.add_argument("--no-fsync", action="store_true",
+                        help="쓴 파일을 fsync 하지 않음 (빠르지만 중단 시 마지막 쓰기가 유실될 수 있음)")
+    parser.add_argument("--trace", default=None,
+                        help="단계별 시간/처리량/바이트/메모리를 JSON 으로 저장할 경로")
+    parser.add_argument("--profile", default=None,
+                        help="단계별 cProfile 결과 (.pstats) 를 저장할 디렉터리")
+    args = parser.parse_args()
+
+    SOURCE_BASE = args.source.rstrip("/")
+    TARGET_BASE = args.target.rstrip("/")
+    CATEGORIES_PATH = args.categories or os.path.join(os.path.dirname(os.path.abspath(TARGET_BASE)), "categories.json")
+    tracer = Tracer("convert-vocabulary", args.profile)
+
+    print(f"=== 어휘 데이터 변환 시작{' (dry-run)' if args.dry_run else ''} ===\n")
 
-    # 1. 기존 카테고리 로드 및 새 카테고리 추가
     print("1. 카테고리 업데이트...")
-    categories = load_json(CATEGORIES_PATH)
-    existing_ids = {c['id'] for c in categories}
-
-    for new_cat in NEW_CATEGORIES:
-        if new_cat['id'] not in existing_ids:
-            categories.append(new_cat)
-            print(f"   + 새 카테고리: {new_cat['id']}")
-
-    save_json(CATEGORIES_PATH, categories)
+    with tracer.stage("categories") as stage:
+        stage.read(CATEGORIES_PATH)
+        categories = update_categories(args.dry_run)
+        stage.entries = len(categories)
     print(f"   총 카테고리: {len(categories)}개\n")
 
-    # 2. 각 소스 파일 변환
-    all_entries: dict[str, list[dict]] = defaultdict(list)
-
-    print("2. words/ko-to-en.json 변환...")
-    entries = convert_words_ko_to_en()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("3. words/en-to-ko.json 변환...")
-    entries = convert_words_en_to_ko()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("4. words/stems.json 변환...")
-    entries = convert_stems()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("5. words/colors.json 변환...")
-    entries = convert_colors()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("6. idioms/idioms.json 변환...")
-    entries = convert_idioms()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("7. expressions/compound-words.json 변환...")
-    entries = convert_compound_words()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("8. expressions/phrasal-verbs.json 변환...")
-    entries = convert_phrasal_verbs()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("9. expressions/cultural.json 변환...")
-    entries = convert_cultural()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("10. expressions/onomatopoeia.json 변환...")
-    entries = convert_onomatopoeia()
-    for e in entries:
-        all_entries[e['categoryId']].append(e)
-    print(f"   → {len(entries)}개 변환\n")
-
-    print("11. domains/all-domains.json 변환...")
-    domain_entries = convert_domains()
-    for cat_id, cat_entries in domain_entries.items():
-        all_entries[cat_id].extend(cat_entries)
-    total_domain = sum(len(v) for v in domain_entries.values())
-    print(f"   → {total_domain}개 변환\n")
-
-    # 3. 카테고리별 파일 저장
-    print("12. JSON 파일 저장...")
-    total_entries = 0
-
-    for category_id, entries in all_entries.items():
-        # 중복 제거
-        entries = deduplicate_entries(entries)
-
-        filepath = f"{TARGET_BASE}/{category_id}.json"
-
-        # 기존 파일이 있으면 병합
-        if os.path.exists(filepath):
-            existing = load_json(filepath)
-            existing_ids = {e['id'] for e in existing}
-
-            # 새 항목만 추가
-            new_entries = [e for e in entries if e['id'] not in existing_ids]
-            entries = existing + new_entries
-            entries = deduplicate_entries(entries)
-
-        save_json(filepath, entries)
-        print(f"   {category_id}.json: {len(entries)}개")
-        total_entries += len(entries)
-
-    print(f"\n=== 변환 완료 ===")
-    print(f"총 엔트리: {total_entries}개")
+    manifest = Manifest(args.manifest)
+    run, only, changed = plan_conversion(manifest, args.force)
+    if not run:
+        print("변경된 소스/출력 파일 없음 - 전체 건너뜀")
+        return
+    if only is not None:
+        print(f"   변경된 소스 {len(changed)}개, 다시 쓸 카테고리: {', '.join(sorted(only)) or '없음'}\n")
+
+    # dry-run 은 레지스트리 복사본에서 ID 를 발급하고 버린다
+    scratch = tempfile.TemporaryDirectory(prefix="convert-dry-run-") if args.dry_run else None
+    registry_path = args.id_registry
+    if scratch:
+        registry_path = os.path.join(scratch.name, "id-registry.sqlite")
+        if os.path.exists(args.id_registry):
+            shutil.copyfile(args.id_registry, registry_path)
+
+    registry = IdRegistry(registry_path)
+    if registry.is_new or args.seed_ids:
+        with tracer.stage("seed-ids") as stage:
+            reserved, duplicates = seed_registry(registry)
+            registry.commit()
+            stage.entries = reserved + duplicates
+        print(f"   ID 레지스트리: 기존 ID {reserved}개 등록" + (f", 중복 ID {duplicates}개" if duplicates else "") + "\n")
+
+    convert = convert_streaming if args.stream else convert_in_memory
+    convert_args = {} if args.stream else {"write_threads": args.write_threads, "durable": not args.no_fsync}
+    source_categories: dict[str, set[str]] = {}
+    with registry:
+        try:
+            counts = convert(iter_stage_entries(registry, run, only, changed, source_categories, tracer, args.stream,
+                                               args.load_jobs),
+                             tracer, args.dry_run, **convert_args)
+        except CategorySetChanged as e:
+            print(f"   ! 새 카테고리 '{e}' 발견 - 전체 변환으로 다시 실행\n")
+            registry.rollback()
+            run, only = {source.path for source in SOURCES}, None
+            source_categories = {}
+            counts = convert(iter_stage_entries(registry, run, only, changed, source_categories, tracer, args.stream,
+                                               args.load_jobs),
+                             tracer, args.dry_run, **convert_args)
+        created, adopted, reused, registered = registry.created, registry.adopted, registry.reused, len(registry)
+
+    if scratch:
+        scratch.cleanup()
+    else:
+        for source in run:
+            manifest.record_file(source_path(source), categories=sorted(source_categories[source]))
+        for category_id in counts:
+            manifest.record_file(target_path(category_id))
+        manifest.save()
+
+    skipped = len(SOURCES) - len(run)
+    print(f"\n=== 변환 완료{' (dry-run: 저장하지 않음)' if args.dry_run else ''} ===")
+    print(f"총 엔트리: {sum(counts.values())}개 ({len(counts)}개 카테고리 파일{'' if args.dry_run else ' 저장'})")
+    print(f"ID: 새로 발급 {created}개, 기존 ID 승계 {adopted}개, 영어가 바뀐 항목 {reused}개, 레지스트리 {registered}개")
+    if skipped:
+        print(f"건너뛴 소스: {skipped}개")
     print(f"총 카테고리: {len(categories)}개")
 
+    tracer.print_summary()
+    if args.trace:
+        tracer.write(args.trace)
+        print(f"\n트레이스: {args.trace}")
+    if args.profile:
+        print(f"프로파일: {args.profile} (python3 -m pstats <파일>)")
+
 
 if __name__ == "__main__":
     main()
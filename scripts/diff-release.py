@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+이전 릴리스 대비 변경분 (changefeed) 과 델타 산출물 만들기
+data/context → <out>/changefeed.json, <out>/d1/*.sql, <out>/changed-files.txt, <out>/removed-files.txt
+
+카테고리, 엔트리, 대화를 ID 와 내용 해시로 이전 릴리스와 비교해
+추가 / 변경 / 삭제 목록을 만든다. D1 에는 델타 SQL (upsert / delete) 만,
+R2 에는 바뀐 파일 (샤드 포함) 만 올리면 된다.
+
+기준 릴리스: --base-ref 로 git 리비전을 주거나, 배포 후 --commit 으로 저장한 인덱스.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.changes import (
+    build_index,
+    diff_indexes,
+    index_from_git,
+    is_empty,
+    load_index,
+    save_index,
+    write_delta_sql,
+)
+from pipeline.d1 import SqlBatchWriter, clear_sql_dir
+from pipeline.manifest import CACHE_DIR
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+
+def write_lines(path: Path, lines: list[str]) -> None:
+    jsonio.write_bytes(path, "".join(f"{line}\n" for line in lines).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이전 릴리스와 비교한 changefeed 와 델타 SQL / 변경 파일 목록 만들기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="categories.json / conversations.json / entries/ 가 있는 디렉터리")
+    parser.add_argument("--base-index", type=Path, default=CACHE_DIR / "release-index.json",
+                        help="기준 릴리스 인덱스 (--commit 으로 저장됨)")
+    parser.add_argument("--base-ref", default=None,
+                        help="기준 릴리스로 쓸 git 리비전 (예: origin/main, v1.2.0)")
+    parser.add_argument("--out", type=Path, default=CACHE_DIR / "changes",
+                        help="changefeed.json, d1/, 파일 목록을 쓸 디렉터리")
+    parser.add_argument("--commit", action="store_true",
+                        help="현재 데이터를 다음 비교의 기준 릴리스로 저장 (배포 후 실행)")
+    args = parser.parse_args()
+
+    print("=== 릴리스 변경분 계산 ===\n")
+    started = time.perf_counter()
+
+    head = build_index(args.data_dir)
+    if args.base_ref:
+        base = index_from_git(args.base_ref, args.data_dir)
+        print(f"기준: git {args.base_ref}")
+    else:
+        base = load_index(args.base_index)
+        print(f"기준: {args.base_index}" if base else "기준 릴리스 없음 - 전체를 추가로 취급")
+
+    feed = diff_indexes(base, head)
+    feed["base"] = args.base_ref or (str(args.base_index) if base else None)
+
+    out = args.out
+    out.mkdir(parents=True, exist_ok=True)
+    jsonio.dump(feed, out / "changefeed.json")
+
+    sql_dir = out / "d1"
+    clear_sql_dir(sql_dir)
+    writer = SqlBatchWriter(sql_dir, prefix="delta")
+    try:
+        statements = write_delta_sql(feed, args.data_dir, writer)
+    finally:
+        writer.close()
+
+    files = feed["files"]
+    write_lines(out / "changed-files.txt", files["added"] + files["changed"])
+    write_lines(out / "removed-files.txt", files["removed"])
+
+    print()
+    for collection, counts in feed["counts"].items():
+        print(f"   {collection}: 추가 {counts['added']}, 변경 {counts['changed']}, "
+              f"삭제 {counts['removed']}, 그대로 {counts['unchanged']}")
+    shards = [f for f in files["added"] + files["changed"] if f.startswith("shards/")]
+    print(f"   파일: 추가/변경 {len(files['added']) + len(files['changed'])}개 (샤드 {len(shards)}개), "
+          f"삭제 {len(files['removed'])}개")
+    print(f"   델타 SQL: {statements}문 ({len(writer.files)}개 파일, {sql_dir})")
+    if is_empty(feed):
+        print("\n변경 없음")
+    else:
+        print(f"   적용: for f in {sql_dir}/*.sql; do wrangler d1 execute context-db --remote --file \"$f\"; done")
+        print(f"   업로드: rclone copy {args.data_dir} <remote> --files-from {out / 'changed-files.txt'}")
+
+    if args.commit:
+        save_index(head, args.base_index)
+        print(f"\n기준 릴리스 인덱스 저장: {args.base_index}")
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
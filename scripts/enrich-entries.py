@@ -4,279 +4,368 @@ Enrich new entries with romanization, dialogue, and variations.
 Adds missing data to all 14,936 new entries.
 """
 
-import json
+import argparse
 import os
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-# Korean to Romanization mapping (Revised Romanization of Korean)
-ROMANIZATION_MAP = {
-    # Vowels
-    'ㅏ': 'a', 'ㅐ': 'ae', 'ㅑ': 'ya', 'ㅒ': 'yae', 'ㅓ': 'eo', 'ㅔ': 'e',
-    'ㅕ': 'yeo', 'ㅖ': 'ye', 'ㅗ': 'o', 'ㅘ': 'wa', 'ㅙ': 'wae', 'ㅚ': 'oe',
-    'ㅛ': 'yo', 'ㅜ': 'u', 'ㅝ': 'wo', 'ㅞ': 'we', 'ㅟ': 'wi', 'ㅠ': 'yu',
-    'ㅡ': 'eu', 'ㅢ': 'ui', 'ㅣ': 'i',
-
-    # Consonants (initial)
-    'ㄱ': 'g', 'ㄲ': 'kk', 'ㄴ': 'n', 'ㄷ': 'd', 'ㄸ': 'tt', 'ㄹ': 'r',
-    'ㅁ': 'm', 'ㅂ': 'b', 'ㅃ': 'pp', 'ㅅ': 's', 'ㅆ': 'ss', 'ㅇ': '',
-    'ㅈ': 'j', 'ㅉ': 'jj', 'ㅊ': 'ch', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 'h',
-}
-
-# Final consonants (종성)
-FINAL_CONSONANTS = {
-    '': '', 'ㄱ': 'k', 'ㄲ': 'k', 'ㄳ': 'k', 'ㄴ': 'n', 'ㄵ': 'n', 'ㄶ': 'n',
-    'ㄷ': 't', 'ㄹ': 'l', 'ㄺ': 'k', 'ㄻ': 'm', 'ㄼ': 'l', 'ㄽ': 'l', 'ㄾ': 'l',
-    'ㄿ': 'p', 'ㅀ': 'l', 'ㅁ': 'm', 'ㅂ': 'p', 'ㅄ': 'p', 'ㅅ': 't', 'ㅆ': 't',
-    'ㅇ': 'ng', 'ㅈ': 't', 'ㅊ': 't', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 't',
-}
-
-# Decompose Korean character
-CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
-JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
-JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+from pipeline import jsonio
+from pipeline.columnar import enrich_batch
+from pipeline.enrich_cache import ENRICH_CACHE_SIZE, EnrichmentCache
+from pipeline.manifest import CACHE_DIR, Manifest, text_hash
+from pipeline.romanization import decompose, romanize, syllable_spelling
+from pipeline.templates import TEMPLATE_VERSION
+from pipeline.trace import Tracer, file_size, max_rss_kb
+from pipeline.writer import WRITE_THREADS, AtomicWriter
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ENTRIES_DIR = REPO_ROOT / 'data' / 'context' / 'entries'
 
 def decompose_korean(char):
     """Decompose a Korean character into cho, jung, jong."""
-    if '가' <= char <= '힣':
-        code = ord(char) - ord('가')
-        cho = code // (21 * 28)
-        jung = (code % (21 * 28)) // 28
-        jong = code % 28
-        return CHOSUNG[cho], JUNGSUNG[jung], JONGSUNG[jong]
-    return None
+    return decompose(char)
 
 def korean_to_romanization(korean_text):
-    """Convert Korean text to romanization."""
-    result = []
-    prev_jong = ''
-
-    for char in korean_text:
-        decomposed = decompose_korean(char)
-        if decomposed:
-            cho, jung, jong = decomposed
-
-            # Handle initial consonant
-            cho_rom = ROMANIZATION_MAP.get(cho, '')
-
-            # Special cases for 'ㄹ' as initial after certain finals
-            if cho == 'ㄹ' and prev_jong in ['ㄴ', 'ㄹ']:
-                cho_rom = 'l'
-            elif cho == 'ㅇ' and prev_jong:
-                cho_rom = ''  # Silent when following a syllable
-
-            # Handle vowel
-            jung_rom = ROMANIZATION_MAP.get(jung, '')
-
-            # Handle final consonant
-            jong_rom = FINAL_CONSONANTS.get(jong, '')
-
-            result.append(cho_rom + jung_rom + jong_rom)
-            prev_jong = jong
-        elif char == ' ':
-            result.append(' ')
-            prev_jong = ''
-        elif char.isascii():
-            result.append(char)
-            prev_jong = ''
-        else:
-            result.append(char)
-            prev_jong = ''
-
-    return ''.join(result)
-
-def generate_dialogue(korean_word, english_word, category_id):
-    """Generate dialogue examples based on word and category."""
-
-    # Category-specific dialogue templates
-    category_dialogues = {
-        'greetings': {
-            'context_ko': '일상에서 인사하며',
-            'context_en': 'Greeting in daily life',
-            'templates': [
-                {'A_ko': f'{korean_word}!', 'B_ko': f'네, {korean_word}!',
-                 'A_en': f'{english_word}!', 'B_en': f'Yes, {english_word}!'},
-            ]
-        },
-        'food': {
-            'context_ko': '식당에서 주문하며',
-            'context_en': 'Ordering at a restaurant',
-            'templates': [
-                {'A_ko': f'{korean_word} 있어요?', 'B_ko': f'네, {korean_word} 있어요.',
-                 'A_en': f'Do you have {english_word}?', 'B_en': f'Yes, we have {english_word}.'},
-            ]
-        },
-        'emotions': {
-            'context_ko': '감정을 표현하며',
-            'context_en': 'Expressing emotions',
-            'templates': [
-                {'A_ko': f'지금 기분이 어때요?', 'B_ko': f'{korean_word} 느낌이에요.',
-                 'A_en': f'How do you feel now?', 'B_en': f'I feel {english_word}.'},
-            ]
-        },
-        'daily-life': {
-            'context_ko': '일상 대화에서',
-            'context_en': 'In daily conversation',
-            'templates': [
-                {'A_ko': f'{korean_word}이/가 뭐예요?', 'B_ko': f'{korean_word}은/는 이거예요.',
-                 'A_en': f'What is {english_word}?', 'B_en': f'This is {english_word}.'},
-            ]
-        },
-        'travel': {
-            'context_ko': '여행 중 대화에서',
-            'context_en': 'While traveling',
-            'templates': [
-                {'A_ko': f'{korean_word} 어디 있어요?', 'B_ko': f'{korean_word}은/는 저기 있어요.',
-                 'A_en': f'Where is {english_word}?', 'B_en': f'{english_word} is over there.'},
-            ]
-        },
-        'work': {
-            'context_ko': '직장에서 대화하며',
-            'context_en': 'At the workplace',
-            'templates': [
-                {'A_ko': f'{korean_word} 처리했어요?', 'B_ko': f'네, {korean_word} 완료했어요.',
-                 'A_en': f'Did you handle {english_word}?', 'B_en': f'Yes, I finished {english_word}.'},
-            ]
-        },
-        'shopping': {
-            'context_ko': '쇼핑하며',
-            'context_en': 'While shopping',
-            'templates': [
-                {'A_ko': f'{korean_word} 얼마예요?', 'B_ko': f'{korean_word}은/는 만 원이에요.',
-                 'A_en': f'How much is {english_word}?', 'B_en': f'{english_word} is 10,000 won.'},
-            ]
-        },
-    }
-
-    # Default template
-    default = {
-        'context_ko': '일상 대화에서',
-        'context_en': 'In daily conversation',
-        'templates': [
-            {'A_ko': f'{korean_word}이/가 뭐예요?', 'B_ko': f'{korean_word}은/는 {english_word}(이)에요.',
-             'A_en': f'What is "{korean_word}"?', 'B_en': f'"{korean_word}" means "{english_word}".'},
-        ]
-    }
-
-    config = category_dialogues.get(category_id, default)
-    template = config['templates'][0]
-
-    romanization_a = korean_to_romanization(template['A_ko'])
-    romanization_b = korean_to_romanization(template['B_ko'])
-
-    return {
-        'ko': {
-            'context': config['context_ko'],
-            'dialogue': [
-                {'speaker': 'A', 'text': template['A_ko'], 'romanization': romanization_a, 'translation': template['A_en']},
-                {'speaker': 'B', 'text': template['B_ko'], 'romanization': romanization_b, 'translation': template['B_en']},
-            ]
-        },
-        'en': {
-            'context': config['context_en'],
-            'dialogue': [
-                {'speaker': 'A', 'text': template['A_en'], 'romanization': '', 'translation': template['A_ko']},
-                {'speaker': 'B', 'text': template['B_en'], 'romanization': '', 'translation': template['B_ko']},
-            ]
-        }
-    }
-
-def generate_variations(korean_word, english_word, category_id):
-    """Generate formal/casual/short variations."""
-
-    # Common patterns
-    formal_patterns_ko = [
-        f'{korean_word}입니다.',
-        f'{korean_word}이/가 있습니다.',
-    ]
-    casual_patterns_ko = [
-        f'{korean_word}이야.',
-        f'{korean_word} 있어.',
-    ]
-    short_patterns_ko = [
-        korean_word[:2] if len(korean_word) > 2 else korean_word,
-    ]
-
-    formal_patterns_en = [
-        f'It is {english_word}.',
-        f'There is {english_word}.',
-    ]
-    casual_patterns_en = [
-        f"It's {english_word}.",
-        f'{english_word}, you know.',
-    ]
-    short_patterns_en = [
-        english_word.split()[0] if ' ' in english_word else english_word,
-    ]
-
-    return {
-        'ko': {
-            'formal': formal_patterns_ko,
-            'casual': casual_patterns_ko,
-            'short': short_patterns_ko,
-        },
-        'en': {
-            'formal': formal_patterns_en,
-            'casual': casual_patterns_en,
-            'short': short_patterns_en,
-        }
-    }
-
-def enrich_entry(entry):
-    """Enrich a single entry with romanization, dialogue, and variations."""
-    korean = entry.get('korean', '')
-    english = entry.get('translations', {}).get('en', {}).get('word', '')
-    category_id = entry.get('categoryId', 'basic-words')
-
-    # Skip if already has romanization (original entries)
-    if entry.get('romanization'):
-        return entry
-
-    # Add romanization
-    entry['romanization'] = korean_to_romanization(korean)
-
-    # Generate dialogue
-    dialogue_data = generate_dialogue(korean, english, category_id)
-
-    # Add dialogue to translations
-    if 'translations' in entry:
-        if 'ko' in entry['translations']:
-            entry['translations']['ko']['dialogue'] = dialogue_data['ko']
-            variations = generate_variations(korean, english, category_id)
-            entry['translations']['ko']['variations'] = variations['ko']
-        if 'en' in entry['translations']:
-            entry['translations']['en']['dialogue'] = dialogue_data['en']
-            variations = generate_variations(korean, english, category_id)
-            entry['translations']['en']['variations'] = variations['en']
-
-    # Add pronunciation field
-    ipa = korean_to_romanization(korean)
-    entry['pronunciation'] = {
-        'korean': f'[{korean}]',
-        'ipa': f'[{ipa}]'
-    }
-
-    return entry
-
-def process_file(file_path):
-    """Process a single JSON file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        entries = json.load(f)
-
-    enriched_count = 0
+    """Convert Korean text to romanization (pipeline.romanization.romanize)."""
+    return romanize(korean_text)
+
+def entry_input_hash(entry):
+    """Fingerprint of the fields (and template version) that enrichment is generated from."""
+    return text_hash(
+        str(TEMPLATE_VERSION),
+        entry.get('korean', ''),
+        entry.get('translations', {}).get('en', {}).get('word', ''),
+        entry.get('categoryId', 'basic-words'),
+    )
+
+def pending_indices(entries, generated):
+    """
+    Indices of entries that need enrichment: entries without romanization,
+    plus entries an earlier run enriched whose inputs have changed since.
+    ``generated`` maps entry id -> input hash recorded by that run.
+    """
+    pending = []
     for i, entry in enumerate(entries):
         # Check if needs enrichment (no romanization = new entry)
         if not entry.get('romanization'):
-            entries[i] = enrich_entry(entry)
-            enriched_count += 1
+            pending.append(i)
+        elif generated.get(entry.get('id')) not in (None, entry_input_hash(entry)):
+            entry['romanization'] = ''
+            pending.append(i)
+    return pending
+
+def generated_hashes(entries, generated, pending):
+    """Input hashes of every entry whose enrichment was generated by this script."""
+    pending = set(pending)
+    return {
+        entry.get('id'): entry_input_hash(entry)
+        for i, entry in enumerate(entries)
+        if i in pending or entry.get('id') in generated
+    }
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(entries, f, ensure_ascii=False, indent=2)
+def reromanize_entry(entry):
+    """
+    Bring an entry's generated romanizations up to the current ``romanize``:
+    the headword, its pronunciation and the Korean dialogue lines. Only values
+    equal to the old per-syllable spelling of their text are replaced, so
+    hand-written romanizations are kept. Returns the number of fields changed.
+    """
+    changed = 0
+    korean = entry.get('korean', '')
+    old, new = syllable_spelling(korean), romanize(korean)
+    if old != new and entry.get('romanization') == old:
+        entry['romanization'] = new
+        changed += 1
+        pronunciation = entry.get('pronunciation')
+        if isinstance(pronunciation, dict) and pronunciation.get('ipa') == f'[{old}]':
+            pronunciation['ipa'] = f'[{new}]'
+            changed += 1
+    dialogue = ((entry.get('translations') or {}).get('ko') or {}).get('dialogue') or {}
+    for turn in dialogue.get('dialogue') or []:
+        text = turn.get('text') or ''
+        old, new = syllable_spelling(text), romanize(text)
+        if old != new and turn.get('romanization') == old:
+            turn['romanization'] = new
+            changed += 1
+    return changed
+
+def reromanize_files(file_paths, output_dir=None, dry_run=False, writer=None):
+    """
+    reromanize_entry over every entry of the files, whether or not this
+    script generated them. Yields (file path, entries, entries changed,
+    fields changed); a file is only rewritten in place if something changed.
+    """
+    for file_path in file_paths:
+        output_path = output_for(file_path, output_dir)
+        raw = file_path.read_bytes()
+        entries = jsonio.loads(raw)
+        counts = [reromanize_entry(entry) for entry in entries]
+        changed = sum(1 for count in counts if count)
+        if not dry_run and (changed or output_path != file_path):
+            write_entries(output_path, entries, writer, trailing_newline=raw.endswith(b'\n'))
+        yield file_path, len(entries), changed, sum(counts)
+
+# Enrichment cache of this process (None = disabled); see init_cache
+CACHE = None
+
+def init_cache(maxsize=ENRICH_CACHE_SIZE, path=None):
+    """Set up this process's enrichment cache; also the worker pool initializer."""
+    global CACHE
+    CACHE = EnrichmentCache(maxsize, path) if maxsize > 0 else None
+
+def drain_cache():
+    """Worker side: the cache keys and hit/miss counts to merge into the parent's cache."""
+    return CACHE.drain() if CACHE is not None else ({}, 0, 0)
+
+def enrich_entries(entries, indices):
+    """Enrich the entries at the given indices in place, as one batch (pipeline.columnar)."""
+    enrich_batch(entries, indices, CACHE)
+
+def write_entries(file_path, entries, writer=None, trailing_newline=False):
+    """
+    Write entries to a temp file and atomically rename it over file_path,
+    or queue that on writer (an AtomicWriter) and return at once.
+    """
+    if writer is not None:
+        writer.submit(file_path, entries, trailing_newline=trailing_newline, only_if_changed=False)
+    else:
+        data = jsonio.dumps(entries) + (b'\n' if trailing_newline else b'')
+        jsonio.write_bytes(file_path, data, only_if_changed=False)
+
+def process_file(file_path, generated=None, output_path=None, dry_run=False, writer=None):
+    """
+    Process a single JSON file and write the result to output_path (default:
+    in place). An in-place file is only rewritten when something was
+    enriched; nothing is written on a dry run. With a writer the write is
+    queued rather than done before returning. Returns (count, enriched,
+    generated hashes).
+    """
+    generated = generated or {}
+    output_path = output_path or file_path
+    entries = jsonio.load(file_path)
+
+    pending = pending_indices(entries, generated)
+    if pending:
+        enrich_entries(entries, pending)
+    if not dry_run and (pending or output_path != file_path):
+        write_entries(output_path, entries, writer)
+
+    return len(entries), len(pending), generated_hashes(entries, generated, pending)
+
+def timed_process_file(file_path, generated=None, output_path=None, dry_run=False):
+    """Worker task: process_file plus its wall time, the worker's peak RSS and its cache delta."""
+    started = time.perf_counter()
+    result = process_file(file_path, generated, output_path, dry_run)
+    return (*result, time.perf_counter() - started, max_rss_kb(), drain_cache())
+
+# Files larger than this are split across workers in --jobs mode
+SPLIT_THRESHOLD_BYTES = 1 << 20
+CHUNK_ENTRIES = 500
+
+def enrich_chunk(entries):
+    """Worker task: enrich one chunk of a split file. Returns it with the cache delta."""
+    enrich_entries(entries, range(len(entries)))
+    return entries, drain_cache()
+
+def output_for(file_path, output_dir):
+    return output_dir / file_path.name if output_dir else file_path
+
+def trace_file(tracer, file_path, output_path, seconds, count, enriched, peak_rss_kb, dry_run, queued=False,
+               **meta):
+    # A write queued on the AtomicWriter is traced by the writer itself
+    wrote = not dry_run and not queued and (enriched or output_path != file_path)
+    tracer.record(file_path.name, seconds, count, file_size(file_path),
+                  file_size(output_path) if wrote else 0, peak_rss_kb, enriched=enriched, **meta)
+
+def merge_cache(delta):
+    """Fold a worker's cache delta into this process's cache; returns (hits, misses)."""
+    fresh, hits, misses = delta
+    if CACHE is not None:
+        CACHE.merge(fresh, hits, misses)
+    return hits, misses
+
+def process_files_parallel(file_paths, jobs, generated_by_file, output_dir, dry_run, tracer,
+                           cache_args=(0, None), writer=None):
+    """
+    Enrich files on a process pool, yielding (file_path, count, enriched,
+    generated hashes) as each file finishes.
+
+    Small files are enriched and written by a worker. Large files are read
+    here, their pending entries are fanned out in chunks, and the file is
+    written once every chunk is back. Largest files are scheduled first.
+    Each file is traced with the worker's wall time, or for a split file
+    the time from reading it to writing it. Workers start their enrichment
+    cache with ``init_cache(*cache_args)``; what they add to it is merged
+    into this process's cache. With a writer, the large files written here
+    are queued on it instead of holding up the next chunk's results.
+    """
+    file_paths = sorted(file_paths, key=lambda p: p.stat().st_size, reverse=True)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_cache, initargs=cache_args) as pool:
+        tasks = {}
+        split_files = {}
+
+        for file_path in file_paths:
+            generated = generated_by_file.get(file_path, {})
+            output_path = output_for(file_path, output_dir)
+            if file_path.stat().st_size <= SPLIT_THRESHOLD_BYTES:
+                future = pool.submit(timed_process_file, file_path, generated, output_path, dry_run)
+                tasks[future] = (file_path, None)
+                continue
+
+            started = time.perf_counter()
+            entries = jsonio.load(file_path)
+            pending = pending_indices(entries, generated)
+            if not pending:
+                if not dry_run and output_path != file_path:
+                    write_entries(output_path, entries, writer)
+                trace_file(tracer, file_path, output_path, time.perf_counter() - started,
+                           len(entries), 0, max_rss_kb(), dry_run, queued=writer is not None)
+                yield file_path, len(entries), 0, generated_hashes(entries, generated, pending)
+                continue
+
+            split_files[file_path] = {'entries': entries, 'pending': pending, 'remaining': 0,
+                                      'started': started, 'cache_hits': 0, 'cache_misses': 0}
+            for start in range(0, len(pending), CHUNK_ENTRIES):
+                indices = pending[start:start + CHUNK_ENTRIES]
+                future = pool.submit(enrich_chunk, [entries[i] for i in indices])
+                tasks[future] = (file_path, indices)
+                split_files[file_path]['remaining'] += 1
+
+        for future in as_completed(tasks):
+            file_path, indices = tasks.pop(future)
+            if indices is None:
+                count, enriched, generated, seconds, peak_rss_kb, delta = future.result()
+                hits, misses = merge_cache(delta)
+                trace_file(tracer, file_path, output_for(file_path, output_dir), seconds,
+                           count, enriched, peak_rss_kb, dry_run, worker=True,
+                           cacheHits=hits, cacheMisses=misses)
+                yield file_path, count, enriched, generated
+                continue
+
+            state = split_files[file_path]
+            entries = state['entries']
+            chunk, delta = future.result()
+            hits, misses = merge_cache(delta)
+            state['cache_hits'] += hits
+            state['cache_misses'] += misses
+            for i, entry in zip(indices, chunk):
+                entries[i] = entry
+            state['remaining'] -= 1
+            if state['remaining'] == 0:
+                output_path = output_for(file_path, output_dir)
+                if not dry_run:
+                    write_entries(output_path, entries, writer)
+                del split_files[file_path]
+                trace_file(tracer, file_path, output_path, time.perf_counter() - state['started'],
+                           len(entries), len(state['pending']), max_rss_kb(), dry_run,
+                           queued=writer is not None, split=True,
+                           cacheHits=state['cache_hits'], cacheMisses=state['cache_misses'])
+                generated = generated_by_file.get(file_path, {})
+                yield (file_path, len(entries), len(state['pending']),
+                       generated_hashes(entries, generated, state['pending']))
+
+def process_files(file_paths, jobs=1, generated_by_file=None, output_dir=None, dry_run=False, tracer=None,
+                  cache_args=(0, None), writer=None):
+    """
+    Yield (file_path, count, enriched, generated hashes) for each file,
+    in parallel if jobs > 1. Every file is recorded as a stage on tracer.
+    ``cache_args`` configures the workers' enrichment caches (see init_cache).
+    Writes done in this process go through writer if one is given, so a
+    file is written while the next one is enriched; a yielded file is then
+    only on disk once the writer has committed it.
+    """
+    generated_by_file = generated_by_file or {}
+    tracer = tracer or Tracer('enrich-entries')
+    if jobs > 1:
+        yield from process_files_parallel(file_paths, jobs, generated_by_file, output_dir, dry_run, tracer,
+                                          cache_args, writer)
+        return
+    for file_path in file_paths:
+        output_path = output_for(file_path, output_dir)
+        with tracer.stage(file_path.name) as stage:
+            stage.read(file_path)
+            hits, misses = (CACHE.hits, CACHE.misses) if CACHE is not None else (0, 0)
+            count, enriched, generated = process_file(
+                file_path, generated_by_file.get(file_path), output_path, dry_run, writer)
+            stage.entries = count
+            stage.meta['enriched'] = enriched
+            if CACHE is not None:
+                stage.meta['cacheHits'] = CACHE.hits - hits
+                stage.meta['cacheMisses'] = CACHE.misses - misses
+            if not dry_run and writer is None and (enriched or output_path != file_path):
+                stage.wrote(output_path)
+        yield file_path, count, enriched, generated
+
+def reromanize(entries_dir, output_dir, args):
+    """--reromanize: rewrite generated romanizations in every entry file."""
+    writer = None
+    if args.write_threads > 0 and not args.dry_run:
+        writer = AtomicWriter(args.write_threads, durable=not args.no_fsync)
+    total_entries = total_changed = total_fields = 0
+    try:
+        for file_path, count, changed, fields in reromanize_files(
+                sorted(entries_dir.glob('*.json')), output_dir, args.dry_run, writer):
+            total_entries += count
+            total_changed += changed
+            total_fields += fields
+            if changed:
+                print(f"  {file_path.name}: {changed} of {count} entries re-romanized ({fields} fields)")
+        if writer is not None:
+            writer.close()
+    finally:
+        if writer is not None:
+            writer.abort()
 
-    return len(entries), enriched_count
+    print("\n" + "=" * 60)
+    print(f"Total: {total_changed} of {total_entries} entries re-romanized ({total_fields} fields)")
+    print("=" * 60)
 
 def main():
-    entries_dir = Path('/Volumes/X10 Pro/monorepo-project/public-monorepo/apps/context/app/data/entries')
+    parser = argparse.ArgumentParser(description='Enrich entries with romanization, dialogue, and variations.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='worker processes (0 = one per CPU core)')
+    parser.add_argument('--manifest', type=Path, default=CACHE_DIR / 'enrich-manifest.json',
+                        help='content-hash manifest used to skip unchanged files')
+    parser.add_argument('--force', action='store_true',
+                        help='process every file even if the manifest says it is unchanged')
+    parser.add_argument('--source', type=Path, default=ENTRIES_DIR,
+                        help='directory with the category entry files')
+    parser.add_argument('--target', type=Path, default=None,
+                        help='directory to write enriched files to (default: enrich --source in place)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='enrich in memory only; write no entry files and no manifest')
+    parser.add_argument('--trace', type=Path, default=None,
+                        help='write per-file timings, bytes and peak memory as JSON')
+    parser.add_argument('--profile', type=Path, default=None,
+                        help='directory for per-file cProfile output (.pstats); implies --jobs 1')
+    parser.add_argument('--cache-size', type=int, default=ENRICH_CACHE_SIZE,
+                        help=f'enrichment cache entries, least recently used evicted first '
+                             f'(default {ENRICH_CACHE_SIZE}; 0 disables the cache)')
+    parser.add_argument('--cache-file', type=Path, default=CACHE_DIR / 'enrich-cache.sqlite',
+                        help='where the enrichment cache is kept between runs')
+    parser.add_argument('--no-cache-file', action='store_true',
+                        help='keep the enrichment cache in memory for this run only')
+    parser.add_argument('--write-threads', type=int, default=WRITE_THREADS,
+                        help=f'threads writing output files while the next file is enriched '
+                             f'(default {WRITE_THREADS}; 0 writes each file before moving on)')
+    parser.add_argument('--no-fsync', action='store_true',
+                        help='do not fsync written files (faster, but a crash may lose the latest writes)')
+    parser.add_argument('--reromanize', action='store_true',
+                        help='only re-romanize every entry file with the current romanizer '
+                             '(generated spellings only, hand-written ones are kept), then exit')
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.profile and jobs > 1:
+        print('--profile runs in a single process; ignoring --jobs')
+        jobs = 1
+
+    entries_dir = args.source
+    output_dir = args.target if args.target and args.target.resolve() != entries_dir.resolve() else None
+    tracer = Tracer('enrich-entries', args.profile)
+    cache_args = (args.cache_size, None if args.no_cache_file else args.cache_file)
+    init_cache(*cache_args)
 
     # Files that contain original entries (don't modify these)
     original_files = {
@@ -301,32 +390,101 @@ def main():
 
     print("=" * 60)
     print("Enriching entries with romanization, dialogue, and variations")
+    if args.dry_run:
+        print("Dry run: no files will be written")
+    if output_dir:
+        print(f"Writing to {output_dir}")
+        if not args.dry_run:
+            output_dir.mkdir(parents=True, exist_ok=True)
+    if jobs > 1 and not args.reromanize:
+        print(f"Using {jobs} worker processes")
     print("=" * 60)
 
+    if args.reromanize:
+        reromanize(entries_dir, output_dir, args)
+        return
+
+    file_paths = []
     for filename in new_files:
         file_path = entries_dir / filename
         if file_path.exists():
-            count, enriched = process_file(file_path)
-            total_entries += count
-            total_enriched += enriched
-            print(f"  {filename}: {count} entries, {enriched} enriched")
+            file_paths.append(file_path)
         else:
             print(f"  {filename}: NOT FOUND")
 
     # Also process original files that might have new entries added
-    print("\nChecking original files for new entries...")
-    for filename in original_files:
-        file_path = entries_dir / filename
-        if file_path.exists():
-            count, enriched = process_file(file_path)
-            if enriched > 0:
+    file_paths.extend(
+        entries_dir / filename for filename in sorted(original_files)
+        if (entries_dir / filename).exists()
+    )
+
+    manifest = Manifest(args.manifest)
+    skipped = []
+    # The manifest tracks in-place runs; a separate target is always rebuilt
+    if not args.force and not output_dir:
+        skipped = [p for p in file_paths if not manifest.file_changed(p)]
+        file_paths = [p for p in file_paths if p not in skipped]
+    generated_by_file = {p: manifest.entries(p) for p in file_paths}
+
+    writer = None
+    if args.write_threads > 0 and not args.dry_run:
+        writer = AtomicWriter(args.write_threads, durable=not args.no_fsync)
+    finished = []
+    try:
+        for file_path, count, enriched, generated in process_files(
+                file_paths, jobs, generated_by_file, output_dir, args.dry_run, tracer, cache_args, writer):
+            finished.append((file_path, generated))
+            if file_path.name in original_files:
+                if enriched > 0:
+                    total_entries += count
+                    total_enriched += enriched
+                    print(f"  {file_path.name}: {enriched} new entries enriched (original file)")
+            else:
                 total_entries += count
                 total_enriched += enriched
-                print(f"  {filename}: {enriched} new entries enriched")
+                print(f"  {file_path.name}: {count} entries, {enriched} enriched")
+        if writer is not None:
+            writer.close()
+    finally:
+        if writer is not None:
+            writer.abort()
+        if not args.dry_run and not output_dir:
+            # A file whose write had not been committed keeps its old record
+            unfinished = writer.pending if writer is not None else set()
+            for file_path, generated in finished:
+                if file_path not in unfinished:
+                    manifest.record_file(file_path)
+                    manifest.set_entries(file_path, generated)
+            manifest.save()
+        if not args.dry_run and CACHE is not None:
+            CACHE.save()
+
+    if skipped:
+        print(f"\n  Skipped {len(skipped)} unchanged files: "
+              + ', '.join(p.name for p in skipped))
 
     print("\n" + "=" * 60)
     print(f"Total: {total_entries} entries processed, {total_enriched} enriched")
+    if CACHE is not None:
+        stats = CACHE.stats()
+        tracer.counters['enrichmentCache'] = stats
+        rate = f" ({stats['hitRate']:.1%} hit rate)" if stats['hitRate'] is not None else ''
+        print(f"Enrichment cache: {stats['hits']} hits, {stats['misses']} misses{rate}, "
+              f"{stats['size']} cached")
+    if writer is not None:
+        writer.trace(tracer)
+        stats = tracer.counters['writes']
+        if stats['files']:
+            print(f"Writes: {stats['written']} files, {stats['bytes'] // 1024} KB, "
+                  f"latency p50 {stats['latencyP50']:.3f}s / p95 {stats['latencyP95']:.3f}s")
     print("=" * 60)
 
+    tracer.print_summary()
+    if args.trace:
+        tracer.write(args.trace)
+        print(f"\nTrace written to {args.trace}")
+    if args.profile:
+        print(f"Profiles written to {args.profile} (python3 -m pstats <file>)")
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Context 데이터 → SQLite / D1 내보내기
+data/context (categories.json, conversations.json, entries/*.json) → context.sqlite + D1 SQL 배치
+
+로컬 SQLite 파일은 executemany 로 한 번에 적재하고 인덱스는 적재 후 생성한다.
+같은 행으로 `wrangler d1 execute context-db --file` 용 SQL 배치 파일도 만든다.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from pipeline.d1 import (
+    INDEXES,
+    TABLES,
+    SqlBatchWriter,
+    category_row,
+    clear_sql_dir,
+    conversation_row,
+    entry_row,
+    insert_placeholders,
+    insert_statements,
+    translation_rows,
+)
+from pipeline.jsonstream import iter_array
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+# executemany 한 번에 넘길 행 수
+BATCH_ROWS = 5000
+
+
+class BulkLoader:
+    """테이블별 행을 모아 BATCH_ROWS 단위로 executemany"""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.pending: dict[str, list[tuple]] = {table: [] for table in TABLES}
+        self.counts: dict[str, int] = {table: 0 for table in TABLES}
+
+    def add(self, table: str, row: tuple) -> None:
+        rows = self.pending[table]
+        rows.append(row)
+        if len(rows) >= BATCH_ROWS:
+            self.flush(table)
+
+    def flush(self, table: str) -> None:
+        rows = self.pending[table]
+        if rows:
+            self.conn.executemany(insert_placeholders(table), rows)
+            self.counts[table] += len(rows)
+            rows.clear()
+
+    def flush_all(self) -> None:
+        for table in self.pending:
+            self.flush(table)
+
+
+def iter_rows(data_dir: Path):
+    """(테이블, 행) 을 categories → entries/entry_translations → conversations 순으로"""
+    with open(data_dir / "categories.json", "r", encoding="utf-8") as f:
+        for category in json.load(f):
+            yield "categories", category_row(category)
+
+    for filepath in sorted((data_dir / "entries").glob("*.json")):
+        for entry in iter_array(filepath):
+            yield "entries", entry_row(entry)
+            for row in translation_rows(entry):
+                yield "entry_translations", row
+
+    conversations_path = data_dir / "conversations.json"
+    if conversations_path.exists():
+        for conversation in iter_array(conversations_path):
+            yield "conversations", conversation_row(conversation)
+
+
+def export(data_dir: Path, db_path: Path | None, sql_dir: Path | None) -> dict[str, int]:
+    conn = None
+    tmp_db = None
+    if db_path:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_db = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+        tmp_db.unlink(missing_ok=True)
+        conn = sqlite3.connect(tmp_db, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        for ddl in TABLES.values():
+            conn.execute(ddl)
+        conn.execute("BEGIN")
+
+    data_writer = None
+    if sql_dir:
+        clear_sql_dir(sql_dir)
+        sql_dir.mkdir(parents=True, exist_ok=True)
+        with open(sql_dir / "0000-schema.sql", "w", encoding="utf-8") as f:
+            f.write("\n\n".join(TABLES.values()) + "\n")
+        data_writer = SqlBatchWriter(sql_dir, prefix="0001-data")
+
+    loader = BulkLoader(conn) if conn else None
+    counts: dict[str, int] = {table: 0 for table in TABLES}
+
+    try:
+        for table, row in iter_rows(data_dir):
+            counts[table] += 1
+            if loader:
+                loader.add(table, row)
+            if data_writer:
+                # D1 문장 크기 제한을 넘는 행은 INSERT + UPDATE 여러 개로 나눔
+                for statement in insert_statements(table, row):
+                    data_writer.write(statement)
+
+        if loader:
+            loader.flush_all()
+            conn.execute("COMMIT")
+            # 인덱스는 적재 후 한 번에 생성
+            for ddl in INDEXES:
+                conn.execute(ddl)
+            conn.execute("ANALYZE")
+            conn.close()
+            os.replace(tmp_db, db_path)
+    except BaseException:
+        if conn:
+            conn.close()
+            tmp_db.unlink(missing_ok=True)
+        raise
+    finally:
+        if data_writer:
+            data_writer.close()
+
+    if sql_dir:
+        with open(sql_dir / "0002-indexes.sql", "w", encoding="utf-8") as f:
+            f.write("\n".join(INDEXES) + "\n")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context 데이터를 SQLite 파일과 D1 SQL 배치로 내보내기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="categories.json / conversations.json / entries/ 가 있는 디렉터리")
+    parser.add_argument("--db", type=Path, default=DATA_DIR / "context.sqlite",
+                        help="만들 SQLite 파일 경로")
+    parser.add_argument("--sql-dir", type=Path, default=None,
+                        help="D1 SQL 배치 파일을 쓸 디렉터리 (지정 시에만 생성)")
+    parser.add_argument("--no-db", action="store_true", help="SQLite 파일을 만들지 않음")
+    args = parser.parse_args()
+
+    print("=== D1 내보내기 시작 ===\n")
+    started = time.perf_counter()
+
+    counts = export(args.data_dir, None if args.no_db else args.db, args.sql_dir)
+
+    for table, count in counts.items():
+        print(f"   {table}: {count}행")
+    if not args.no_db:
+        print(f"\nSQLite: {args.db} ({args.db.stat().st_size / 1024 / 1024:.1f} MB)")
+    if args.sql_dir:
+        files = sorted(args.sql_dir.glob("*.sql"))
+        print(f"D1 SQL 배치: {args.sql_dir} ({len(files)}개 파일)")
+        print(f"   적용: for f in {args.sql_dir}/*.sql; do wrangler d1 execute context-db --remote --file \"$f\"; done")
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
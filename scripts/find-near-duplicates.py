@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+카테고리를 가로지르는 유사 중복 엔트리 찾기 (MinHash + LSH)
+data/context/entries/*.json → <out> (순위별 병합 보고서), --merge 시 엔트리 파일 수정
+
+정규화한 korean / english 단어의 shingle 로 MinHash 서명을 만들고 LSH 버킷이 겹치는
+엔트리끼리만 비교하므로 전체 쌍 비교 없이 거의 선형 시간에 후보를 찾는다.
+(띄어쓰기 차이, ko-to-en / en-to-ko 로 두 번 들어온 단어, basic-words 와 겹치는 도메인 엔트리)
+
+--merge: 유사도가 --merge-threshold 이상인 묶음마다 엔트리 하나만 남기고 나머지를 지운다.
+남길 엔트리는 categories.json 순서가 앞선 카테고리의 것 (같으면 ID 가 짧은 것).
+지운 엔트리의 내용은 남긴 엔트리로 합친다: 없는 locale / 필드는 채우고 tags, variations 같은
+문자열 목록은 합집합. 같은 필드의 값이 서로 다르면 (설명, 예문 등) 내용을 버리지 않도록
+그 엔트리는 합치지 않고 보고서의 conflicts 에 남긴다.
+지운 ID → 남긴 ID 는 id-redirects.json 에 더하고 워커용 id-redirects.bin 을 다시 만들며
+(migrate-ids.py 와 같은 테이블), meta.json 의 counts.entries 도 함께 맞춘다.
+"""
+
+import argparse
+import copy
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.id_migration import load_redirects, merge_redirects, save_redirects
+from pipeline.jsonstream import iter_array
+from pipeline.manifest import CACHE_DIR
+from pipeline.near_duplicates import (
+    NEAR_DUPLICATES_VERSION,
+    NUM_BANDS,
+    ROWS_PER_BAND,
+    MinHasher,
+    clusters,
+    find_near_duplicates,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+TABLE_PATH = REPO_ROOT / "apps" / "context" / "public" / "data" / "id-redirects.bin"
+
+# 남길 엔트리의 값을 그대로 쓰는 필드 (합치지 않음)
+IDENTITY_FIELDS = ("id", "korean", "romanization", "pronunciation", "partOfSpeech",
+                   "categoryId", "difficulty", "frequency", "hasDialogue")
+
+
+def load_records(entries_dir: Path) -> list[dict]:
+    """엔트리마다 비교에 필요한 필드만 (파일 순서대로)"""
+    records = []
+    for filepath in sorted(entries_dir.glob("*.json")):
+        for entry in iter_array(filepath):
+            records.append({
+                "id": entry["id"],
+                "korean": entry.get("korean", ""),
+                "english": entry.get("translations", {}).get("en", {}).get("word", ""),
+                "categoryId": entry.get("categoryId"),
+                "file": filepath.name,
+            })
+    return records
+
+
+def describe(record: dict) -> dict:
+    return {key: record[key] for key in ("id", "korean", "english", "categoryId")}
+
+
+def plan_merges(groups: list[list[int]], records: list[dict], category_order: dict) -> dict[str, str]:
+    """묶음마다 남길 엔트리를 골라 {지울 ID: 남길 ID}"""
+    redirects = {}
+    for group in groups:
+        members = sorted(group, key=lambda i: (category_order.get(records[i]["categoryId"], len(category_order)),
+                                               len(records[i]["id"]), records[i]["id"]))
+        keep = records[members[0]]["id"]
+        for i in members[1:]:
+            redirects[records[i]["id"]] = keep
+    return redirects
+
+
+def content_conflicts(kept: dict, removed: dict, path: str = "") -> list[str]:
+    """removed 를 kept 에 합치면 한쪽 값을 버려야 하는 필드 경로 (문자열 목록은 합칠 수 있음)"""
+    conflicts = []
+    for key, value in removed.items():
+        where = f"{path}.{key}" if path else key
+        if key not in kept or kept[key] == value:
+            continue
+        old = kept[key]
+        if isinstance(old, dict) and isinstance(value, dict):
+            conflicts += content_conflicts(old, value, where)
+        elif not (isinstance(old, list) and isinstance(value, list)
+                  and all(isinstance(item, str) for item in old + value)):
+            conflicts.append(where)
+    return conflicts
+
+
+def merge_content(kept: dict, removed: dict) -> None:
+    """없는 필드는 채우고 문자열 목록은 합집합 (content_conflicts 가 비어 있을 때만)"""
+    for key, value in removed.items():
+        if key not in kept:
+            kept[key] = value
+        elif isinstance(kept[key], dict) and isinstance(value, dict):
+            merge_content(kept[key], value)
+        elif isinstance(kept[key], list) and kept[key] != value:
+            kept[key] = list(dict.fromkeys(kept[key] + value))
+
+
+def plan_content_merges(entries_dir: Path, redirects: dict[str, str]):
+    """
+    지울 엔트리를 남길 엔트리에 차례로 합쳐 본다.
+    (합친 엔트리 {ID: 엔트리}, 적용할 리다이렉트 {지울 ID: 남길 ID}, 충돌 {지울 ID: 필드 경로 목록})
+    """
+    wanted = set(redirects) | set(redirects.values())
+    entries = {}
+    for filepath in sorted(entries_dir.glob("*.json")):
+        for entry in iter_array(filepath):
+            if entry["id"] in wanted:
+                entries[entry["id"]] = entry
+
+    merged = {}
+    applied = {}
+    conflicts = {}
+    for old, keep in redirects.items():
+        kept = merged.get(keep) or copy.deepcopy(entries[keep])
+        content = {key: value for key, value in entries[old].items() if key not in IDENTITY_FIELDS}
+        fields = content_conflicts(kept, content)
+        if fields:
+            conflicts[old] = fields
+            continue
+        merge_content(kept, content)
+        if "hasDialogue" in kept or "hasDialogue" in entries[old]:
+            kept["hasDialogue"] = any("dialogue" in t for t in kept.get("translations", {}).values())
+        merged[keep] = kept
+        applied[old] = keep
+    return merged, applied, conflicts
+
+
+def apply_merges(entries_dir: Path, merged: dict[str, dict], applied: dict[str, str]):
+    """엔트리 파일에서 지울 엔트리를 빼고 남길 엔트리를 합친 것으로 바꿈. ({파일: 지운 수}, 남은 ID 목록)"""
+    removed = {}
+    live_ids = []
+    for filepath in sorted(entries_dir.glob("*.json")):
+        raw = filepath.read_bytes()
+        entries = jsonio.loads(raw)
+        kept = []
+        changed = False
+        for entry in entries:
+            if entry["id"] in applied:
+                changed = True
+                removed[filepath.name] = removed.get(filepath.name, 0) + 1
+                continue
+            if entry["id"] in merged:
+                entry = merged[entry["id"]]
+                changed = True
+            kept.append(entry)
+            live_ids.append(entry["id"])
+        if changed:
+            jsonio.dump(kept, filepath, trailing_newline=raw.endswith(b"\n"))
+    return removed, live_ids
+
+
+def update_meta(meta_path: Path, entries: int) -> None:
+    try:
+        meta = jsonio.load(meta_path)
+    except FileNotFoundError:
+        meta = {"version": "1.0.0", "files": {}, "counts": {}}
+    meta.setdefault("counts", {})["entries"] = entries
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash / LSH 로 카테고리 전체에서 유사 중복 엔트리 찾기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/ 와 categories.json 이 있는 디렉터리")
+    parser.add_argument("--out", type=Path, default=CACHE_DIR / "near-duplicates.json",
+                        help="병합 보고서 경로")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="보고할 최소 유사도 (shingle Jaccard)")
+    parser.add_argument("--bands", type=int, default=NUM_BANDS, help="LSH 밴드 수")
+    parser.add_argument("--rows", type=int, default=ROWS_PER_BAND, help="밴드당 MinHash 값 수")
+    parser.add_argument("--merge", action="store_true",
+                        help="--merge-threshold 이상인 묶음을 엔트리 하나로 합쳐 파일에 반영")
+    parser.add_argument("--merge-threshold", type=float, default=0.9,
+                        help="자동 병합할 최소 유사도")
+    parser.add_argument("--table", type=Path, default=TABLE_PATH,
+                        help="--merge 때 다시 만들 리다이렉트 테이블 (.bin) 경로")
+    args = parser.parse_args()
+
+    print("=== 유사 중복 탐지 ===\n")
+    started = time.perf_counter()
+
+    entries_dir = args.data_dir / "entries"
+    records = load_records(entries_dir)
+    pairs, stats = find_near_duplicates(records, args.threshold, MinHasher(args.bands, args.rows))
+    print(f"   엔트리 {stats['records']}개 → LSH 후보 {stats['candidates']}쌍 → "
+          f"유사도 {args.threshold} 이상 {stats['pairs']}쌍")
+    if stats["skippedBuckets"]:
+        print(f"   ⚠️  너무 큰 버킷 {stats['skippedBuckets']}개 건너뜀")
+
+    kinds = {}
+    for _, _, _, kind in pairs:
+        kinds[kind] = kinds.get(kind, 0) + 1
+    for kind, count in sorted(kinds.items()):
+        print(f"   {kind}: {count}쌍")
+
+    categories = jsonio.load(args.data_dir / "categories.json")
+    category_order = {category["id"]: i for i, category in
+                      enumerate(sorted(categories, key=lambda category: category.get("order", 0)))}
+    mergeable = [pair for pair in pairs if pair[0] >= args.merge_threshold]
+    groups = clusters(mergeable, len(records))
+    planned = plan_merges(groups, records, category_order)
+    merged, redirects, conflicts = plan_content_merges(entries_dir, planned)
+
+    report = {
+        "version": NEAR_DUPLICATES_VERSION,
+        "threshold": args.threshold,
+        "mergeThreshold": args.merge_threshold,
+        "stats": stats,
+        "pairs": [
+            {"similarity": similarity, "kind": kind, "a": describe(records[i]), "b": describe(records[j])}
+            for similarity, i, j, kind in pairs
+        ],
+        "merges": [
+            {"keep": planned.get(records[group[0]]["id"], records[group[0]]["id"]),
+             "remove": sorted(records[i]["id"] for i in group if records[i]["id"] in redirects)}
+            for group in groups
+        ],
+        "redirects": redirects,
+        "conflicts": {old: {"keep": planned[old], "fields": fields} for old, fields in conflicts.items()},
+        "applied": args.merge,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump(report, args.out)
+
+    print(f"\n   자동 병합 대상: {len(groups)}묶음, 엔트리 {len(redirects)}개 제거 "
+          f"(유사도 {args.merge_threshold} 이상)")
+    if conflicts:
+        print(f"   ⚠️  내용이 달라 합치지 않은 엔트리 {len(conflicts)}개 (보고서의 conflicts)")
+    for similarity, i, j, kind in pairs[:10]:
+        print(f"     {similarity:.2f} {kind:<12} {records[i]['id']} ({records[i]['categoryId']}) ↔ "
+              f"{records[j]['id']} ({records[j]['categoryId']})")
+
+    if args.merge and redirects:
+        removed, live_ids = apply_merges(entries_dir, merged, redirects)
+        for name, count in sorted(removed.items()):
+            print(f"   {name}: -{count}")
+        redirects_path = args.data_dir / "id-redirects.json"
+        all_redirects = merge_redirects(load_redirects(redirects_path), redirects, set(live_ids))
+        table = save_redirects(all_redirects, redirects_path, args.table)
+        print(f"   리다이렉트 {len(all_redirects)}개 → {redirects_path.name}, "
+              f"{args.table.name} ({len(table) // 1024} KB)")
+        update_meta(args.data_dir / "meta.json", len(live_ids))
+        print(f"   meta.json counts.entries = {len(live_ids)}")
+        print("   샤드, 검색 인덱스, 번들, sitemap, D1 은 해당 스크립트로 다시 생성할 것")
+
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) → {args.out} ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+파이프라인 출력으로 정적 사이트맵 만들기
+data/context → <out>/sitemap.xml, sitemap-pages.xml, sitemap-categories.xml, sitemaps/entries/*.xml
+
+워커가 요청마다 D1 에서 만들던 사이트맵을 배포 전에 파일로 만든다.
+워커는 사이트맵 경로를 ASSETS 로 넘겨 이 파일을 그대로 내보낸다.
+엔트리는 카테고리 파일에서 하나씩 읽어 바로 쓰므로 메모리 사용량은 엔트리 수와 무관하다.
+한 파일이 50,000 URL / 50MB 를 넘기 전에 <카테고리>-2.xml, -3.xml ... 로 나눈다.
+
+lastmod 는 실행한 날짜가 아니라 내용 해시가 마지막으로 바뀐 날짜다.
+엔트리별 해시와 날짜는 --lastmod 의 JSON (apps/context/sitemap-lastmod.json) 에 보관하며,
+데이터를 바꾼 커밋에 함께 커밋한다. 처음 만들 때는 파일을 마지막으로 바꾼 커밋 날짜를 쓴다.
+내용이 같은 파일은 다시 쓰지 않는다.
+
+- pnpm sitemap: 데이터 릴리스 단계. lastmod JSON 을 갱신하고, 바뀌었으면 데이터와 함께 커밋한다.
+- prebuild (--frozen-lastmod): lastmod JSON 을 읽기만 한다. 기록이 없거나 내용 해시가 다르거나
+  없어진 페이지가 있으면 실패하므로, 빌드가 커밋되지 않은 날짜를 만들어 내지 않는다.
+"""
+
+import argparse
+import datetime
+import subprocess
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.changes import content_hash
+from pipeline.jsonstream import iter_array
+from pipeline.sitemaps import (
+    MAX_BYTES,
+    MAX_URLS,
+    LastmodStore,
+    UrlsetWriter,
+    bilingual_urls,
+    write_index,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+OUT_DIR = REPO_ROOT / "apps" / "context" / "public"
+LASTMOD_PATH = REPO_ROOT / "apps" / "context" / "sitemap-lastmod.json"
+
+ENTRIES_DIR = "sitemaps/entries"
+
+STATIC_PAGES = [
+    ("/", "1.0", "weekly"),
+    ("/about", "0.8", "monthly"),
+    ("/browse", "0.9", "weekly"),
+    ("/download", "0.7", "monthly"),
+    ("/built-with", "0.5", "monthly"),
+    ("/license", "0.3", "yearly"),
+    ("/privacy", "0.3", "yearly"),
+    ("/terms", "0.3", "yearly"),
+]
+
+
+def write_urlset(writer: UrlsetWriter, pages) -> list[tuple[str, str, int]]:
+    """(경로, priority, changefreq, lastmod) 들을 writer 에 쓰고 만든 파일 목록 반환"""
+    try:
+        for path, priority, changefreq, lastmod in pages:
+            writer.add(bilingual_urls(path, priority, changefreq, lastmod), 2, lastmod)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def git_date(path: Path) -> str | None:
+    """path 를 마지막으로 바꾼 커밋 날짜 (YYYY-MM-DD), git 밖이거나 커밋된 적 없으면 None"""
+    try:
+        result = subprocess.run(["git", "-C", str(path.parent), "log", "-1", "--format=%cs", "--", path.name],
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def entry_pages(filepath: Path, lastmods: LastmodStore):
+    # 기록이 없을 때 (처음 실행) 는 오늘 대신 파일의 마지막 커밋 날짜
+    seed = git_date(filepath) if lastmods.is_new else None
+    for entry in iter_array(filepath):
+        lastmod = lastmods.lastmod(f"entry:{entry['id']}", content_hash(entry), seed)
+        yield f"/entry/{entry['id']}", "0.6", "monthly", lastmod
+
+
+def check_frozen(lastmods: LastmodStore):
+    """lastmod 기록이 데이터와 맞지 않으면 종료 (--frozen-lastmod)"""
+    changed, dropped = lastmods.changed, lastmods.dropped()
+    if not changed and not dropped:
+        return
+    lines = [f"{lastmods.path} 가 데이터와 맞지 않음"]
+    if changed:
+        lines.append(f"   기록이 없거나 내용이 바뀐 페이지 {len(changed)}개: {', '.join(changed[:5])}")
+    if dropped:
+        lines.append(f"   없어진 페이지 {len(dropped)}개: {', '.join(dropped[:5])}")
+    lines.append("→ pnpm sitemap 을 실행하고 lastmod 파일을 데이터와 함께 커밋")
+    raise SystemExit("\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 / 카테고리 데이터로 정적 사이트맵 만들기")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="categories.json / entries/ 가 있는 디렉터리")
+    parser.add_argument("--out", type=Path, default=OUT_DIR,
+                        help="사이트맵을 쓸 디렉터리 (사이트 루트, 기본: apps/context/public)")
+    parser.add_argument("--lastmod", type=Path, default=LASTMOD_PATH,
+                        help="페이지별 lastmod 와 내용 해시를 보관하는 JSON (커밋 대상)")
+    parser.add_argument("--frozen-lastmod", action="store_true",
+                        help="lastmod JSON 을 쓰지 않고, 데이터와 맞지 않으면 실패 (빌드용)")
+    parser.add_argument("--date", default=None,
+                        help="바뀐 항목에 쓸 lastmod (YYYY-MM-DD, 기본: 오늘 UTC)")
+    parser.add_argument("--max-urls", type=int, default=MAX_URLS, help="파일당 최대 URL 수")
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES, help="파일당 최대 바이트 수")
+    args = parser.parse_args()
+
+    today = args.date or datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    datetime.date.fromisoformat(today)
+
+    print("=== 사이트맵 생성 ===\n")
+    started = time.perf_counter()
+
+    categories = sorted(jsonio.load(args.data_dir / "categories.json"),
+                        key=lambda category: category.get("order", 0))
+    category_ids = [category["id"] for category in categories]
+    entry_files = {path.stem: path for path in (args.data_dir / "entries").glob("*.json")}
+    # categories.json 순서대로, 카테고리에 없는 파일은 뒤에 이름순으로
+    ordered = [c for c in category_ids if c in entry_files] + \
+        sorted(set(entry_files) - set(category_ids))
+
+    lastmods = LastmodStore(args.lastmod, today, frozen=args.frozen_lastmod)
+    limits = {"max_urls": args.max_urls, "max_bytes": args.max_bytes}
+    written = 0
+    try:
+        pages = UrlsetWriter(args.out, "", "sitemap-pages", **limits)
+        sitemaps = write_urlset(pages, (
+            (path, priority, changefreq,
+             lastmods.lastmod(f"page:{path}", content_hash([path, priority, changefreq])))
+            for path, priority, changefreq in STATIC_PAGES))
+        written += pages.written
+
+        category_seed = git_date(args.data_dir / "categories.json") if lastmods.is_new else None
+        category_writer = UrlsetWriter(args.out, "", "sitemap-categories", **limits)
+        sitemaps += write_urlset(category_writer, (
+            (f"/category/{category['id']}", "0.8", "weekly",
+             lastmods.lastmod(f"category:{category['id']}", content_hash(category), category_seed))
+            for category in categories))
+        written += category_writer.written
+
+        entry_sitemaps = []
+        for category_id in ordered:
+            writer = UrlsetWriter(args.out, ENTRIES_DIR, category_id, **limits)
+            files = write_urlset(writer, entry_pages(entry_files[category_id], lastmods))
+            written += writer.written
+            entry_sitemaps += files
+            split = f" ({len(files)}개 파일로 분할)" if len(files) > 1 else ""
+            print(f"   {category_id}: {sum(urls for _, _, urls in files)} URL{split}")
+        sitemaps += entry_sitemaps
+    except BaseException:
+        lastmods.rollback()
+        raise
+    if args.frozen_lastmod:
+        check_frozen(lastmods)
+    changed = len(lastmods.changed)
+    lastmods_written = lastmods.close()
+
+    written += write_index(args.out / "sitemap.xml",
+                           [(relpath, lastmod) for relpath, lastmod, _ in sitemaps])
+
+    # 이전 실행에서 만들었지만 이번에는 없는 엔트리 사이트맵 (삭제된 카테고리, 줄어든 분할)
+    produced = {relpath for relpath, _, _ in entry_sitemaps}
+    stale = [path for path in sorted((args.out / ENTRIES_DIR).glob("*.xml"))
+             if path.relative_to(args.out).as_posix() not in produced]
+    for path in stale:
+        path.unlink()
+
+    total_urls = sum(urls for _, _, urls in sitemaps)
+    print(f"\n   사이트맵 {len(sitemaps)}개 + 인덱스, URL {total_urls}개")
+    print(f"   lastmod 갱신: {changed}개 (날짜 {today})" +
+          (f" → {args.lastmod} 를 데이터와 함께 커밋" if lastmods_written else ""))
+    print(f"   다시 쓴 파일: {written}개, 삭제: {len(stale)}개")
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) → {args.out} ===")
+
+
+if __name__ == "__main__":
+    main()
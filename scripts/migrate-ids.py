@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+한글이 섞인 엔트리 ID → ASCII ID 마이그레이션 + 이전 URL 리다이렉트 테이블
+data/context/entries/*.json (id 필드), ID 레지스트리
+→ data/context/id-redirects.json (이전 ID → 새 ID, 누적)
+→ apps/context/public/data/id-redirects.bin (워커용 최소 완전 해시 테이블)
+
+예전 romanization_map 에 없던 음절이 한글로 남은 ID (w-블rogeu → w-beulrogeu,
+d-med-면yeok → d-med-myeonyeok) 를 코퍼스 한 번 읽어 모두 다시 표기한다.
+새 ID 가 다른 엔트리나 레지스트리의 ID 와 겹치면 -1, -2 ... 를 붙이고 보고서에 충돌로 남긴다.
+
+리다이렉트는 규칙 목록이나 D1 조회 대신 바이너리 테이블 하나로 제공한다.
+워커는 테이블을 한 번 읽어 두고 ID 하나당 고정된 횟수의 읽기로 새 ID 를 찾는다
+(형식: pipeline/id_migration.py).
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.id_migration import (
+    ID_REDIRECTS_VERSION,
+    RedirectTable,
+    load_redirects,
+    merge_redirects,
+    plan_migration,
+    save_redirects,
+)
+from pipeline.id_registry import IdRegistry
+from pipeline.jsonstream import iter_array
+from pipeline.manifest import CACHE_DIR
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+TABLE_PATH = REPO_ROOT / "apps" / "context" / "public" / "data" / "id-redirects.bin"
+
+
+def rewrite_ids(entries_dir: Path, renames: dict[str, str]) -> dict[str, int]:
+    """엔트리 파일의 id 를 새 ID 로 바꿔 저장 (순서, 형식 유지). {파일: 바꾼 수}"""
+    changed = {}
+    for filepath in sorted(entries_dir.glob("*.json")):
+        raw = filepath.read_bytes()
+        entries = jsonio.loads(raw)
+        count = 0
+        for entry in entries:
+            new_id = renames.get(entry["id"])
+            if new_id is not None:
+                entry["id"] = new_id
+                count += 1
+        if count:
+            jsonio.dump(entries, filepath, trailing_newline=raw.endswith(b"\n"))
+            changed[filepath.name] = count
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한글이 섞인 엔트리 ID 를 ASCII 로 바꾸고 리다이렉트 테이블 생성")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/ 와 id-redirects.json 이 있는 디렉터리")
+    parser.add_argument("--table", type=Path, default=TABLE_PATH,
+                        help="워커가 읽을 리다이렉트 테이블 (.bin) 경로")
+    parser.add_argument("--id-registry", type=Path, default=CACHE_DIR / "id-registry.sqlite",
+                        help="함께 갱신할 (소스, 한국어, 영어) → ID 레지스트리 (없으면 건너뜀)")
+    parser.add_argument("--report", type=Path, default=CACHE_DIR / "id-migration.json",
+                        help="바뀐 ID 와 충돌 보고서 경로")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="보고서만 쓰고 엔트리, 레지스트리, 리다이렉트는 그대로 둠")
+    parser.add_argument("--lookup", metavar="ID", default=None,
+                        help="마이그레이션하지 않고 테이블에서 이전 ID 하나만 찾아 출력")
+    args = parser.parse_args()
+
+    if args.lookup:
+        table = RedirectTable(args.table.read_bytes())
+        new_id = table.get(args.lookup)
+        print(new_id if new_id is not None else f"리다이렉트 없음: {args.lookup}")
+        return
+
+    print(f"=== ID 마이그레이션{' (dry-run)' if args.dry_run else ''} ===\n")
+    started = time.perf_counter()
+
+    entries_dir = args.data_dir / "entries"
+    entries = [(entry["id"], entry.get("korean", ""))
+               for filepath in sorted(entries_dir.glob("*.json")) for entry in iter_array(filepath)]
+    registry = IdRegistry(args.id_registry) if args.id_registry.exists() else None
+    # 레지스트리에만 남은 ASCII ID (지금은 파일에 없는 엔트리) 도 새 ID 로 쓰지 않는다
+    reserved = {entry_id for entry_id in registry.ids() if entry_id.isascii()} if registry else set()
+    renames, collisions = plan_migration(entries, reserved)
+    print(f"   엔트리 {len(entries)}개 중 ASCII 가 아닌 ID {len(renames)}개")
+    if collisions:
+        print(f"   ⚠️  새 ID 충돌 {len(collisions)}개 (번호를 붙여 해결)")
+        for collision in collisions[:10]:
+            print(f"     {collision['id']} → {collision['wanted']} ({collision['takenBy']} 와 겹침) "
+                  f"→ {collision['assigned']}")
+
+    redirects_path = args.data_dir / "id-redirects.json"
+    live_ids = {renames.get(entry_id, entry_id) for entry_id, _ in entries}
+    redirects = merge_redirects(load_redirects(redirects_path), renames, live_ids)
+
+    report = {
+        "version": ID_REDIRECTS_VERSION,
+        "entries": len(entries),
+        "renamed": len(renames),
+        "collisions": collisions,
+        "renames": dict(sorted(renames.items())),
+        "applied": not args.dry_run,
+    }
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump(report, args.report)
+
+    if args.dry_run:
+        if registry:
+            registry.conn.close()
+        print(f"\n=== 완료 (dry-run, {time.perf_counter() - started:.2f}s) → {args.report} ===")
+        return
+
+    changed = rewrite_ids(entries_dir, renames)
+    for name, count in changed.items():
+        print(f"   {name}: {count}개")
+    if registry:
+        with registry:
+            renamed = sum(registry.rename(old, new) for old, new in renames.items())
+        print(f"   ID 레지스트리: {renamed}개 갱신")
+
+    table = save_redirects(redirects, redirects_path, args.table)
+    print(f"\n   리다이렉트 {len(redirects)}개 → {redirects_path.name}, "
+          f"{args.table.name} ({len(table) // 1024} KB)")
+    if renames:
+        print("   sitemap, 검색 인덱스, 번들, D1 은 해당 스크립트로 다시 생성할 것")
+
+    print(f"\n=== 완료 ({time.perf_counter() - started:.2f}s) → {args.report} ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Context 어휘 데이터 파이프라인 공용 모듈
+
+scripts/convert-vocabulary.py, scripts/enrich-entries.py 가 함께 사용한다.
+"""
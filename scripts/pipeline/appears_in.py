@@ -0,0 +1,191 @@
+"""
+"Appears in" index: which conversations and entry examples use each word.
+
+Every entry's ``korean`` headword, plus the stem of a ``-다`` verb or
+adjective (먹다 → 먹), is compiled into one Aho-Corasick automaton.
+Each conversation line and each entry's Korean example and dialogue
+line is then scanned once, in time linear in its length plus the
+number of matches, however many words there are. The naive alternative
+tests every text against 12k+ words.
+
+Korean attaches particles and endings directly to a word, so a match
+may be followed by anything. It has to start a word, though: at the
+start of the text or after a character that is not a Hangul syllable.
+Otherwise 가 would match inside 사가. Of the matches starting at the
+same position, only the longest is kept, so 안녕하세요 does not also
+count as 안녕. Patterns shorter than ``min_length`` characters are left
+out. An entry's own examples do not count as occurrences of itself.
+
+The index maps entry ID → occurrences::
+
+    {"version": 1,
+     "entries": {
+       "annyeong": {
+         "conversations": [["greetings-morning-1", 0, 0, 2], ...],
+         "entries": [["insa", "examples.beginner", 5, 7], ...],
+         "entryCount": 31}}}
+
+Conversation occurrences are ``[conversation id, line, start, end]``,
+entry occurrences ``[entry id, field, start, end]``. ``field`` is
+``examples.<level>`` or ``dialogue.<line>``. Offsets are character
+offsets into the Korean text, which equal JavaScript string offsets
+since the text has no characters outside the BMP. Entry occurrences are
+capped per word at ``max_entries``; ``entryCount`` is the uncapped
+total.
+"""
+
+from collections import deque
+
+APPEARS_IN_VERSION = 1
+
+MIN_PATTERN_LENGTH = 2
+MAX_ENTRY_OCCURRENCES = 20
+
+_STEM_POS = frozenset(['verb', 'adjective'])
+
+
+def _is_syllable(char):
+    return '가' <= char <= '힣'
+
+
+class Automaton:
+    """Aho-Corasick automaton over a set of string patterns."""
+
+    def __init__(self, patterns):
+        # State 0 is the root. goto[s] maps a character to the next state,
+        # out[s] holds the patterns ending at s, dict_link[s] the nearest
+        # state on the failure chain that has outputs
+        self.patterns = list(patterns)
+        goto = [{}]
+        out = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)
+
+        fail = [0] * len(goto)
+        dict_link = [-1] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                dict_link[nxt] = fail[nxt] if out[fail[nxt]] else dict_link[fail[nxt]]
+        self.goto, self.fail, self.out, self.dict_link = goto, fail, out, dict_link
+
+    def __len__(self):
+        return len(self.goto)
+
+    def iter_matches(self, text):
+        """Every ``(start, end, pattern index)`` occurrence in text, by end position."""
+        goto, fail, out, dict_link, patterns = self.goto, self.fail, self.out, self.dict_link, self.patterns
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            s = state if out[state] else dict_link[state]
+            while s > 0:
+                for index in out[s]:
+                    yield position + 1 - len(patterns[index]), position + 1, index
+                s = dict_link[s]
+
+
+def entry_patterns(entry, min_length=MIN_PATTERN_LENGTH):
+    """The strings that count as an occurrence of entry."""
+    korean = (entry.get('korean') or '').strip()
+    patterns = {korean} if len(korean) >= min_length else set()
+    if entry.get('partOfSpeech') in _STEM_POS and korean.endswith('다') and len(korean) - 1 >= min_length:
+        patterns.add(korean[:-1])
+    return patterns
+
+
+def entry_texts(entry):
+    """``(field, text)`` for the Korean example and dialogue lines of an entry."""
+    ko = entry.get('translations', {}).get('ko', {})
+    for level, text in (ko.get('examples') or {}).items():
+        if text:
+            yield f'examples.{level}', text
+    for line, turn in enumerate((ko.get('dialogue') or {}).get('dialogue') or []):
+        if turn.get('text'):
+            yield f'dialogue.{line}', turn['text']
+
+
+class AppearsInIndex:
+    """Compiles the headwords of entries and finds them in conversations and examples."""
+
+    def __init__(self, entries, min_length=MIN_PATTERN_LENGTH):
+        owners = {}
+        for entry in entries:
+            for pattern in entry_patterns(entry, min_length):
+                owners.setdefault(pattern, []).append(entry['id'])
+        self.automaton = Automaton(sorted(owners))
+        # Entries sharing a headword (homonyms) all get the occurrence
+        self.owners = [owners[pattern] for pattern in self.automaton.patterns]
+        self.scanned = 0
+        self.characters = 0
+
+    def find(self, text):
+        """``(start, end, entry ids)`` of the word-initial, longest matches in text."""
+        self.scanned += 1
+        self.characters += len(text)
+        longest = {}
+        for start, end, index in self.automaton.iter_matches(text):
+            if start and _is_syllable(text[start - 1]):
+                continue
+            if end > longest.get(start, (0, None))[0]:
+                longest[start] = (end, index)
+        return [(start, end, self.owners[index]) for start, (end, index) in sorted(longest.items())]
+
+
+def build_appears_in(entries, conversations, min_length=MIN_PATTERN_LENGTH,
+                     max_entries=MAX_ENTRY_OCCURRENCES):
+    """The appears-in index (see module docstring) and scan statistics."""
+    entries = list(entries)
+    index = AppearsInIndex(entries, min_length)
+    found = {}
+
+    def occurrences(entry_id):
+        record = found.get(entry_id)
+        if record is None:
+            record = found[entry_id] = {'conversations': [], 'entries': [], 'entryCount': 0}
+        return record
+
+    for conversation in conversations:
+        for line, turn in enumerate(conversation.get('dialogue') or []):
+            for start, end, ids in index.find(turn.get('ko') or ''):
+                for entry_id in ids:
+                    occurrences(entry_id)['conversations'].append([conversation['id'], line, start, end])
+
+    for entry in entries:
+        for field, text in entry_texts(entry):
+            for start, end, ids in index.find(text):
+                for entry_id in ids:
+                    if entry_id == entry['id']:
+                        continue
+                    record = occurrences(entry_id)
+                    record['entryCount'] += 1
+                    if len(record['entries']) < max_entries:
+                        record['entries'].append([entry['id'], field, start, end])
+
+    stats = {
+        'patterns': len(index.automaton.patterns),
+        'states': len(index.automaton),
+        'texts': index.scanned,
+        'characters': index.characters,
+        'entriesFound': len(found),
+        'conversationOccurrences': sum(len(r['conversations']) for r in found.values()),
+        'entryOccurrences': sum(r['entryCount'] for r in found.values()),
+    }
+    return {'version': APPEARS_IN_VERSION, 'entries': dict(sorted(found.items()))}, stats
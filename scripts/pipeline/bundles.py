@@ -0,0 +1,135 @@
+"""
+JSON Lines bundles of the entries with a sorted ID → byte range index.
+
+Each category's entries are written, sorted by ID, to
+``bundles/<category>.jsonl``: one compact JSON entry per line. ``index.json``
+maps every entry ID to the bundle, byte offset and length of its line, as
+parallel arrays sorted by ID::
+
+    {"version": 1,
+     "files": ["bundles/actions.jsonl", ...],
+     "ids": ["a-...", ...],
+     "file": [0, ...], "offset": [0, ...], "length": [812, ...]}
+
+Looking up one entry is a binary search over ``ids`` plus one read of
+``length`` bytes: ``BundleReader`` memory-maps the bundle and decodes only
+that slice, and a worker can fetch the same bytes from R2 with
+``Range: bytes=<offset>-<offset + length - 1>``. The bundles are served
+uncompressed, since a byte range of a compressed file is not decodable.
+
+IDs are sorted by code point, which is also the order of JavaScript
+string comparison for IDs without characters outside the BMP.
+"""
+
+import hashlib
+import mmap
+from bisect import bisect_left
+from pathlib import Path
+
+from pipeline import jsonio
+
+BUNDLE_FORMAT_VERSION = 1
+
+
+def write_category_bundle(category, entries, bundles_dir, base_dir):
+    """
+    Write one category's bundle. Returns ``(record, locations, written)``:
+    the bundle's manifest record (path relative to base_dir),
+    ``[(id, offset, length)]`` of its lines, and whether the file changed.
+    """
+    path = Path(bundles_dir) / f'{category}.jsonl'
+    lines = []
+    locations = []
+    offset = 0
+    for entry in sorted(entries, key=lambda entry: entry['id']):
+        line = jsonio.dumps(entry, pretty=False)
+        lines.append(line)
+        locations.append((entry['id'], offset, len(line)))
+        offset += len(line) + 1
+    data = b''.join(line + b'\n' for line in lines)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = jsonio.write_bytes(path, data)
+    record = {
+        'file': path.relative_to(base_dir).as_posix(),
+        'count': len(lines),
+        'bytes': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+    return record, locations, written
+
+
+def build_index(records, locations):
+    """The index over bundles; ``locations`` holds each bundle's list, in ``records`` order."""
+    rows = sorted((entry_id, file, offset, length)
+                  for file, bundle in enumerate(locations)
+                  for entry_id, offset, length in bundle)
+    for previous, row in zip(rows, rows[1:]):
+        if previous[0] == row[0]:
+            raise ValueError(f"duplicate entry ID in bundles: {row[0]}")
+    return {
+        'version': BUNDLE_FORMAT_VERSION,
+        'files': [record['file'] for record in records],
+        'ids': [row[0] for row in rows],
+        'file': [row[1] for row in rows],
+        'offset': [row[2] for row in rows],
+        'length': [row[3] for row in rows],
+    }
+
+
+class BundleReader:
+    """Random access to entries by ID through the index and memory-mapped bundles."""
+
+    def __init__(self, base_dir, index_path='bundles/index.json'):
+        self.base_dir = Path(base_dir)
+        self.index = jsonio.load(self.base_dir / index_path)
+        if self.index.get('version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"bundle index version {self.index.get('version')}, "
+                             f"expected {BUNDLE_FORMAT_VERSION}")
+        self.ids = self.index['ids']
+        self.maps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, entry_id):
+        return self.locate(entry_id) is not None
+
+    def locate(self, entry_id):
+        """``(file, offset, length)`` of an entry's line, or None."""
+        position = bisect_left(self.ids, entry_id)
+        if position == len(self.ids) or self.ids[position] != entry_id:
+            return None
+        index = self.index
+        return (index['files'][index['file'][position]], index['offset'][position],
+                index['length'][position])
+
+    def _map(self, file):
+        mapped = self.maps.get(file)
+        if mapped is None:
+            with open(self.base_dir / file, 'rb') as f:
+                mapped = self.maps[file] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def get_bytes(self, entry_id):
+        """The entry's JSON line (without the newline), or None."""
+        location = self.locate(entry_id)
+        if location is None:
+            return None
+        file, offset, length = location
+        return self._map(file)[offset:offset + length]
+
+    def get(self, entry_id):
+        """The decoded entry, or None."""
+        data = self.get_bytes(entry_id)
+        return None if data is None else jsonio.loads(data)
+
+    def close(self):
+        for mapped in self.maps.values():
+            mapped.close()
+        self.maps.clear()
@@ -0,0 +1,212 @@
+"""
+Release index and changefeed between two versions of the Context data.
+
+A release index records what one version of ``data/context`` contains:
+the content hash of every category, entry and conversation by ID (plus
+the entry's category), and the SHA-256 of every data file, shards and
+meta.json included. Indexes are built from a data directory
+(``build_index``) or from a git revision (``index_from_git``), and a
+deploy keeps the index of what it released so the next run can diff
+against it.
+
+``diff_indexes`` compares two indexes by ID and content hash and returns
+the changefeed: added, changed and removed IDs per collection, plus the
+data files that were added, changed or removed. ``write_delta_sql`` turns
+a changefeed into upsert/delete statements for D1, so a deploy applies
+only what changed.
+
+Content hashes are taken over the canonical (sorted-key, compact) JSON of
+a record, so reformatting a file or reordering keys does not count as a
+change.
+"""
+
+import hashlib
+import subprocess
+from pathlib import Path, PurePosixPath
+
+from pipeline import jsonio
+from pipeline.d1 import (
+    category_row,
+    conversation_row,
+    delete_sql,
+    entry_row,
+    insert_statements,
+    translation_rows,
+)
+from pipeline.jsonstream import iter_array
+
+INDEX_VERSION = 1
+CHANGEFEED_VERSION = 1
+
+COLLECTIONS = ('categories', 'entries', 'conversations')
+
+# Data files tracked by the index, relative to the data directory
+DATA_FILE_GLOBS = ('meta.json', 'categories.json', 'conversations.json',
+                   'entries/*.json', 'shards/*/*.json', 'search/*.json',
+                   'bundles/index.json', 'bundles/*.jsonl', 'appears-in.json')
+
+
+def content_hash(record):
+    """Short hash of a record's canonical JSON."""
+    return hashlib.sha256(jsonio.dumps(record, pretty=False, sort_keys=True)).hexdigest()[:16]
+
+
+class _IndexBuilder:
+    def __init__(self):
+        self.index = {
+            'version': INDEX_VERSION,
+            'categories': {},
+            'entries': {},
+            'conversations': {},
+            'files': {},
+        }
+
+    def add_file(self, relpath, data):
+        self.index['files'][relpath] = hashlib.sha256(data).hexdigest()
+        if relpath == 'categories.json':
+            for category in jsonio.loads(data):
+                self.index['categories'][category['id']] = content_hash(category)
+        elif relpath == 'conversations.json':
+            for conversation in jsonio.loads(data):
+                self.index['conversations'][conversation['id']] = content_hash(conversation)
+        elif relpath.startswith('entries/'):
+            for entry in jsonio.loads(data):
+                self.index['entries'][entry['id']] = [entry.get('categoryId'), content_hash(entry)]
+
+
+def _is_data_file(relpath):
+    return any(PurePosixPath(relpath).match(pattern) and
+               len(PurePosixPath(relpath).parts) == len(PurePosixPath(pattern).parts)
+               for pattern in DATA_FILE_GLOBS)
+
+
+def build_index(data_dir):
+    """The release index of a data directory as it is on disk."""
+    data_dir = Path(data_dir)
+    builder = _IndexBuilder()
+    for pattern in DATA_FILE_GLOBS:
+        for path in sorted(data_dir.glob(pattern)):
+            builder.add_file(path.relative_to(data_dir).as_posix(), path.read_bytes())
+    return builder.index
+
+
+def _git(repo, *args):
+    return subprocess.run(['git', '-C', str(repo), *args], check=True,
+                          capture_output=True).stdout
+
+
+def index_from_git(ref, data_dir):
+    """The release index of data_dir as of git revision ``ref``."""
+    data_dir = Path(data_dir).resolve()
+    repo = Path(_git(data_dir, 'rev-parse', '--show-toplevel').decode().strip())
+    prefix = data_dir.relative_to(repo).as_posix()
+    listing = _git(repo, 'ls-tree', '-r', '-z', '--name-only', ref, '--', prefix)
+    builder = _IndexBuilder()
+    for name in sorted(listing.decode().split('\0')):
+        relpath = name[len(prefix) + 1:] if name.startswith(prefix + '/') else None
+        if relpath and _is_data_file(relpath):
+            builder.add_file(relpath, _git(repo, 'show', f'{ref}:{name}'))
+    return builder.index
+
+
+def load_index(path):
+    """A saved index, or None if there is none yet (everything then counts as added)."""
+    try:
+        index = jsonio.load(path)
+    except FileNotFoundError:
+        return None
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f"{path}: release index version {index.get('version')}, expected {INDEX_VERSION}")
+    return index
+
+
+def save_index(index, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump(index, path, pretty=False)
+
+
+def _hash_of(collection, value):
+    return value[1] if collection == 'entries' else value
+
+
+def diff_indexes(base, head):
+    """
+    The changefeed from base to head. A missing base (None) is an empty
+    release, so every record is added.
+    """
+    base = base or {collection: {} for collection in (*COLLECTIONS, 'files')}
+    feed = {'version': CHANGEFEED_VERSION}
+    counts = {}
+    for collection in COLLECTIONS:
+        old, new = base[collection], head[collection]
+        added = sorted(key for key in new if key not in old)
+        removed = sorted(key for key in old if key not in new)
+        changed = sorted(key for key in new if key in old
+                         and _hash_of(collection, new[key]) != _hash_of(collection, old[key]))
+        feed[collection] = {'added': added, 'changed': changed, 'removed': removed}
+        counts[collection] = {'added': len(added), 'changed': len(changed), 'removed': len(removed),
+                              'unchanged': len(new) - len(added) - len(changed)}
+
+    old_files, new_files = base['files'], head['files']
+    feed['files'] = {
+        'added': sorted(f for f in new_files if f not in old_files),
+        'changed': sorted(f for f in new_files if f in old_files and new_files[f] != old_files[f]),
+        'removed': sorted(f for f in old_files if f not in new_files),
+    }
+    feed['counts'] = counts
+    # Entry categories, so consumers (sitemaps, caches) can locate changed entries
+    feed['entryCategories'] = {
+        key: (head['entries'].get(key) or base['entries'][key])[0]
+        for change in ('added', 'changed', 'removed') for key in feed['entries'][change]
+    }
+    return feed
+
+
+def is_empty(feed):
+    return not any(feed[collection][change]
+                   for collection in (*COLLECTIONS, 'files')
+                   for change in ('added', 'changed', 'removed'))
+
+
+def write_delta_sql(feed, data_dir, writer):
+    """
+    Write the statements that turn the base release's D1 data into head's
+    to a ``SqlBatchWriter``. Deletes come first; changed entries replace
+    their translation rows, so locales that were dropped disappear too.
+    Returns the number of statements.
+    """
+    data_dir = Path(data_dir)
+    start = writer.statements
+    entries = feed['entries']
+    for entry_id in entries['removed'] + entries['changed']:
+        writer.write(delete_sql('entry_translations', 'entry_id', entry_id))
+    for entry_id in entries['removed']:
+        writer.write(delete_sql('entries', 'id', entry_id))
+    for conversation_id in feed['conversations']['removed']:
+        writer.write(delete_sql('conversations', 'id', conversation_id))
+    for category_id in feed['categories']['removed']:
+        writer.write(delete_sql('categories', 'id', category_id))
+
+    upsert = {collection: set(feed[collection]['added']) | set(feed[collection]['changed'])
+              for collection in COLLECTIONS}
+    if upsert['categories']:
+        for category in jsonio.load(data_dir / 'categories.json'):
+            if category['id'] in upsert['categories']:
+                for statement in insert_statements('categories', category_row(category)):
+                    writer.write(statement)
+    if upsert['entries']:
+        for path in sorted((data_dir / 'entries').glob('*.json')):
+            for entry in iter_array(path):
+                if entry['id'] in upsert['entries']:
+                    for statement in insert_statements('entries', entry_row(entry)):
+                        writer.write(statement)
+                    for row in translation_rows(entry):
+                        for statement in insert_statements('entry_translations', row):
+                            writer.write(statement)
+    if upsert['conversations']:
+        for conversation in jsonio.load(data_dir / 'conversations.json'):
+            if conversation['id'] in upsert['conversations']:
+                for statement in insert_statements('conversations', conversation_row(conversation)):
+                    writer.write(statement)
+    return writer.statements - start
@@ -0,0 +1,199 @@
+"""
+Batch enrichment.
+
+``EntryTable`` holds the fields enrichment reads (korean, english,
+categoryId) as one list per field. The generated fields are then built a
+column at a time:
+
+- ``romanize_column`` romanizes each distinct string once;
+- the dialogue columns fill each category's template once per category;
+- the variation columns fill the same ``VARIATION_TEMPLATES`` patterns as
+  ``generate_variations``, a column at a time.
+
+Entry dicts are only touched at the end, by ``enrich_batch``, which writes
+exactly what ``enrich_entry`` would have written. ``generate_fields`` and
+``apply_fields`` are the two halves, so generated fields can also come from
+an ``EnrichmentCache``.
+
+This is batching, not vectorization: the per-element work is still Python
+(``romanize`` per string, ``str.format`` per row), and NumPy is not a
+dependency of the pipeline. Most of the gain comes from pausing the cyclic
+garbage collector while a batch is built. Materializing allocates hundreds
+of thousands of small, acyclic containers, and the collections they trigger
+otherwise rescan every live entry and take about half the time.
+"""
+
+import gc
+from contextlib import contextmanager
+
+from pipeline.enrich_cache import enrichment_key
+from pipeline.romanization import romanize
+from pipeline.templates import (
+    DEFAULT_DIALOGUE,
+    DIALOGUE_TEMPLATES,
+    VARIATION_TEMPLATES,
+    build_dialogue,
+    short_english,
+    short_korean,
+)
+
+
+class EntryTable:
+    """The enrichment inputs of a batch of entries, one column per field."""
+
+    def __init__(self, korean, english, category_id):
+        self.korean = korean
+        self.english = english
+        self.category_id = category_id
+
+    @classmethod
+    def from_entries(cls, entries):
+        korean = []
+        english = []
+        category_id = []
+        for entry in entries:
+            korean.append(entry.get('korean', ''))
+            english.append(entry.get('translations', {}).get('en', {}).get('word', ''))
+            category_id.append(entry.get('categoryId', 'basic-words'))
+        return cls(korean, english, category_id)
+
+    def __len__(self):
+        return len(self.korean)
+
+
+def romanize_column(texts):
+    """Romanize a column of strings, each distinct string once."""
+    romanized = {text: romanize(text) for text in dict.fromkeys(texts)}
+    return [romanized[text] for text in texts]
+
+
+def dialogue_columns(table):
+    """
+    Filled-in dialogue lines as columns: context_ko, context_en, a_ko, b_ko,
+    a_en, b_en. Rows are grouped by category so each template is looked up
+    once per category.
+    """
+    columns = [[None] * len(table) for _ in range(6)]
+    groups = {}
+    for row, category_id in enumerate(table.category_id):
+        groups.setdefault(category_id, []).append(row)
+
+    korean, english = table.korean, table.english
+    for category_id, rows in groups.items():
+        context_ko, context_en, *lines = DIALOGUE_TEMPLATES.get(category_id, DEFAULT_DIALOGUE)
+        for row in rows:
+            columns[0][row] = context_ko
+            columns[1][row] = context_en
+        for column, line in zip(columns[2:], lines):
+            fmt = line.format
+            for row in rows:
+                column[row] = fmt(ko=korean[row], en=english[row])
+    return columns
+
+
+def variation_columns(table):
+    """generate_variations as columns: (ko formal, casual, short, en formal, casual, short)."""
+    korean, english = table.korean, table.english
+    ko, en = VARIATION_TEMPLATES['ko'], VARIATION_TEMPLATES['en']
+
+    def fill(lines, key, words):
+        formats = [line.format for line in lines]
+        return [[fmt(**{key: word}) for fmt in formats] for word in words]
+
+    return (
+        fill(ko['formal'], 'ko', korean),
+        fill(ko['casual'], 'ko', korean),
+        [[short_korean(k)] for k in korean],
+        fill(en['formal'], 'en', english),
+        fill(en['casual'], 'en', english),
+        [[short_english(e)] for e in english],
+    )
+
+
+@contextmanager
+def gc_paused():
+    """Disable the cyclic garbage collector for the duration of the block."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def enrich_batch(entries, indices, cache=None):
+    """
+    Enrich the entries at the given indices in place, like ``enrich_entry``
+    on each of them. Entries that already have a romanization are skipped.
+    With an ``EnrichmentCache``, inputs it has seen before are not
+    generated again, and newly generated ones are added to it.
+    """
+    rows = [i for i in indices if not entries[i].get('romanization')]
+    if not rows:
+        return
+    with gc_paused():
+        batch = [entries[i] for i in rows]
+        table = EntryTable.from_entries(batch)
+        if cache is None:
+            generated = generate_fields(table)
+        else:
+            generated = _cached_fields(table, cache)
+        for entry, fields in zip(batch, generated):
+            apply_fields(entry, fields)
+
+
+def _cached_fields(table, cache):
+    keys = [enrichment_key(*row) for row in zip(table.korean, table.english, table.category_id)]
+    fields = [cache.get(key) for key in keys]
+    missing = [row for row, value in enumerate(fields) if value is None]
+    if missing:
+        subset = EntryTable([table.korean[row] for row in missing],
+                            [table.english[row] for row in missing],
+                            [table.category_id[row] for row in missing])
+        for row, value in zip(missing, generate_fields(subset)):
+            cache.put(keys[row], value)
+            fields[row] = value
+    return fields
+
+
+def generate_fields(table):
+    """
+    Everything enrichment generates for each row, as ``{'romanization',
+    'dialogue': {'ko', 'en'}, 'variations': {'ko', 'en'}}``.
+    """
+    romanization = romanize_column(table.korean)
+    context_ko, context_en, a_ko, b_ko, a_en, b_en = dialogue_columns(table)
+    romanization_a = romanize_column(a_ko)
+    romanization_b = romanize_column(b_ko)
+    ko_formal, ko_casual, ko_short, en_formal, en_casual, en_short = variation_columns(table)
+
+    return [
+        {
+            'romanization': romanization[row],
+            'dialogue': build_dialogue(
+                context_ko[row], context_en[row], a_ko[row], b_ko[row], a_en[row], b_en[row],
+                romanization_a[row], romanization_b[row],
+            ),
+            'variations': {
+                'ko': {'formal': ko_formal[row], 'casual': ko_casual[row], 'short': ko_short[row]},
+                'en': {'formal': en_formal[row], 'casual': en_casual[row], 'short': en_short[row]},
+            },
+        }
+        for row in range(len(table))
+    ]
+
+
+def apply_fields(entry, fields):
+    """Write generated fields into an entry, where ``enrich_entry`` puts them."""
+    entry['romanization'] = fields['romanization']
+    if 'translations' in entry:
+        translations = entry['translations']
+        for lang in ('ko', 'en'):
+            if lang in translations:
+                translations[lang]['dialogue'] = fields['dialogue'][lang]
+                translations[lang]['variations'] = fields['variations'][lang]
+    entry['pronunciation'] = {
+        'korean': f"[{entry.get('korean', '')}]",
+        'ipa': f"[{fields['romanization']}]",
+    }
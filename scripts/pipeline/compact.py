@@ -0,0 +1,200 @@
+"""
+Template-deduplicated storage for entry files.
+
+Generated entries are stored as one positional row of parameters
+(``korean``, ``english``, ``categoryId`` ...) plus the template that
+expands them, instead of the full JSON with every explanation, example,
+variation and dialogue line spelled out. Anything the template does not
+reproduce is kept as a literal override, and key order is kept as a shared
+*shape* so ``expand_document`` returns exactly the JSON it was built from.
+
+Templates:
+
+- ``g``: ``create_entry`` followed by ``enrich_entry``
+- ``c``: ``create_entry`` only
+- ``l``: no template, the row holds the literal entry
+
+Every row is checked on encode; a row that would not round-trip is stored
+as a literal. Documents record ``TEMPLATE_VERSION`` and refuse to expand
+under a different one, since the same row would then produce other text.
+"""
+
+from pipeline import jsonio
+from pipeline.templates import TEMPLATE_VERSION, create_entry, enrich_entry
+
+FORMAT = 'context-entries-compact'
+FORMAT_VERSION = 1
+
+FIELDS = ('id', 'korean', 'english', 'categoryId', 'partOfSpeech', 'difficulty',
+          'frequency', 'tags', 'template', 'shape', 'overrides')
+
+GENERATED = 'g'
+CREATED = 'c'
+LITERAL = 'l'
+
+# Path separator for override keys
+SEP = '/'
+
+
+def _dumps(value):
+    return jsonio.dumps(value, pretty=False)
+
+
+def _expand_template(template, korean, english, category_id, part_of_speech):
+    entry = create_entry(korean, english, category_id, part_of_speech)
+    if template == GENERATED:
+        enrich_entry(entry)
+    return entry
+
+
+def _shape(value):
+    """Nested key order of value; None for anything that is not a dict."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    return None
+
+
+def _project(value, shape):
+    """Reorder value's keys to match shape, dropping keys shape does not have."""
+    if isinstance(shape, dict) and isinstance(value, dict):
+        return {key: _project(value.get(key), item) for key, item in shape.items()}
+    return value
+
+
+def _diff(base, target, path, overrides):
+    """Collect the values of target that base does not already produce."""
+    for key, value in target.items():
+        key_path = f'{path}{SEP}{key}' if path else key
+        if key not in base:
+            overrides[key_path] = value
+        elif isinstance(value, dict) and isinstance(base[key], dict):
+            _diff(base[key], value, key_path, overrides)
+        elif _dumps(value) != _dumps(base[key]):
+            overrides[key_path] = value
+
+
+def _apply(entry, overrides):
+    for key_path, value in overrides.items():
+        *parents, key = key_path.split(SEP)
+        node = entry
+        for parent in parents:
+            child = node.get(parent)
+            if not isinstance(child, dict):
+                child = node[parent] = {}
+            node = child
+        node[key] = value
+
+
+def _params(entry):
+    english = ((entry.get('translations') or {}).get('en') or {}).get('word', '')
+    return (
+        entry.get('id'), entry.get('korean'), english, entry.get('categoryId'),
+        entry.get('partOfSpeech', 'noun'), entry.get('difficulty'),
+        entry.get('frequency'), entry.get('tags'),
+    )
+
+
+def _expand_row(row, shapes):
+    (entry_id, korean, english, category_id, part_of_speech, difficulty,
+     frequency, tags, template, shape, overrides) = row
+    if template == LITERAL:
+        return overrides
+
+    entry = _expand_template(template, korean, english, category_id, part_of_speech)
+    entry['id'] = entry_id
+    entry['difficulty'] = difficulty
+    entry['frequency'] = frequency
+    entry['tags'] = tags
+    if overrides:
+        _apply(entry, overrides)
+    return _project(entry, shapes[shape])
+
+
+class _Encoder:
+    """Builds rows for one document, sharing shapes between them."""
+
+    def __init__(self):
+        self.shapes = []
+        self.shape_index = {}
+
+    def _shape_id(self, entry):
+        shape = _shape(entry)
+        key = _dumps(shape)
+        if key not in self.shape_index:
+            self.shape_index[key] = len(self.shapes)
+            self.shapes.append(shape)
+        return self.shape_index[key]
+
+    def row(self, entry):
+        literal = [None] * (len(FIELDS) - 3) + [LITERAL, None, entry]
+        if not isinstance(entry, dict) or not isinstance(entry.get('korean'), str):
+            return literal
+
+        params = _params(entry)
+        _, korean, english, category_id, part_of_speech = params[:5]
+        if not isinstance(english, str) or not isinstance(category_id, str):
+            return literal
+
+        expected = _dumps(entry)
+        best, best_size = literal, len(expected)
+        for template in (GENERATED, CREATED):
+            base = _expand_template(template, korean, english, category_id, part_of_speech)
+            base.update(id=params[0], difficulty=params[5], frequency=params[6], tags=params[7])
+            overrides = {}
+            _diff(base, entry, '', overrides)
+            size = len(_dumps(overrides))
+            if size >= best_size:
+                continue
+            shape_count = len(self.shapes)
+            row = [*params, template, self._shape_id(entry), overrides or None]
+            if _dumps(_expand_row(row, self.shapes)) != expected:
+                del self.shapes[shape_count:]
+                continue
+            best, best_size = row, size
+        return best
+
+
+def encode_document(entries, trailing_newline=False):
+    """Compact document for a list of entries."""
+    encoder = _Encoder()
+    rows = [encoder.row(entry) for entry in entries]
+    # Drop shapes only referenced by rejected candidates, renumbering the rest
+    used = sorted({row[9] for row in rows if row[8] != LITERAL})
+    remap = {old: new for new, old in enumerate(used)}
+    for row in rows:
+        if row[8] != LITERAL:
+            row[9] = remap[row[9]]
+    return {
+        'format': FORMAT,
+        'version': FORMAT_VERSION,
+        'templateVersion': TEMPLATE_VERSION,
+        'trailingNewline': trailing_newline,
+        'fields': list(FIELDS),
+        'shapes': [encoder.shapes[i] for i in used],
+        'rows': rows,
+    }
+
+
+def expand_document(document):
+    """Entries of a compact document, in their original JSON shape."""
+    if document.get('format') != FORMAT or document.get('version') != FORMAT_VERSION:
+        raise ValueError(f"not a {FORMAT} v{FORMAT_VERSION} document")
+    if document.get('templateVersion') != TEMPLATE_VERSION:
+        raise ValueError(
+            f"document uses template version {document.get('templateVersion')}, "
+            f"this pipeline has {TEMPLATE_VERSION}; re-encode from the JSON entries"
+        )
+    shapes = document['shapes']
+    return [_expand_row(row, shapes) for row in document['rows']]
+
+
+def dump_document(document):
+    return _dumps(document)
+
+
+def render_entries(document, entries=None):
+    """The entry file bytes a document was encoded from."""
+    if entries is None:
+        entries = expand_document(document)
+    data = jsonio.dumps(entries)
+    return data + b'\n' if document.get('trailingNewline') else data
@@ -0,0 +1,140 @@
+"""
+Precompressed variants of the data files.
+
+Each data file gets ``<file>.gz``, ``<file>.br`` and ``<file>.zst`` next to
+it, at each codec's maximum level, so a CDN or edge worker can pick the
+variant matching ``Accept-Encoding`` and serve it as-is. gzip is always
+available. Brotli (``brotli``) and zstd (``zstandard``) are optional
+dependencies; their variants are skipped when the module isn't installed.
+
+Output is deterministic: gzip headers carry no mtime or file name, so an
+unchanged file compresses to the same bytes and hash on every run.
+
+Stale variants never outlive their source. When a file changes, the
+variants of codecs not written in this run (module missing, or left out of
+``--codecs``) are deleted. When a file disappears, all its variants are
+deleted. ``remove_orphans`` finds those from the files on disk, so this
+does not depend on the previous run's records.
+"""
+
+import gzip
+import hashlib
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.trace import file_size
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESS_FORMAT_VERSION = 1
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11, lgwin=24)
+
+
+def _zstd(data):
+    return zstandard.ZstdCompressor(level=22).compress(data)
+
+
+# name → (file extension, Content-Encoding, level, compress function or None)
+CODECS = {
+    'gzip': ('.gz', 'gzip', 9, _gzip),
+    'br': ('.br', 'br', 11, _brotli if brotli else None),
+    'zstd': ('.zst', 'zstd', 22, _zstd if zstandard else None),
+}
+
+
+def available_codecs():
+    return [name for name, codec in CODECS.items() if codec[3]]
+
+
+def variant_path(path, codec):
+    path = Path(path)
+    return path.with_name(path.name + CODECS[codec][0])
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress_file(path, codecs, previous=None, force=False):
+    """
+    Write the variants of one file. ``previous`` is the file's record from
+    the last run; a variant whose source hash and on-disk size still match
+    it is reused without compressing again (unless ``force``). Variants of
+    the other codecs are kept only if they still match, and deleted
+    otherwise.
+
+    Returns ``(record, written, removed)``: ``{bytes, sha256, variants:
+    {codec: {bytes, sha256}}}``, the number of variant files rewritten and
+    the number deleted.
+    """
+    data = Path(path).read_bytes()
+    sha256 = _digest(data)
+    unchanged = bool(previous) and previous.get('sha256') == sha256
+    previous_variants = previous.get('variants', {}) if unchanged else {}
+    reusable = {} if force else previous_variants
+
+    variants = {}
+    written = 0
+    for codec in codecs:
+        target = variant_path(path, codec)
+        old = reusable.get(codec)
+        if old and file_size(target) == old['bytes']:
+            variants[codec] = old
+            continue
+        compressed = CODECS[codec][3](data)
+        if jsonio.write_bytes(target, compressed):
+            written += 1
+        variants[codec] = {'bytes': len(compressed), 'sha256': _digest(compressed)}
+
+    removed = 0
+    for codec in CODECS:
+        if codec in codecs:
+            continue
+        target = variant_path(path, codec)
+        old = previous_variants.get(codec)
+        if old and file_size(target) == old['bytes']:
+            variants[codec] = old
+        elif target.exists():
+            target.unlink()
+            removed += 1
+
+    return {'bytes': len(data), 'sha256': sha256, 'variants': variants}, written, removed
+
+
+def remove_variants(path):
+    """Delete every variant of path (for a source file that no longer exists)."""
+    removed = 0
+    for codec in CODECS:
+        target = variant_path(path, codec)
+        if target.exists():
+            target.unlink()
+            removed += 1
+    return removed
+
+
+def remove_orphans(data_dir, patterns):
+    """Delete the variants under data_dir whose source file is gone. Returns the count."""
+    data_dir = Path(data_dir)
+    removed = 0
+    for pattern in patterns:
+        for codec in CODECS:
+            for target in data_dir.glob(pattern + CODECS[codec][0]):
+                if not target.with_name(target.name[:-len(CODECS[codec][0])]).exists():
+                    target.unlink()
+                    removed += 1
+    return removed
@@ -0,0 +1,266 @@
+"""
+D1 / SQLite schema and row mapping for Context data.
+
+Tables and columns mirror ``apps/context/migrations/0001_initial.sql`` and
+``0004_entry_translations.sql``. ``entry_translations`` adds one row per
+entry and locale, so the per-locale text can be queried without parsing the
+``entries.translations`` JSON.
+Indexes are kept separate from the tables so bulk loads can create them
+after the data is in.
+"""
+
+import json
+import os
+from pathlib import Path
+
+TABLES = {
+    'categories': """CREATE TABLE IF NOT EXISTS categories (
+  id TEXT PRIMARY KEY,
+  name_ko TEXT NOT NULL,
+  name_en TEXT NOT NULL,
+  description_ko TEXT,
+  description_en TEXT,
+  icon TEXT,
+  color TEXT,
+  sort_order INTEGER DEFAULT 0
+);""",
+    'entries': """CREATE TABLE IF NOT EXISTS entries (
+  id TEXT PRIMARY KEY,
+  korean TEXT NOT NULL,
+  romanization TEXT,
+  part_of_speech TEXT,
+  category_id TEXT NOT NULL,
+  difficulty TEXT,
+  frequency TEXT,
+  tags TEXT,
+  translations TEXT,
+  created_at INTEGER DEFAULT (unixepoch())
+);""",
+    'entry_translations': """CREATE TABLE IF NOT EXISTS entry_translations (
+  entry_id TEXT NOT NULL,
+  locale TEXT NOT NULL,
+  word TEXT,
+  explanation TEXT,
+  examples TEXT,
+  variations TEXT,
+  dialogue TEXT,
+  PRIMARY KEY (entry_id, locale)
+);""",
+    'conversations': """CREATE TABLE IF NOT EXISTS conversations (
+  id TEXT PRIMARY KEY,
+  category_id TEXT,
+  title_ko TEXT NOT NULL,
+  title_en TEXT NOT NULL,
+  dialogue TEXT NOT NULL,
+  created_at INTEGER DEFAULT (unixepoch())
+);""",
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_entries_category ON entries(category_id);",
+    "CREATE INDEX IF NOT EXISTS idx_entries_korean ON entries(korean);",
+    "CREATE INDEX IF NOT EXISTS idx_entries_difficulty ON entries(difficulty);",
+    "CREATE INDEX IF NOT EXISTS idx_conversations_category ON conversations(category_id);",
+]
+
+COLUMNS = {
+    'categories': ('id', 'name_ko', 'name_en', 'description_ko', 'description_en',
+                   'icon', 'color', 'sort_order'),
+    'entries': ('id', 'korean', 'romanization', 'part_of_speech', 'category_id',
+                'difficulty', 'frequency', 'tags', 'translations'),
+    'entry_translations': ('entry_id', 'locale', 'word', 'explanation', 'examples',
+                           'variations', 'dialogue'),
+    'conversations': ('id', 'category_id', 'title_ko', 'title_en', 'dialogue'),
+}
+
+KEYS = {
+    'categories': ('id',),
+    'entries': ('id',),
+    'entry_translations': ('entry_id', 'locale'),
+    'conversations': ('id',),
+}
+
+# Limit on one SQL statement in D1 (bytes)
+D1_MAX_STATEMENT_BYTES = 100_000
+# Per batch file for ``wrangler d1 execute --file``
+D1_MAX_STATEMENTS = 1000
+D1_MAX_FILE_BYTES = 1 << 20
+# Text columns at least this long are appended by UPDATEs when a row is too big
+SPLIT_MIN_BYTES = 1024
+
+
+def to_json(value):
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def category_row(category):
+    name = category.get('name', {})
+    description = category.get('description', {})
+    return (
+        category['id'], name.get('ko', ''), name.get('en', ''),
+        description.get('ko'), description.get('en'),
+        category.get('icon'), category.get('color'), category.get('order', 0),
+    )
+
+
+def entry_row(entry):
+    return (
+        entry['id'], entry['korean'], entry.get('romanization'),
+        entry.get('partOfSpeech'), entry['categoryId'],
+        entry.get('difficulty'), entry.get('frequency'),
+        to_json(entry.get('tags', [])), to_json(entry.get('translations')),
+    )
+
+
+def translation_rows(entry):
+    for locale, translation in (entry.get('translations') or {}).items():
+        yield (
+            entry['id'], locale, translation.get('word'), translation.get('explanation'),
+            to_json(translation.get('examples')), to_json(translation.get('variations')),
+            to_json(translation.get('dialogue')),
+        )
+
+
+def conversation_row(conversation):
+    title = conversation.get('title', {})
+    return (
+        conversation['id'], conversation.get('categoryId'),
+        title.get('ko', ''), title.get('en', ''), to_json(conversation.get('dialogue', [])),
+    )
+
+
+def sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def insert_sql(table, row, verb='INSERT OR REPLACE'):
+    columns = ', '.join(COLUMNS[table])
+    values = ', '.join(sql_literal(v) for v in row)
+    return f"{verb} INTO {table} ({columns}) VALUES ({values});"
+
+
+def _literal_chunks(text, max_bytes):
+    """Split text into pieces whose SQL literal is at most max_bytes long."""
+    start = 0
+    size = 2
+    for i, char in enumerate(text):
+        n = len(char.encode('utf-8')) * (2 if char == "'" else 1)
+        if size + n > max_bytes:
+            yield text[start:i]
+            start = i
+            size = 2
+        size += n
+    yield text[start:]
+
+
+def insert_statements(table, row, verb='INSERT OR REPLACE', max_bytes=D1_MAX_STATEMENT_BYTES):
+    """
+    ``insert_sql`` split to fit D1's statement limit. A row that is too big
+    is inserted with its long text columns empty, then each column is
+    appended in ``UPDATE ... SET col = col || '...'`` pieces. Raises
+    ValueError if even that cannot fit.
+    """
+    statement = insert_sql(table, row, verb)
+    if len(statement.encode('utf-8')) <= max_bytes:
+        return [statement]
+
+    columns = COLUMNS[table]
+    keys = KEYS[table]
+    head = list(row)
+    tails = []
+    for i, (column, value) in enumerate(zip(columns, row)):
+        if column not in keys and isinstance(value, str) and len(value.encode('utf-8')) >= SPLIT_MIN_BYTES:
+            head[i] = ''
+            tails.append((column, value))
+
+    statements = [insert_sql(table, head, verb)]
+    where = ' AND '.join(f"{key} = {sql_literal(row[columns.index(key)])}" for key in keys)
+    for column, value in tails:
+        template = f"UPDATE {table} SET {column} = {column} || {{}} WHERE {where};"
+        budget = max_bytes - len(template.encode('utf-8')) + 2
+        if budget < 64:
+            raise ValueError(f"{table} row {row[0]!r}: key too long to split {column}")
+        statements.extend(template.format(sql_literal(chunk)) for chunk in _literal_chunks(value, budget))
+
+    oversize = [len(s.encode('utf-8')) for s in statements if len(s.encode('utf-8')) > max_bytes]
+    if oversize:
+        raise ValueError(f"{table} row {row[0]!r}: statement of {max(oversize)} bytes "
+                         f"cannot be split below {max_bytes} bytes")
+    return statements
+
+
+def delete_sql(table, key_column, key):
+    return f"DELETE FROM {table} WHERE {key_column} = {sql_literal(key)};"
+
+
+def insert_placeholders(table, verb='INSERT OR REPLACE'):
+    columns = COLUMNS[table]
+    return (f"{verb} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})")
+
+
+class SqlBatchWriter:
+    """
+    Splits SQL statements into numbered files small enough for
+    ``wrangler d1 execute --file``. Files are named ``<prefix>-0001.sql``,
+    ``<prefix>-0002.sql`` ... and applied in name order.
+    """
+
+    def __init__(self, out_dir, prefix='data', max_statements=D1_MAX_STATEMENTS,
+                 max_bytes=D1_MAX_FILE_BYTES, max_statement_bytes=D1_MAX_STATEMENT_BYTES):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_statements = max_statements
+        self.max_bytes = max_bytes
+        self.max_statement_bytes = max_statement_bytes
+        self.files = []
+        self.statements = 0
+        self.f = None
+        self.size = 0
+        self.count = 0
+
+    def _rotate(self):
+        if self.f:
+            self.f.close()
+        path = self.out_dir / f"{self.prefix}-{len(self.files) + 1:04d}.sql"
+        self.files.append(path)
+        self.f = open(path, 'w', encoding='utf-8')
+        self.size = 0
+        self.count = 0
+
+    def write(self, statement):
+        data = statement + '\n'
+        nbytes = len(data.encode('utf-8'))
+        if nbytes - 1 > self.max_statement_bytes:
+            raise ValueError(f"SQL statement of {nbytes - 1} bytes exceeds the D1 limit "
+                             f"of {self.max_statement_bytes} bytes: {statement[:80]}...")
+        if self.f is None or self.count >= self.max_statements or (
+                self.count and self.size + nbytes > self.max_bytes):
+            self._rotate()
+        self.f.write(data)
+        self.size += nbytes
+        self.count += 1
+        self.statements += 1
+
+    def close(self):
+        if self.f:
+            self.f.close()
+            self.f = None
+        return self.files
+
+
+def clear_sql_dir(out_dir):
+    """Remove .sql files left over from a previous export."""
+    out_dir = Path(out_dir)
+    if out_dir.exists():
+        for path in out_dir.glob('*.sql'):
+            os.remove(path)
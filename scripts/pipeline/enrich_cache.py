@@ -0,0 +1,171 @@
+"""
+Memoized enrichment output, keyed by the enrichment inputs.
+
+Everything ``enrich_entry`` generates depends only on the entry's Korean
+word, English word and dialogue template, so the cache key is that tuple,
+with the category reduced to the template it selects (every category
+without its own dialogue template shares one key space). The text itself
+is not normalized further because it is copied verbatim into the output.
+
+Values are the generated fields as compact JSON bytes, so a hit decodes to
+fresh objects that the caller may mutate, and a large cache stays small in
+memory. The cache holds at most ``maxsize`` keys and evicts the least
+recently used one.
+
+With a path, the cache is persisted to SQLite between runs, along with
+``TEMPLATE_VERSION``. A cache written by other templates is discarded on
+load. Worker processes load their own copy and send back the keys they
+added (``fresh``), which the parent merges before saving. ``save`` only
+rewrites the file when a key was inserted or evicted since the load; a
+run that only hits the cache leaves it alone (the recency of those hits
+is not persisted).
+"""
+
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.templates import DIALOGUE_TEMPLATES, TEMPLATE_VERSION
+
+ENRICH_CACHE_SIZE = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS enrichment (
+    korean TEXT NOT NULL,
+    english TEXT NOT NULL,
+    template TEXT NOT NULL,
+    fields BLOB NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (korean, english, template)
+) WITHOUT ROWID;
+"""
+
+
+def enrichment_key(korean, english, category_id):
+    """The cache key for one entry's enrichment inputs."""
+    return korean, english, category_id if category_id in DIALOGUE_TEMPLATES else ''
+
+
+class EnrichmentCache:
+    """Bounded LRU map of enrichment key -> generated fields."""
+
+    def __init__(self, maxsize=ENRICH_CACHE_SIZE, path=None):
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self.items = OrderedDict()
+        # Keys added in this process since it was loaded
+        self.fresh = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Keys inserted or evicted since the load or last save
+        self.dirty = False
+        if self.path:
+            self.load()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key):
+        """The cached fields for key as new objects, or None."""
+        value = self.items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return jsonio.loads(value)
+
+    def put(self, key, fields):
+        self._store(key, jsonio.dumps(fields, pretty=False))
+
+    def _store(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        self.fresh[key] = value
+        self.dirty = True
+        while len(self.items) > self.maxsize:
+            evicted, _ = self.items.popitem(last=False)
+            self.fresh.pop(evicted, None)
+            self.evictions += 1
+
+    def merge(self, fresh, hits=0, misses=0):
+        """Add the keys and counts another process's cache gathered."""
+        for key, value in fresh.items():
+            self._store(key, value)
+        self.hits += hits
+        self.misses += misses
+
+    def drain(self):
+        """
+        ``(fresh, hits, misses)`` gathered since the last drain (or load),
+        for a worker to hand to the parent's ``merge``; resets them here.
+        """
+        drained = self.fresh, self.hits, self.misses
+        self.fresh = {}
+        self.hits = self.misses = 0
+        return drained
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / lookups, 4) if lookups else None,
+            'size': len(self.items),
+            'evictions': self.evictions,
+        }
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def load(self):
+        """Read the most recently used maxsize keys of the persisted cache."""
+        if not self.path.exists():
+            return
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value FROM settings WHERE name = 'templateVersion'").fetchone()
+            if row is None or row[0] != str(TEMPLATE_VERSION):
+                return
+            rows = conn.execute(
+                "SELECT korean, english, template, fields FROM enrichment "
+                "ORDER BY rank DESC LIMIT ?", (self.maxsize,)).fetchall()
+        finally:
+            conn.close()
+        for korean, english, template, fields in reversed(rows):
+            self.items[korean, english, template] = fields
+
+    def save(self):
+        """
+        Replace the persisted cache with the current contents, in LRU order,
+        if anything was inserted or evicted. Returns whether it was written.
+        """
+        if not self.path or not self.dirty:
+            return False
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM enrichment")
+                conn.executemany(
+                    "INSERT INTO enrichment (korean, english, template, fields, rank) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ((*key, value, rank) for rank, (key, value) in enumerate(self.items.items())),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO settings (name, value) VALUES ('templateVersion', ?)",
+                    (str(TEMPLATE_VERSION),),
+                )
+        finally:
+            conn.close()
+        self.dirty = False
+        return True
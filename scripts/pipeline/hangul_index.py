@@ -0,0 +1,203 @@
+"""
+Hangul-aware n-gram indexes for initial-consonant and typo-tolerant search.
+
+Two indexes over the Korean text of every document (entry ``korean`` and
+conversation ``title.ko``), both keyed by n-gram with delta-encoded
+posting lists like the search index shards:
+
+- chosung: the initial consonants of a text (``출석`` → ``ㅊㅅ``), indexed
+  by 1- and 2-grams. A query such as ``ㅊㅅ`` intersects the postings of
+  its bigrams and checks the candidates against the stored sequences, so
+  it matches anywhere in the word without scanning every entry.
+- jamo: the text decomposed into the jamo a keyboard types (compound
+  vowels and finals split, ``출석`` → ``ㅊㅜㄹㅅㅓㄱ``), indexed by trigrams
+  plus a ``^``-prefixed leading bigram. Half-composed input (``출서``,
+  ``출ㅅ``) decomposes to a prefix of the same jamo string, and a typo
+  changes only the trigrams around it, so ranking candidates by shared
+  trigrams (Dice coefficient) tolerates both.
+
+Characters other than Hangul syllables and jamo (spaces, Latin letters,
+punctuation) are left out of both sequences.
+"""
+
+import math
+
+from pipeline.romanization import CHOSUNG, HANGUL_BASE, HANGUL_COUNT, JONG_COUNT, JONGSUNG, JUNG_COUNT, JUNGSUNG
+
+HANGUL_INDEX_VERSION = 1
+
+# Compound jamo as typed on a 2-set keyboard
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+# Hangul compatibility jamo (ㄱ ... ㅣ), as typed before a syllable is complete
+COMPAT_JAMO_FIRST = 0x3131
+COMPAT_JAMO_LAST = 0x3163
+
+CHOSUNG_GRAMS = (1, 2)
+JAMO_GRAM = 3
+START = '^'
+
+
+def _syllable(char):
+    code = ord(char) - HANGUL_BASE
+    if 0 <= code < HANGUL_COUNT:
+        return code // (JUNG_COUNT * JONG_COUNT), (code // JONG_COUNT) % JUNG_COUNT, code % JONG_COUNT
+    return None
+
+
+def _is_compat_jamo(char):
+    return COMPAT_JAMO_FIRST <= ord(char) <= COMPAT_JAMO_LAST
+
+
+def chosung_sequence(text):
+    """Initial consonants of the syllables of text; bare consonants are kept as-is."""
+    out = []
+    for char in text:
+        parts = _syllable(char)
+        if parts:
+            out.append(CHOSUNG[parts[0]])
+        elif _is_compat_jamo(char) and char in CHOSUNG:
+            out.append(char)
+    return ''.join(out)
+
+
+def jamo_sequence(text):
+    """The jamo of text in typing order, compound vowels and finals split."""
+    out = []
+    for char in text:
+        parts = _syllable(char)
+        if parts:
+            cho, jung, jong = parts
+            out.append(CHOSUNG[cho])
+            out.append(COMPOUND_JAMO.get(JUNGSUNG[jung], JUNGSUNG[jung]))
+            if jong:
+                out.append(COMPOUND_JAMO.get(JONGSUNG[jong], JONGSUNG[jong]))
+        elif _is_compat_jamo(char):
+            out.append(COMPOUND_JAMO.get(char, char))
+    return ''.join(out)
+
+
+def ngrams(sequence, n):
+    return {sequence[i:i + n] for i in range(len(sequence) - n + 1)}
+
+
+def chosung_grams(sequence):
+    return set().union(*(ngrams(sequence, n) for n in CHOSUNG_GRAMS))
+
+
+def jamo_grams(sequence):
+    grams = ngrams(sequence, JAMO_GRAM)
+    if len(sequence) >= 2:
+        grams.add(START + sequence[:2])
+    return grams
+
+
+def _encode(docs):
+    encoded = []
+    previous = 0
+    for doc in docs:
+        encoded.append(doc - previous)
+        previous = doc
+    return encoded
+
+
+def decode(encoded):
+    docs = []
+    doc = 0
+    for delta in encoded:
+        doc += delta
+        docs.append(doc)
+    return docs
+
+
+def build_gram_index(kind, sequences, grams_of):
+    """
+    The index of one kind over per-document sequences (documents numbered
+    by position): sorted grams, their encoded postings, and per document
+    the sequence (chosung) or gram count (jamo) used to verify or rank.
+    """
+    postings = {}
+    for doc, sequence in enumerate(sequences):
+        for gram in grams_of(sequence):
+            postings.setdefault(gram, []).append(doc)
+    grams = sorted(postings)
+    index = {
+        'version': HANGUL_INDEX_VERSION,
+        'kind': kind,
+        'grams': grams,
+        'postings': [_encode(postings[gram]) for gram in grams],
+    }
+    if kind == 'chosung':
+        index['sequences'] = list(sequences)
+    else:
+        index['gramCounts'] = [len(grams_of(sequence)) for sequence in sequences]
+    return index
+
+
+def build_hangul_indexes(texts):
+    """``{'chosung': index, 'jamo': index}`` for the documents' Korean texts."""
+    return {
+        'chosung': build_gram_index('chosung', [chosung_sequence(t) for t in texts], chosung_grams),
+        'jamo': build_gram_index('jamo', [jamo_sequence(t) for t in texts], jamo_grams),
+    }
+
+
+class GramLookup:
+    """Posting lookups over a loaded index (for the pipeline and its checks)."""
+
+    def __init__(self, index):
+        self.index = index
+        self.positions = {gram: i for i, gram in enumerate(index['grams'])}
+
+    def postings(self, gram):
+        position = self.positions.get(gram)
+        return decode(self.index['postings'][position]) if position is not None else []
+
+
+def search_chosung(lookup, query):
+    """Documents whose chosung sequence contains the query's, in document order."""
+    sequence = chosung_sequence(query)
+    if not sequence:
+        return []
+    grams = ngrams(sequence, 2) if len(sequence) >= 2 else {sequence}
+    candidates = None
+    # Intersect the rarest postings first
+    for gram in sorted(grams, key=lambda g: len(lookup.index['postings'][lookup.positions[g]])
+                       if g in lookup.positions else 0):
+        docs = set(lookup.postings(gram))
+        candidates = docs if candidates is None else candidates & docs
+        if not candidates:
+            return []
+    sequences = lookup.index['sequences']
+    return sorted(doc for doc in candidates if sequence in sequences[doc])
+
+
+def search_jamo(lookup, query, min_similarity=0.5, limit=None):
+    """
+    ``(doc, similarity)`` of documents sharing the query's jamo trigrams,
+    most similar first. Similarity is the Dice coefficient of the gram
+    sets; a query that is a prefix of a document's text (half-typed) is
+    scored by the share of the query's grams found instead.
+    """
+    grams = jamo_grams(jamo_sequence(query))
+    if not grams:
+        return []
+    shared = {}
+    for gram in grams:
+        for doc in lookup.postings(gram):
+            shared[doc] = shared.get(doc, 0) + 1
+    counts = lookup.index['gramCounts']
+    needed = math.ceil(len(grams) * min_similarity)
+    scored = []
+    for doc, count in shared.items():
+        if count < needed:
+            continue
+        dice = 2 * count / (len(grams) + counts[doc])
+        coverage = count / len(grams)
+        scored.append((doc, round(max(dice, coverage * 0.9), 4)))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit] if limit else scored
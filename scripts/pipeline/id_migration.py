@@ -0,0 +1,228 @@
+"""
+Migration of mixed-script entry IDs to ASCII, and the redirect table for
+their old URLs.
+
+Older IDs were built with a partial syllable map that left unmapped
+syllables as Hangul (``w-블rogeu``, ``d-med-면yeok``). ``ascii_id``
+respells every Hangul syllable and jamo of such an ID the way ``make_id``
+does today, keeping the prefix, the already romanized syllables and any
+``-N`` suffix, so the result is what ``make_id`` would now produce. An ID
+that still has other non-ASCII characters (stray Cyrillic or Devanagari
+letters) is rebuilt from its entry's Korean word instead.
+
+Old → new pairs are kept in ``id-redirects.json`` (together with the IDs
+that ``find-near-duplicates.py --merge`` folded into another entry) and
+compiled into a minimal perfect hash table, so a worker resolves a legacy URL with a
+fixed number of reads from one small binary file. There is no rule list
+to scan and no database query. Layout, little-endian::
+
+    header   magic "IDRT", u16 version, u16 reserved,
+             u32 count n, u32 buckets m, u32 salt, u32 strings offset
+    seeds    u32[m]        displacement seed of each bucket
+    slots    u32[2n]       (old ID offset, new ID offset) into strings
+    strings  u16 length + UTF-8 bytes, for each ID
+
+With ``h(key, d) = fmix32(fnv1a(key, salt) + d * 0x9E3779B9)``, a key's
+bucket is ``h(key, 0) % m`` and its slot is ``h(key, seeds[bucket]) % n``.
+The old ID stored in the slot is compared with the key, so IDs that are
+not in the table are rejected. ``RedirectTable`` here and
+``apps/context/app/services/id-redirects.ts`` read the same format.
+"""
+
+import struct
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.romanization import ID_JAMO, ID_MAX_LENGTH, SYLLABLE_ID, make_id
+
+ID_REDIRECTS_VERSION = 1
+
+TABLE_MAGIC = b'IDRT'
+TABLE_VERSION = 1
+_HEADER = struct.Struct('<4sHHIIII')
+
+# Average keys per bucket, and how far the seed search goes before the
+# build is retried with another salt
+KEYS_PER_BUCKET = 4
+MAX_SEED = 1 << 20
+MAX_SALTS = 16
+
+_MASK = 0xFFFFFFFF
+_GOLDEN = 0x9E3779B9
+
+
+def ascii_id(entry_id, korean=''):
+    """The ASCII form of an entry ID (unchanged if it is already ASCII)."""
+    if entry_id.isascii():
+        return entry_id
+    respelled = ''.join(SYLLABLE_ID.get(char) or ID_JAMO.get(char) or char for char in entry_id)
+    if respelled.isascii():
+        return respelled[:ID_MAX_LENGTH]
+
+    # Rebuild from the Korean word; the segments in front of its spelling are the prefix
+    body = make_id(korean)
+    segments = entry_id.split('-')
+    prefix = '-'.join(segments[:max(0, len(segments) - body.count('-') - 1)])
+    return make_id(korean, prefix) if prefix.isascii() else body
+
+
+def plan_migration(entries, reserved=()):
+    """
+    New IDs for the non-ASCII IDs among entries (``(id, korean)`` pairs).
+    An ID already used by another entry or in ``reserved`` (e.g. IDs held
+    by the ID registry) gets the first free ``-1``, ``-2`` ... suffix, like
+    new IDs in ``IdRegistry.assign``. Returns ``(renames, collisions)``:
+    ``{old: new}`` and one record per ID that had to be suffixed.
+    """
+    entries = list(entries)
+    taken = {entry_id for entry_id, _ in entries if entry_id.isascii()} | set(reserved)
+    renames = {}
+    collisions = []
+    for entry_id, korean in sorted(entries):
+        if entry_id.isascii():
+            continue
+        wanted = ascii_id(entry_id, korean)
+        new_id = wanted
+        suffix = 0
+        while new_id in taken:
+            suffix += 1
+            new_id = f"{wanted}-{suffix}"
+        if new_id != wanted:
+            holder = next((old for old, new in renames.items() if new == wanted), wanted)
+            collisions.append({'id': entry_id, 'korean': korean, 'wanted': wanted,
+                               'assigned': new_id, 'takenBy': holder})
+        taken.add(new_id)
+        renames[entry_id] = new_id
+    return renames, collisions
+
+
+def merge_redirects(redirects, renames, live_ids):
+    """
+    Fold this run's renames into the existing redirects: chains collapse
+    to the final ID, and old IDs that are live entry IDs again are dropped.
+    """
+    merged = {old: renames.get(new, new) for old, new in redirects.items()}
+    merged.update(renames)
+    return {old: new for old, new in sorted(merged.items()) if old not in live_ids and old != new}
+
+
+def load_redirects(path):
+    """The ``{old: new}`` pairs of an ``id-redirects.json``, or {} if there is none yet."""
+    try:
+        return jsonio.load(path)['redirects']
+    except FileNotFoundError:
+        return {}
+
+
+def save_redirects(redirects, path, table_path):
+    """Write ``id-redirects.json`` and the table compiled from it. Returns the table bytes."""
+    jsonio.dump({'version': ID_REDIRECTS_VERSION, 'count': len(redirects), 'redirects': redirects}, path)
+    table = build_redirect_table(redirects)
+    Path(table_path).parent.mkdir(parents=True, exist_ok=True)
+    jsonio.write_bytes(table_path, table)
+    return table
+
+
+def fnv1a(data, salt=0):
+    h = 0x811C9DC5 ^ salt
+    for byte in data:
+        h = ((h ^ byte) * 0x01000193) & _MASK
+    return h
+
+
+def fmix32(h):
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK
+    return h ^ (h >> 16)
+
+
+def _slot_hash(base, seed):
+    return fmix32((base + seed * _GOLDEN) & _MASK)
+
+
+def _place(bases, count, buckets):
+    """Seeds per bucket for a collision-free slot assignment, or None."""
+    members = [[] for _ in range(buckets)]
+    for key, base in enumerate(bases):
+        members[_slot_hash(base, 0) % buckets].append(key)
+    seeds = [0] * buckets
+    slots = [None] * count
+    for bucket in sorted(range(buckets), key=lambda b: -len(members[b])):
+        keys = members[bucket]
+        if not keys:
+            continue
+        for seed in range(1, MAX_SEED):
+            positions = [_slot_hash(bases[key], seed) % count for key in keys]
+            if len(set(positions)) == len(positions) and all(slots[p] is None for p in positions):
+                break
+        else:
+            return None
+        seeds[bucket] = seed
+        for key, position in zip(keys, positions):
+            slots[position] = key
+    return seeds, slots
+
+
+def build_redirect_table(redirects):
+    """The binary minimal perfect hash table of ``{old: new}`` (see module docstring)."""
+    items = sorted(redirects.items())
+    keys = [old.encode('utf-8') for old, _ in items]
+    count = len(items)
+    buckets = -(-count // KEYS_PER_BUCKET)
+    for salt in range(MAX_SALTS):
+        bases = [fnv1a(key, salt) for key in keys]
+        if len(set(bases)) < count:
+            continue
+        placed = _place(bases, count, buckets) if count else ([], [])
+        if placed is not None:
+            break
+    else:
+        raise ValueError(f"no perfect hash found for {count} redirects")
+    seeds, slots = placed
+
+    strings = bytearray()
+    offsets = {}
+    for text in sorted({text for item in items for text in item}):
+        data = text.encode('utf-8')
+        offsets[text] = len(strings)
+        strings += struct.pack('<H', len(data)) + data
+    strings_offset = _HEADER.size + 4 * buckets + 8 * count
+    out = bytearray(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, 0, count, buckets, salt, strings_offset))
+    out += struct.pack(f'<{buckets}I', *seeds)
+    for key in slots:
+        old, new = items[key]
+        out += struct.pack('<II', offsets[old], offsets[new])
+    return bytes(out + strings)
+
+
+class RedirectTable:
+    """Lookups in a table written by ``build_redirect_table``."""
+
+    def __init__(self, data):
+        magic, version, _, self.count, self.buckets, self.salt, self.strings = _HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"not an ID redirect table (version {TABLE_VERSION})")
+        self.data = data
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset):
+        start = self.strings + offset
+        (length,) = struct.unpack_from('<H', self.data, start)
+        return self.data[start + 2:start + 2 + length]
+
+    def get(self, entry_id):
+        """The new ID for an old one, or None."""
+        if not self.count:
+            return None
+        key = entry_id.encode('utf-8')
+        base = fnv1a(key, self.salt)
+        (seed,) = struct.unpack_from('<I', self.data, _HEADER.size + 4 * (_slot_hash(base, 0) % self.buckets))
+        slot = _slot_hash(base, seed) % self.count
+        old, new = struct.unpack_from('<II', self.data, _HEADER.size + 4 * self.buckets + 8 * slot)
+        if self._string(old) != key:
+            return None
+        return self._string(new).decode('utf-8')
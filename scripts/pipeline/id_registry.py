@@ -0,0 +1,212 @@
+"""
+Persistent entry-ID registry backed by SQLite.
+
+Every converted entry is keyed by ``(source, korean, english)``. The first
+time a key is seen it gets the first free ID of ``base``, ``base-1``,
+``base-2`` ... across the whole corpus; after that the same key always
+maps to the same ID, regardless of source order or which category files
+are regenerated.
+
+IDs that already exist in the output files are imported as *legacy* rows
+(empty source). A new key takes over the legacy row with the same
+korean/english and ID prefix, so existing URLs keep their IDs.
+
+When a source changes the English of a word, the new key takes over the
+row of the old one (same source and korean, not seen in this run), so the
+entry keeps its ID instead of getting a suffixed twin. The keys seen in
+the current run are kept in the database too (``run_keys``), so memory
+does not grow with the corpus.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry_ids (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    korean TEXT NOT NULL,
+    english TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS entry_ids_key
+    ON entry_ids (source, korean, english) WHERE source <> '';
+CREATE INDEX IF NOT EXISTS entry_ids_text ON entry_ids (korean, english);
+CREATE TABLE IF NOT EXISTS run_keys (
+    source TEXT NOT NULL,
+    korean TEXT NOT NULL,
+    english TEXT NOT NULL,
+    PRIMARY KEY (source, korean, english)
+) WITHOUT ROWID;
+"""
+
+LEGACY_SOURCE = ''
+
+
+class IdRegistry:
+    """SQLite-backed (source, korean, english) -> entry ID map."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self.is_new = len(self) == 0
+        # Keys assigned during this run, to drop repeated source rows
+        self.conn.execute("DELETE FROM run_keys")
+        self.conn.commit()
+        self.created = 0
+        self.adopted = 0
+        self.reused = 0
+
+    def lookup(self, source, korean, english):
+        row = self.conn.execute(
+            "SELECT id FROM entry_ids WHERE source = ? AND korean = ? AND english = ?",
+            (source, korean, english),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _taken(self, entry_id):
+        return self.conn.execute(
+            "SELECT 1 FROM entry_ids WHERE id = ?", (entry_id,)
+        ).fetchone() is not None
+
+    def _claim(self, source, korean, english):
+        """Mark the key as seen in this run. Returns False if it already was."""
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO run_keys (source, korean, english) VALUES (?, ?, ?)",
+            (source, korean, english),
+        )
+        return cursor.rowcount == 1
+
+    def _stale_rows(self, source, korean, english):
+        """IDs of the same source and korean under another English, not seen in this run."""
+        return [entry_id for (entry_id,) in self.conn.execute(
+            """SELECT id FROM entry_ids AS e
+               WHERE source = ? AND korean = ? AND english <> ?
+                 AND NOT EXISTS (SELECT 1 FROM run_keys AS r
+                                 WHERE r.source = e.source AND r.korean = e.korean
+                                   AND r.english = e.english)
+               ORDER BY length(id), id""",
+            (source, korean, english),
+        )]
+
+    def has_stale(self, source, korean, english):
+        """
+        True if the key is new but an unseen row of the same source and
+        korean exists: the source probably changed the English. Callers
+        assign such keys with ``reuse=True`` once the whole source has been
+        read, so rows whose key is still in the source are claimed first.
+        """
+        return self.lookup(source, korean, english) is None and bool(
+            self._stale_rows(source, korean, english))
+
+    def _reuse_stale(self, source, korean, english):
+        rows = self._stale_rows(source, korean, english)
+        if not rows:
+            return None
+        self.conn.execute(
+            "UPDATE entry_ids SET english = ? WHERE id = ?", (english, rows[0])
+        )
+        self.reused += 1
+        return rows[0]
+
+    def _adopt_legacy(self, source, korean, english, base_id):
+        """
+        Take over the legacy row for the same korean/english that shares the
+        ID prefix (``w-``, ``d-med-`` ...) and is closest to base_id. This
+        keeps IDs whose romanization has since changed (e.g. ``w-블rogeu``).
+        """
+        rows = self.conn.execute(
+            "SELECT id FROM entry_ids WHERE source = ? AND korean = ? AND english = ?",
+            (LEGACY_SOURCE, korean, english),
+        ).fetchall()
+        head = base_id.split('-', 1)[0] + '-' if '-' in base_id else ''
+        candidates = [entry_id for (entry_id,) in rows if entry_id.startswith(head)]
+        if not candidates:
+            return None
+
+        entry_id = min(candidates, key=lambda c: (
+            -len(os.path.commonprefix([c, base_id])), len(c), c))
+        self.conn.execute(
+            "UPDATE entry_ids SET source = ? WHERE id = ?", (source, entry_id)
+        )
+        self.adopted += 1
+        return entry_id
+
+    def assign(self, source, korean, english, base_id, reuse=False):
+        """
+        Stable ID for the key, as ``(entry_id, created)`` where ``created`` is
+        True only if the key was registered by this call. Returns None when
+        the key was already assigned earlier in this run (a repeated row in
+        the sources). With ``reuse``, a new key takes over a stale row of the
+        same source and korean (see ``has_stale``).
+        """
+        if not self._claim(source, korean, english):
+            return None
+
+        entry_id = self.lookup(source, korean, english)
+        if entry_id is None and reuse:
+            entry_id = self._reuse_stale(source, korean, english)
+        if entry_id is None:
+            entry_id = self._adopt_legacy(source, korean, english, base_id)
+        if entry_id is not None:
+            return entry_id, False
+
+        entry_id = base_id
+        suffix = 0
+        while self._taken(entry_id):
+            suffix += 1
+            entry_id = f"{base_id}-{suffix}"
+        self.conn.execute(
+            "INSERT INTO entry_ids (id, source, korean, english) VALUES (?, ?, ?, ?)",
+            (entry_id, source, korean, english),
+        )
+        self.created += 1
+        return entry_id, True
+
+    def reserve(self, entry_id, korean, english):
+        """Record an ID found in existing output. Returns False if it was already known."""
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO entry_ids (id, source, korean, english) VALUES (?, ?, ?, ?)",
+            (entry_id, LEGACY_SOURCE, korean, english),
+        )
+        return cursor.rowcount == 1
+
+    def rename(self, old_id, new_id):
+        """Move a registered ID to new_id (ID migration). Returns False if old_id is unknown."""
+        cursor = self.conn.execute(
+            "UPDATE entry_ids SET id = ? WHERE id = ?", (new_id, old_id)
+        )
+        return cursor.rowcount == 1
+
+    def ids(self):
+        return {entry_id for (entry_id,) in self.conn.execute("SELECT id FROM entry_ids")}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entry_ids").fetchone()[0]
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        """Discard everything assigned since the last commit."""
+        self.conn.rollback()
+        self.conn.execute("DELETE FROM run_keys")
+        self.created = 0
+        self.adopted = 0
+        self.reused = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.rollback()
+            self.conn.close()
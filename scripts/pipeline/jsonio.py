@@ -0,0 +1,156 @@
+"""
+JSON serialization shared by the pipeline scripts.
+
+``dumps`` returns the same bytes as ``json.dumps(value, ensure_ascii=False,
+indent=2)`` (or with compact separators), so switching backends never shows
+up as a diff in the data files. orjson is used when it is installed, and
+the stdlib ``json`` module is the fallback. orjson is also skipped for
+individual values it can't encode identically: non-string keys, integers
+beyond 64 bits, lone surrogates, and floats that are not finite or that
+repr writes with an exponent (orjson writes ``1e16`` and ``1e-7`` where
+json writes ``1e+16`` and ``1e-07``, and NaN / Infinity as ``null``).
+
+Key order is the dict's insertion order, which the pipeline builds
+deterministically. ``sort_keys=True`` gives canonical, code-point order
+instead, for documents assembled from unordered sources.
+
+Determinism checks: with ``PIPELINE_JSON_CHECK=1`` (or ``check=True``),
+every ``dumps`` also encodes the value with the stdlib and decodes and
+re-encodes its own output, and raises ``ValueError`` unless all three are
+byte-identical. ``PIPELINE_JSON_BACKEND=json`` forces the stdlib backend.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get('PIPELINE_JSON_BACKEND', '') == 'json':
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+CHECK = os.environ.get('PIPELINE_JSON_CHECK', '') not in ('', '0')
+
+
+def _stdlib_dumps(value, pretty=True, sort_keys=False):
+    if pretty:
+        text = json.dumps(value, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    else:
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+    return text.encode('utf-8')
+
+
+def _has_divergent_float(value):
+    """True if value holds a float that orjson and json encode differently."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            stack.extend(item.values())
+        elif kind is list or kind is tuple:
+            stack.extend(item)
+        elif kind is float and (not math.isfinite(item) or 'e' in repr(item)):
+            return True
+    return False
+
+
+def _orjson_dumps(value, pretty=True, sort_keys=False):
+    option = 0
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    # Floats orjson writes differently (see module docstring): walking the value
+    # costs less than searching orjson's output for them
+    if _has_divergent_float(value):
+        return _stdlib_dumps(value, pretty, sort_keys)
+    try:
+        return orjson.dumps(value, option=option)
+    except (TypeError, orjson.JSONEncodeError):
+        return _stdlib_dumps(value, pretty, sort_keys)
+
+
+_dumps = _orjson_dumps if orjson else _stdlib_dumps
+
+
+def dumps(value, pretty=True, sort_keys=False, check=None):
+    """Encode value as UTF-8 JSON bytes (2-space indent, or compact)."""
+    data = _dumps(value, pretty, sort_keys)
+    if CHECK if check is None else check:
+        verify(value, data, pretty, sort_keys)
+    return data
+
+
+def verify(value, data, pretty=True, sort_keys=False):
+    """
+    Raise ValueError unless data is exactly the stdlib encoding of value and
+    survives a decode / re-encode round trip unchanged.
+    """
+    expected = _stdlib_dumps(value, pretty, sort_keys)
+    if data != expected:
+        raise ValueError(f'{BACKEND} output differs from the json module at byte '
+                         f'{_first_difference(data, expected)}')
+    again = _dumps(loads(data), pretty, sort_keys)
+    if again != data:
+        raise ValueError(f'JSON output is not stable across a round trip at byte '
+                         f'{_first_difference(again, data)}')
+
+
+def _first_difference(a, b):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # out-of-range integers, NaN and similar: let the stdlib decide
+            pass
+    return json.loads(data)
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def write_bytes(path, data, only_if_changed=True):
+    """
+    Atomically replace path with data. With only_if_changed, an identical
+    file is left untouched (keeping its mtime). Returns whether it was written.
+    """
+    path = Path(path)
+    if only_if_changed:
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def dump(value, path, pretty=True, sort_keys=False, trailing_newline=False, check=None):
+    """Write value to path as JSON; unchanged files are not rewritten."""
+    data = dumps(value, pretty, sort_keys, check)
+    if trailing_newline:
+        data += b'\n'
+    return write_bytes(path, data)
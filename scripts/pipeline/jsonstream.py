@@ -0,0 +1,163 @@
+"""
+Incremental JSON reading and writing for large dictionary files.
+
+The readers pull one array element at a time out of a file with
+``json.JSONDecoder.raw_decode``, so only the current element and a small read
+buffer are held in memory. ``JsonArrayWriter`` appends elements to a JSON
+array on disk and produces the same bytes as ``jsonio.dumps`` of the whole
+list.
+"""
+
+import json
+import os
+
+from pipeline import jsonio
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Buffered character reader that decodes JSON values on demand."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=CHUNK_SIZE):
+        if self.pos > CHUNK_SIZE:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+        self.buf += chunk
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found or 'EOF'!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        size = CHUNK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill(size)
+                size *= 2
+                continue
+            # A number or literal cut off by the buffer boundary decodes
+            # successfully but short; read on until something follows it.
+            if end == len(self.buf) and not self.eof:
+                self._fill(size)
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+    def elements(self):
+        """Yield the elements of the array starting at the current position."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def iter_array(filepath):
+    """Yield the elements of a top-level JSON array one at a time."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        yield from _Reader(f).elements()
+
+
+def iter_object_arrays(filepath):
+    """
+    Yield ``(key, element)`` for every array value of a top-level JSON object.
+
+    Non-array values are skipped, matching how the converters treat them.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if reader.peek() == '[':
+                for element in reader.elements():
+                    yield key, element
+            else:
+                reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+class JsonArrayWriter:
+    """
+    Append-only writer for a pretty-printed JSON array.
+
+    Writes go to ``<filepath>.tmp`` and are renamed over the target on
+    ``close()``, so the previous file stays readable until the new one is
+    complete.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.tmp_path = f"{filepath}.tmp"
+        self.f = open(self.tmp_path, 'wb')
+        self.count = 0
+
+    def append(self, item):
+        data = jsonio.dumps(item)
+        self.f.write(b'[\n  ' if self.count == 0 else b',\n  ')
+        self.f.write(data.replace(b'\n', b'\n  '))
+        self.count += 1
+
+    def close(self):
+        self.f.write(b'\n]' if self.count else b'[]')
+        self.f.close()
+        os.replace(self.tmp_path, self.filepath)
+
+    def abort(self):
+        self.f.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
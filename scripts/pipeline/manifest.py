@@ -0,0 +1,94 @@
+"""
+Persistent content-hash manifest for incremental pipeline runs.
+
+The manifest remembers, per file, the size, mtime and SHA-256 it had when a
+run last read or wrote it, plus optional per-file metadata and per-entry
+hashes. ``file_changed`` checks size and mtime first and only hashes the file
+when they differ, so a no-op rerun costs one ``stat`` per file.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+CACHE_DIR = Path(__file__).resolve().parent / '.cache'
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def text_hash(*parts):
+    """Short stable hash of string parts, used for per-entry fingerprints."""
+    digest = hashlib.sha1('\0'.join(parts).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class Manifest:
+    """Content hashes of the files and entries seen by the last run."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.data = {'version': MANIFEST_VERSION, 'files': {}, 'entries': {}}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.data = data
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+    def file_changed(self, path):
+        """True if path is missing, unknown, or its content differs from the record."""
+        record = self.data['files'].get(self._key(path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        if record is None:
+            return True
+        if record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            return False
+        if record['size'] != stat.st_size:
+            return True
+        if file_sha256(path) != record['sha256']:
+            return True
+        # Touched but identical: refresh the stat fast path
+        record['mtime_ns'] = stat.st_mtime_ns
+        return False
+
+    def record_file(self, path, **meta):
+        """Store the current size, mtime and hash of path, plus any metadata."""
+        stat = os.stat(path)
+        self.data['files'][self._key(path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(path),
+            **meta,
+        }
+
+    def file_meta(self, path):
+        """The stored record for path, or None."""
+        return self.data['files'].get(self._key(path))
+
+    def entries(self, path):
+        """Per-entry hashes stored for path (entry id -> hash)."""
+        return self.data['entries'].get(self._key(path), {})
+
+    def set_entries(self, path, hashes):
+        self.data['entries'][self._key(path)] = hashes
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,174 @@
+"""
+Corpus-wide near-duplicate detection with MinHash and LSH.
+
+Every entry is reduced to a set of shingles over its normalized Korean
+and English words: character bigrams of the Korean with spaces and
+punctuation removed (so spacing variants coincide), and character
+trigrams of the English with a leading "to " and punctuation removed.
+The Jaccard similarity of two shingle sets measures how alike two
+entries are.
+
+``MinHasher`` turns a shingle set into a fixed-length signature whose
+positions agree between two sets with probability equal to their Jaccard
+similarity. LSH splits each signature into ``bands`` of ``rows`` values
+and puts entries that share any band into one bucket. Only entries
+sharing a bucket become candidate pairs, so the work is near-linear in
+the corpus size rather than quadratic. Pairs with similarity s are found
+with probability ``1 - (1 - s**rows) ** bands``. The default 16 x 4
+finds about 99% of pairs at 0.7 and 64% at 0.5. Candidates are then
+verified against their exact Jaccard similarity.
+
+Hashes are seeded and computed with BLAKE2b, so results do not depend on
+``PYTHONHASHSEED`` and are the same on every run.
+"""
+
+import hashlib
+import random
+import unicodedata
+
+NEAR_DUPLICATES_VERSION = 1
+
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+SEED = 20240101
+
+# Buckets larger than this (e.g. entries with an empty English word) are
+# skipped; their pairs would dominate the run without being meaningful
+MAX_BUCKET = 200
+
+_MERSENNE = (1 << 61) - 1
+
+
+def _strip(text):
+    """NFC-normalized, lowercased text with punctuation and symbols replaced by spaces."""
+    text = unicodedata.normalize('NFC', text or '').lower()
+    return ''.join(' ' if unicodedata.category(char)[0] in 'PSZ' else char for char in text)
+
+
+def normalize_korean(text):
+    return ''.join(_strip(text).split())
+
+
+def normalize_english(text):
+    words = _strip(text).split()
+    if len(words) > 1 and words[0] == 'to':
+        words = words[1:]
+    return ' '.join(words)
+
+
+def _grams(text, n):
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def shingles(korean, english):
+    """The shingle set of an entry's Korean and English words."""
+    return ({'k:' + gram for gram in _grams(normalize_korean(korean), 2)}
+            | {'e:' + gram for gram in _grams(normalize_english(english), 3)})
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def _shingle_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class MinHasher:
+    """MinHash signatures with ``bands * rows`` universal hash functions."""
+
+    def __init__(self, bands=NUM_BANDS, rows=ROWS_PER_BAND, seed=SEED):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, _MERSENNE), rng.randrange(_MERSENNE))
+                      for _ in range(bands * rows)]
+
+    def signature(self, shingle_set):
+        hashes = [_shingle_hash(shingle) for shingle in shingle_set] or [0]
+        return [min((a * x + b) % _MERSENNE for x in hashes) for a, b in self.perms]
+
+    def band_keys(self, signature):
+        rows = self.rows
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+
+def candidate_pairs(signatures, hasher, max_bucket=MAX_BUCKET):
+    """
+    ``(pairs, skipped)``: index pairs ``(i, j)``, i < j, of signatures that
+    share a band, and the number of buckets skipped for being too large.
+    """
+    buckets = {}
+    for index, signature in enumerate(signatures):
+        for key in hasher.band_keys(signature):
+            buckets.setdefault(key, []).append(index)
+    pairs = set()
+    skipped = 0
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_bucket:
+            skipped += 1
+            continue
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                pairs.add((i, j))
+    return pairs, skipped
+
+
+def classify(a, b):
+    """How two entries' normalized words relate."""
+    same_korean = normalize_korean(a['korean']) == normalize_korean(b['korean'])
+    same_english = normalize_english(a['english']) == normalize_english(b['english'])
+    if same_korean and same_english:
+        return 'same-words'
+    if same_korean:
+        return 'same-korean'
+    if same_english:
+        return 'same-english'
+    return 'similar'
+
+
+def find_near_duplicates(records, threshold=0.5, hasher=None, max_bucket=MAX_BUCKET):
+    """
+    Near-duplicate pairs among records (dicts with ``korean`` and
+    ``english``), most similar first: ``(similarity, i, j, kind)``.
+    Returns ``(pairs, stats)``.
+    """
+    hasher = hasher or MinHasher()
+    sets = [shingles(record['korean'], record['english']) for record in records]
+    signatures = [hasher.signature(shingle_set) for shingle_set in sets]
+    candidates, skipped = candidate_pairs(signatures, hasher, max_bucket)
+
+    pairs = []
+    for i, j in candidates:
+        similarity = jaccard(sets[i], sets[j])
+        if similarity >= threshold:
+            pairs.append((round(similarity, 4), i, j, classify(records[i], records[j])))
+    pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    stats = {'records': len(records), 'candidates': len(candidates), 'pairs': len(pairs),
+             'skippedBuckets': skipped, 'bands': hasher.bands, 'rows': hasher.rows}
+    return pairs, stats
+
+
+def clusters(pairs, count):
+    """Connected groups (sorted index lists) of the given pairs, largest first."""
+    parent = list(range(count))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for _, i, j, _ in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    groups = {}
+    for _, i, j, _ in pairs:
+        for index in (i, j):
+            groups.setdefault(find(index), set()).add(index)
+    return sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group[0]))
@@ -0,0 +1,382 @@
+"""
+Hangul romanization engine shared by the vocabulary pipeline scripts.
+
+``romanize`` follows the Revised Romanization of Korean, including the sound
+changes it transcribes at syllable boundaries: liaison (있어요 → isseoyo),
+nasalization (합니다 → hamnida), lateralization (신라 → silla), ㄹ → n after
+other consonants (종로 → jongno), aspiration with ㅎ (좋고 → joko) and
+palatalization (같이 → gachi). Tensing is not transcribed, as in the official
+rules. A complex final keeps its second consonant where a stem requires it
+(``FINAL_EXCEPTIONS``: 밟다 → bapda).
+
+The rules are compiled once into a table over every (final, initial, vowel
+is ㅣ) combination, so romanization is a single left-to-right pass where the
+only state is the previous syllable's final consonant (or the syllable itself,
+for the few in ``FINAL_EXCEPTIONS``).
+
+IDs keep the older per-syllable spelling (``make_id``), since they are part
+of published URLs, and are ASCII only: jamo are spelled too and other
+non-ASCII letters are folded or dropped. All 11,172 precomposed syllables
+(U+AC00..U+D7A3) are spelled once into lookup tables, cached on disk so
+later imports only read a single JSON file. ``romanize`` and ``make_id``
+sit behind LRU caches, so repeated words across source files cost a dict
+lookup.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+JUNG_COUNT = 21
+JONG_COUNT = 28
+
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# Korean to Romanization mapping (Revised Romanization of Korean)
+ROMANIZATION_MAP = {
+    # Vowels
+    'ㅏ': 'a', 'ㅐ': 'ae', 'ㅑ': 'ya', 'ㅒ': 'yae', 'ㅓ': 'eo', 'ㅔ': 'e',
+    'ㅕ': 'yeo', 'ㅖ': 'ye', 'ㅗ': 'o', 'ㅘ': 'wa', 'ㅙ': 'wae', 'ㅚ': 'oe',
+    'ㅛ': 'yo', 'ㅜ': 'u', 'ㅝ': 'wo', 'ㅞ': 'we', 'ㅟ': 'wi', 'ㅠ': 'yu',
+    'ㅡ': 'eu', 'ㅢ': 'ui', 'ㅣ': 'i',
+
+    # Consonants (initial)
+    'ㄱ': 'g', 'ㄲ': 'kk', 'ㄴ': 'n', 'ㄷ': 'd', 'ㄸ': 'tt', 'ㄹ': 'r',
+    'ㅁ': 'm', 'ㅂ': 'b', 'ㅃ': 'pp', 'ㅅ': 's', 'ㅆ': 'ss', 'ㅇ': '',
+    'ㅈ': 'j', 'ㅉ': 'jj', 'ㅊ': 'ch', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 'h',
+}
+
+# Final consonants (종성)
+FINAL_CONSONANTS = {
+    '': '', 'ㄱ': 'k', 'ㄲ': 'k', 'ㄳ': 'k', 'ㄴ': 'n', 'ㄵ': 'n', 'ㄶ': 'n',
+    'ㄷ': 't', 'ㄹ': 'l', 'ㄺ': 'k', 'ㄻ': 'm', 'ㄼ': 'l', 'ㄽ': 'l', 'ㄾ': 'l',
+    'ㄿ': 'p', 'ㅀ': 'l', 'ㅁ': 'm', 'ㅂ': 'p', 'ㅄ': 'p', 'ㅅ': 't', 'ㅆ': 't',
+    'ㅇ': 'ng', 'ㅈ': 't', 'ㅊ': 't', 'ㅋ': 'k', 'ㅌ': 't', 'ㅍ': 'p', 'ㅎ': 't',
+}
+
+# ID 생성 시 종성 ㅂ은 'b' 로 표기해 왔다 (예: 법 → beob)
+ID_FINAL_CONSONANTS = {**FINAL_CONSONANTS, 'ㅂ': 'b'}
+
+# 이전 romanization_map 에만 있던 표기. 기존 ID 가 바뀌지 않도록 유지한다.
+LEGACY_ID_SYLLABLES = {'뷸': 'bwol', '쥴': 'jwil', '큥': 'keung'}
+
+# 음절이 아닌 자모 (ㅋㅋ, ㅠㅠ) 의 ID 표기. 초성으로 쓰이지 않는 ㅇ 과 겹받침은 받침 소리로 적는다.
+ID_JAMO = {
+    jamo: ROMANIZATION_MAP.get(jamo) or FINAL_CONSONANTS.get(jamo, '')
+    for jamo in dict.fromkeys(CHOSUNG + JUNGSUNG + JONGSUNG[1:])
+}
+
+# Bump when any table above changes so stale disk caches are rebuilt.
+TABLE_VERSION = 2
+
+CACHE_PATH = Path(os.environ.get(
+    'HANGUL_TABLE_CACHE',
+    Path(__file__).resolve().parent / '.cache' / f'hangul-tables-v{TABLE_VERSION}.json',
+))
+
+ROMANIZE_CACHE_SIZE = 1 << 18
+
+
+def decompose(char):
+    """Decompose a Korean syllable into (cho, jung, jong), or None."""
+    code = ord(char) - HANGUL_BASE
+    if 0 <= code < HANGUL_COUNT:
+        return (
+            CHOSUNG[code // (JUNG_COUNT * JONG_COUNT)],
+            JUNGSUNG[(code % (JUNG_COUNT * JONG_COUNT)) // JONG_COUNT],
+            JONGSUNG[code % JONG_COUNT],
+        )
+    return None
+
+
+def build_tables():
+    """Spell every Hangul syllable in isolation. Returns a JSON-serializable dict."""
+    syllables = []
+    ids = []
+
+    for code in range(HANGUL_COUNT):
+        char = chr(HANGUL_BASE + code)
+        cho, jung, jong = decompose(char)
+        body = ROMANIZATION_MAP[jung]
+
+        syllables.append(ROMANIZATION_MAP[cho] + body + FINAL_CONSONANTS[jong])
+        ids.append(LEGACY_ID_SYLLABLES.get(
+            char, ROMANIZATION_MAP[cho] + body + ID_FINAL_CONSONANTS[jong]))
+
+    return {
+        'version': TABLE_VERSION,
+        'syllables': syllables,
+        'ids': ids,
+    }
+
+
+def load_tables(path=CACHE_PATH):
+    """Read the tables from the disk cache, rebuilding it when missing or stale."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tables = json.load(f)
+        if tables.get('version') == TABLE_VERSION:
+            return tables
+    except (OSError, ValueError):
+        pass
+
+    tables = build_tables()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(tables, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # 캐시는 선택 사항 (읽기 전용 볼륨 등)
+    return tables
+
+
+_tables = load_tables()
+_chars = [chr(HANGUL_BASE + code) for code in range(HANGUL_COUNT)]
+
+SYLLABLE_ROMANIZATION = dict(zip(_chars, _tables['syllables']))
+SYLLABLE_ID = dict(zip(_chars, _tables['ids']))
+
+del _tables, _chars
+
+
+# Complex finals as (first, second) jamo; the second moves on liaison
+COMPLEX_FINALS = {
+    'ㄳ': ('ㄱ', 'ㅅ'), 'ㄵ': ('ㄴ', 'ㅈ'), 'ㄶ': ('ㄴ', 'ㅎ'), 'ㄺ': ('ㄹ', 'ㄱ'),
+    'ㄻ': ('ㄹ', 'ㅁ'), 'ㄼ': ('ㄹ', 'ㅂ'), 'ㄽ': ('ㄹ', 'ㅅ'), 'ㄾ': ('ㄹ', 'ㅌ'),
+    'ㄿ': ('ㄹ', 'ㅍ'), 'ㅀ': ('ㄹ', 'ㅎ'), 'ㅄ': ('ㅂ', 'ㅅ'),
+}
+
+# Plain consonant + ㅎ (either order) → aspirated initial
+ASPIRATED = {'ㄱ': 'k', 'ㄲ': 'k', 'ㄷ': 't', 'ㅂ': 'p', 'ㅈ': 'ch'}
+
+# Obstruent finals before ㄴ/ㅁ/ㄹ, by their neutralized sound
+NASALIZED = {'k': 'ng', 't': 'n', 'p': 'm'}
+
+# Syllables whose complex final keeps its second consonant before a
+# consonant and at the end of a word, against the rule for that final
+# (표준 발음법 제10항: 밟다 → bapda, 밟고 → bapgo, but 넓다 → neolda)
+FINAL_EXCEPTIONS = {'밟': 'p'}
+
+
+def junction(jong, cho, before_i=False, coda=None):
+    """
+    Spelling of a syllable boundary: (final of the first syllable, initial of
+    the second) for final ``jong`` followed by initial ``cho``. ``before_i``
+    says the second syllable's vowel is ㅣ, for palatalization. ``coda``
+    overrides the final's sound before a consonant (``FINAL_EXCEPTIONS``).
+    """
+    initial = ROMANIZATION_MAP[cho]
+    if jong == '':
+        return '', initial
+
+    first, second = COMPLEX_FINALS.get(jong, ('', jong))
+    # Final as pronounced before a consonant (ㄺ before ㄱ keeps ㄹ: 읽고 → ilgo)
+    if coda is None:
+        coda = 'l' if jong == 'ㄺ' and cho == 'ㄱ' else FINAL_CONSONANTS[jong]
+
+    # Liaison: the (second) final moves into the empty initial
+    if cho == 'ㅇ':
+        if jong == 'ㅇ':
+            return 'ng', ''
+        kept = FINAL_CONSONANTS[first] if first else ''
+        if second == 'ㅎ':
+            # ㅎ is silent, a preceding ㄴ/ㄹ moves instead (않아 → ana, 싫어 → sireo)
+            return '', ROMANIZATION_MAP[first] if first else ''
+        if before_i and second in ('ㄷ', 'ㅌ'):
+            return kept, 'j' if second == 'ㄷ' else 'ch'
+        return kept, ROMANIZATION_MAP[second]
+
+    # Aspiration: final ㄱ/ㄷ/ㅂ/ㅈ + ㅎ
+    if cho == 'ㅎ':
+        if second in ASPIRATED:
+            if before_i and second == 'ㄷ':
+                return (FINAL_CONSONANTS[first] if first else ''), 'ch'
+            return (FINAL_CONSONANTS[first] if first else ''), ASPIRATED[second]
+        if coda in ('k', 't', 'p'):
+            return '', coda
+        if jong == 'ㅎ':
+            return '', 'h'
+        return coda, initial
+
+    # Aspiration: final ㅎ (ㅎ, ㄶ, ㅀ) + ㄱ/ㄷ/ㅈ, and ㅎ before ㅅ/ㄴ
+    if second == 'ㅎ':
+        rest = FINAL_CONSONANTS[first] if first else ''
+        if cho in ASPIRATED:
+            return rest, ASPIRATED[cho]
+        if cho == 'ㅅ':
+            return rest, 'ss'
+        if cho == 'ㄴ':
+            return ('l', 'l') if rest == 'l' else ('n', 'n')
+
+    # ㄹ after any final: lateral after ㄴ/ㄹ, otherwise nasalized to n
+    if cho == 'ㄹ':
+        if coda in ('n', 'l'):
+            return 'l', 'l'
+        return NASALIZED.get(coda, coda), 'n'
+
+    # Nasalization before ㄴ/ㅁ, and ㄹ + ㄴ → ll
+    if cho in ('ㄴ', 'ㅁ'):
+        if coda == 'l' and cho == 'ㄴ':
+            return 'l', 'l'
+        return NASALIZED.get(coda, coda), initial
+
+    return coda, initial
+
+
+def _compile():
+    """
+    The romanization transducer, as flat tables indexed by syllable number s:
+
+    - ``start[s]``: s spelled at the start of a word
+    - ``state[s]``: the state after s (its final, or its own row for a
+      syllable in ``FINAL_EXCEPTIONS``, pre-multiplied into a ``pair`` row
+      offset)
+    - ``pair[state + key[s]] + vowel[s]``: s spelled after another syllable,
+      including the previous syllable's final
+    - ``final[state // stride]``: a final at the end of a word
+    """
+    stride = len(CHOSUNG) * 2
+    rows = [(jong, None) for jong in JONGSUNG]
+    rows += [(decompose(char)[2], coda) for char, coda in FINAL_EXCEPTIONS.items()]
+    pair = [
+        ''.join(junction(jong, cho, before_i, coda))
+        for jong, coda in rows for cho in CHOSUNG for before_i in (False, True)
+    ]
+    per_cho = JUNG_COUNT * JONG_COUNT
+    start, key, vowel, state = [], [], [], []
+    for s in range(HANGUL_COUNT):
+        cho, jung, jong = CHOSUNG[s // per_cho], JUNGSUNG[s % per_cho // JONG_COUNT], s % JONG_COUNT
+        start.append(ROMANIZATION_MAP[cho] + ROMANIZATION_MAP[jung])
+        key.append(CHOSUNG.index(cho) * 2 + (jung == 'ㅣ'))
+        vowel.append(ROMANIZATION_MAP[jung])
+        state.append(jong * stride)
+    for row, char in enumerate(FINAL_EXCEPTIONS, JONG_COUNT):
+        state[ord(char) - HANGUL_BASE] = row * stride
+    final = [coda or FINAL_CONSONANTS[jong] for jong, coda in rows]
+    return stride, pair, start, key, vowel, state, final
+
+
+_STRIDE, _PAIR, _START, _KEY, _VOWEL, _STATE, _FINAL = _compile()
+
+
+@lru_cache(maxsize=ROMANIZE_CACHE_SIZE)
+def romanize(text):
+    """Convert Korean text to romanization in one pass (see module docstring)."""
+    pair, start, key, vowel, state, final = _PAIR, _START, _KEY, _VOWEL, _STATE, _FINAL
+    result = []
+    append = result.append
+    prev = -1  # state after the previous syllable, -1 outside a word
+
+    for char in text:
+        s = ord(char) - HANGUL_BASE
+        if 0 <= s < HANGUL_COUNT:
+            if prev < 0:
+                append(start[s])
+            else:
+                append(pair[prev + key[s]])
+                append(vowel[s])
+            prev = state[s]
+        else:
+            if prev >= 0:
+                append(final[prev // _STRIDE])
+                prev = -1
+            append(char)
+
+    if prev >= 0:
+        append(final[prev // _STRIDE])
+    return ''.join(result)
+
+
+# Words each rule above must produce, checked by ``python3 -m
+# pipeline.romanization`` (run from scripts/) after any change to the rules
+ROMANIZATION_EXAMPLES = {
+    # Liaison
+    '있어요': 'isseoyo', '값이': 'gapsi', '없어': 'eopseo', '밟아': 'balba',
+    '넓어': 'neolbeo', '읽어': 'ilgeo', '맑아': 'malga',
+    # Nasalization and lateralization
+    '합니다': 'hamnida', '읽는': 'ingneun', '밟는': 'bamneun', '신라': 'silla',
+    # ㄹ → n after other finals
+    '종로': 'jongno',
+    # Aspiration
+    '좋고': 'joko', '많고': 'manko', '밟히다': 'balpida',
+    # Palatalization
+    '같이': 'gachi', '굳이': 'guji',
+    # ㅎ in a complex final before a vowel
+    '않아': 'ana', '싫어': 'sireo',
+    # Complex finals before a consonant and at the end of a word
+    '읽다': 'ikda', '맑다': 'makda', '읽고': 'ilgo', '맑게': 'malge',
+    '넓다': 'neolda', '넓고': 'neolgo', '여덟': 'yeodeol', '핥다': 'halda',
+    '앉다': 'anda', '젊다': 'jeomda', '읊다': 'eupda', '닭': 'dak', '값': 'gap',
+    # FINAL_EXCEPTIONS
+    '밟다': 'bapda', '밟고': 'bapgo', '밟': 'bap',
+}
+
+
+def check_examples():
+    """The ``ROMANIZATION_EXAMPLES`` that ``romanize`` gets wrong, as (text, expected, actual)."""
+    return [
+        (text, expected, romanize(text))
+        for text, expected in ROMANIZATION_EXAMPLES.items()
+        if romanize(text) != expected
+    ]
+
+
+def syllable_spelling(text):
+    """
+    Per-syllable spelling without the boundary sound changes, as ``romanize``
+    wrote it before they were added. Used to tell generated romanizations
+    in the data from hand-written ones.
+    """
+    spelling = SYLLABLE_ROMANIZATION
+    return ''.join(spelling.get(char, char) for char in text)
+
+
+_ID_STRIP_RE = re.compile(r'[^\w\s가-힣a-zA-Z0-9]')
+_ID_SPACE_RE = re.compile(r'\s+')
+
+ID_MAX_LENGTH = 100
+
+
+@lru_cache(maxsize=ROMANIZE_CACHE_SIZE)
+def make_id(korean, prefix=''):
+    """한국어를 ASCII kebab-case ID로 변환 (한글 음절과 자모는 로마자로)"""
+    cleaned = _ID_STRIP_RE.sub('', korean).strip().lower()
+    cleaned = _ID_SPACE_RE.sub('-', cleaned)
+
+    syllables = SYLLABLE_ID
+    result = []
+    for char in cleaned:
+        rom = syllables.get(char)
+        if rom is None:
+            rom = ID_JAMO.get(char)
+        if rom is not None:
+            result.append(rom)
+        elif char.isascii():
+            if char.isalnum() or char == '-':
+                result.append(char)
+        elif char.isalnum():
+            # é → e. 대응하는 ASCII 가 없는 문자는 버린다
+            result.append(unicodedata.normalize('NFKD', char).encode('ascii', 'ignore').decode('ascii'))
+
+    base_id = ''.join(result) or 'unknown'
+    if prefix:
+        base_id = f"{prefix}-{base_id}"
+
+    return base_id[:ID_MAX_LENGTH]
+
+
+if __name__ == '__main__':
+    failures = check_examples()
+    for text, expected, actual in failures:
+        print(f'{text}: expected {expected}, got {actual}')
+    print(f'{len(ROMANIZATION_EXAMPLES) - len(failures)}/{len(ROMANIZATION_EXAMPLES)} examples')
+    raise SystemExit(1 if failures else 0)
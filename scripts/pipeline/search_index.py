@@ -0,0 +1,207 @@
+"""
+Prebuilt, sharded search index over the entries.
+
+Terms come from ``korean``, ``romanization`` and ``translations.en.word``,
+tokenized like MiniSearch's default tokenizer (split on whitespace and
+punctuation, lowercased), so a query tokenized by the search package
+finds the same terms.
+
+Documents are the entries sorted by ID; a posting refers to one by its
+position in that order. Conversations follow the entries in the document
+table for the Hangul indexes (``pipeline.hangul_index``) but have no
+terms in the shards. Each term is assigned to a shard by its first
+character (``shard_key``): one shard per Hangul initial consonant, per
+Latin letter, one for digits and one for everything else. Every prefix
+of a term starts with the same character, so an exact or prefix lookup
+needs exactly one shard.
+
+Shard layout (compact JSON)::
+
+    {"version": 1, "key": "ko-00",
+     "terms": ["가게", "가구", ...],          # sorted, for binary search
+     "postings": [[delta0, delta1, ...], ...]}
+
+``terms`` doubles as the prefix structure: the terms starting with a
+prefix are one contiguous range of the sorted array. A posting list holds
+``(doc - previous doc) << FIELD_BITS | field mask`` per document, in
+ascending document order, where bit ``i`` of the mask means the term
+occurs in ``FIELDS[i]``.
+"""
+
+import hashlib
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+from pipeline import jsonio
+
+SEARCH_INDEX_VERSION = 1
+
+FIELDS = ('korean', 'romanization', 'translations.en.word')
+FIELD_BITS = len(FIELDS)
+# Stored per document, for rendering results without fetching the entry
+STORE_FIELDS = ('id', 'korean', 'romanization', 'categoryId', 'difficulty')
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+SYLLABLES_PER_CHOSUNG = 21 * 28
+
+
+def field_value(entry, field):
+    value = entry
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value if isinstance(value, str) else None
+
+
+def _separator(char):
+    return char in '\n\r' or unicodedata.category(char)[0] in 'ZP'
+
+
+def tokenize(text):
+    """Lowercased terms of text, split on whitespace and punctuation (MiniSearch's default)."""
+    terms = []
+    term = []
+    for char in text:
+        if _separator(char):
+            if term:
+                terms.append(''.join(term))
+                term = []
+        else:
+            term.append(char)
+    if term:
+        terms.append(''.join(term))
+    return [term.lower() for term in terms]
+
+
+def shard_key(term):
+    """The shard a term (and every term it is a prefix of) belongs to."""
+    code = ord(term[0])
+    if HANGUL_BASE <= code <= HANGUL_END:
+        return f'ko-{(code - HANGUL_BASE) // SYLLABLES_PER_CHOSUNG:02d}'
+    if 'a' <= term[0] <= 'z':
+        return term[0]
+    if '0' <= term[0] <= '9':
+        return '0'
+    return 'other'
+
+
+class SearchIndexBuilder:
+    """Collects entries, then encodes the document table and the shards."""
+
+    def __init__(self):
+        # (id, stored fields, {term: field mask})
+        self.documents = []
+        # Stored fields of conversations, which follow the entries in the
+        # document table (only the Hangul indexes refer to them)
+        self.conversations = []
+
+    def add(self, entry):
+        masks = {}
+        for bit, field in enumerate(FIELDS):
+            value = field_value(entry, field)
+            if value:
+                for term in tokenize(value):
+                    masks[term] = masks.get(term, 0) | (1 << bit)
+        self.documents.append((entry['id'], [entry.get(field) for field in STORE_FIELDS], masks))
+
+    def add_conversation(self, conversation):
+        values = {'id': conversation['id'], 'korean': conversation.get('title', {}).get('ko'),
+                  'categoryId': conversation.get('categoryId')}
+        self.conversations.append([values.get(field) for field in STORE_FIELDS])
+
+    def build(self):
+        """
+        ``(documents, shards)``: the stored-field rows (entries sorted by
+        ID, then conversations in file order) and ``{key: shard}``.
+        """
+        self.documents.sort(key=lambda document: document[0])
+        postings = {}
+        for doc, (_, _, masks) in enumerate(self.documents):
+            for term, mask in masks.items():
+                postings.setdefault(term, []).append((doc, mask))
+
+        shards = {}
+        for term in sorted(postings):
+            shard = shards.setdefault(shard_key(term), {
+                'version': SEARCH_INDEX_VERSION, 'key': shard_key(term), 'terms': [], 'postings': []})
+            encoded = []
+            previous = 0
+            for doc, mask in postings[term]:
+                encoded.append((doc - previous) << FIELD_BITS | mask)
+                previous = doc
+            shard['terms'].append(term)
+            shard['postings'].append(encoded)
+        return [row for _, row, _ in self.documents] + self.conversations, shards
+
+
+def decode_postings(encoded):
+    """``[(doc, field mask)]`` of an encoded posting list."""
+    decoded = []
+    doc = 0
+    for value in encoded:
+        doc += value >> FIELD_BITS
+        decoded.append((doc, value & ((1 << FIELD_BITS) - 1)))
+    return decoded
+
+
+def lookup(shard, prefix):
+    """The ``(term, postings)`` of a shard whose term starts with prefix."""
+    terms = shard['terms']
+    start = bisect_left(terms, prefix)
+    end = start
+    while end < len(terms) and terms[end].startswith(prefix):
+        end += 1
+    return [(terms[i], decode_postings(shard['postings'][i])) for i in range(start, end)]
+
+
+def write_search_index(documents, shards, out_dir, base_dir, conversations=0, hangul=None):
+    """
+    Write ``docs.json``, ``<key>.json`` per shard and ``manifest.json`` to
+    out_dir, removing shards of an earlier run that are gone. The last
+    ``conversations`` documents are conversations. ``hangul`` holds the
+    indexes of ``pipeline.hangul_index``, written as ``<kind>.json``.
+    Files whose bytes are unchanged are not rewritten. Returns
+    ``(manifest, written)``.
+    """
+    hangul = hangul or {}
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+
+    def put(name, value):
+        nonlocal written
+        data = jsonio.dumps(value, pretty=False)
+        path = out_dir / name
+        written += jsonio.write_bytes(path, data)
+        return {'file': path.relative_to(base_dir).as_posix(), 'bytes': len(data),
+                'sha256': hashlib.sha256(data).hexdigest()}
+
+    manifest = {
+        'version': SEARCH_INDEX_VERSION,
+        'fields': list(FIELDS),
+        'fieldBits': FIELD_BITS,
+        'storeFields': list(STORE_FIELDS),
+        'documentCount': len(documents) - conversations,
+        'documents': put('docs.json', documents),
+        'conversations': {'start': len(documents) - conversations, 'count': conversations},
+        'shards': {},
+        'hangul': {},
+    }
+    for key in sorted(shards):
+        record = put(f'{key}.json', shards[key])
+        record['terms'] = len(shards[key]['terms'])
+        manifest['shards'][key] = record
+    for kind in sorted(hangul):
+        record = put(f'{kind}.json', hangul[kind])
+        record['grams'] = len(hangul[kind]['grams'])
+        manifest['hangul'][kind] = record
+
+    for path in out_dir.glob('*.json'):
+        if path.stem not in shards and path.stem not in hangul \
+                and path.name not in ('docs.json', 'manifest.json'):
+            path.unlink()
+    written += jsonio.write_bytes(out_dir / 'manifest.json', jsonio.dumps(manifest))
+    return manifest, written
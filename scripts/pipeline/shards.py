@@ -0,0 +1,101 @@
+"""
+Size-bounded shards of the entry files.
+
+Each category's entries are sorted by ID and packed, in that order, into
+compact JSON arrays of at most ``SHARD_MAX_BYTES``. The shard manifest lists
+the shards of every category with the entry range they cover, so a consumer
+can fetch exactly the page it needs instead of the whole category file.
+An entry larger than the limit gets a shard of its own.
+
+Shards are only rewritten when their content hash changes, which keeps
+file mtimes (and CDN caches) stable for untouched pages.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from pipeline import jsonio
+
+SHARD_MAX_BYTES = 256 * 1024
+SHARD_FORMAT_VERSION = 1
+
+
+def sort_key(entry):
+    return entry['id']
+
+
+def pack(entries, max_bytes=SHARD_MAX_BYTES):
+    """
+    Group entries into shards whose compact JSON array is at most max_bytes.
+
+    Yields one list per shard of the UTF-8 encoded entries, in order.
+    """
+    parts = []
+    size = 2  # '[' + ']'
+    for entry in entries:
+        part = jsonio.dumps(entry, pretty=False)
+        extra = len(part) + (1 if parts else 0)
+        if parts and size + extra > max_bytes:
+            yield parts
+            parts = []
+            size = 2
+            extra = len(part)
+        parts.append(part)
+        size += extra
+    if parts:
+        yield parts
+
+
+def write_category_shards(category, entries, shards_dir, base_dir, max_bytes=SHARD_MAX_BYTES):
+    """
+    Write the shards of one category under ``shards_dir/<category>/``.
+
+    Returns ``(manifest, written)``: the category's manifest record (paths
+    relative to base_dir) and the number of shard files rewritten. Shards
+    left over from a previous, longer run are removed.
+    """
+    category_dir = Path(shards_dir) / category
+    ordered = sorted(entries, key=sort_key)
+    shards = []
+    written = 0
+    start = 0
+    for index, parts in enumerate(pack(ordered, max_bytes)):
+        data = b'[' + b','.join(parts) + b']'
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = category_dir / f'{index:04d}.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if jsonio.write_bytes(path, data):
+            written += 1
+        end = start + len(parts)
+        shards.append({
+            'file': path.relative_to(base_dir).as_posix(),
+            'start': start,
+            'count': len(parts),
+            'firstId': ordered[start]['id'],
+            'lastId': ordered[end - 1]['id'],
+            'bytes': len(data),
+            'sha256': sha256,
+        })
+        start = end
+
+    if category_dir.exists():
+        keep = {f'{index:04d}.json' for index in range(len(shards))}
+        for path in category_dir.glob('*.json'):
+            if path.name not in keep:
+                os.remove(path)
+
+    manifest = {
+        'count': len(ordered),
+        'bytes': sum(shard['bytes'] for shard in shards),
+        'shards': shards,
+    }
+    return manifest, written
+
+
+def find_shard(category_manifest, entry_id):
+    """The shard record whose ID range contains entry_id, or None."""
+    for shard in category_manifest['shards']:
+        if shard['firstId'] <= entry_id <= shard['lastId']:
+            return shard
+    return None
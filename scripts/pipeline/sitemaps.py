@@ -0,0 +1,233 @@
+"""
+Streaming sitemap writer for the Context site.
+
+The files are built before deploy and served as static assets (the
+worker forwards the sitemap routes to ``ASSETS``). Every page is listed in
+English and Korean, each with hreflang alternates. Paths are percent-encoded, since
+entry IDs may contain Hangul, and XML-escaped.
+
+``UrlsetWriter`` appends blocks to a ``<urlset>`` file and starts a new
+file (``<name>-2.xml``, ``-3`` ...) before either protocol limit, 50,000
+URLs or 50 MB uncompressed, would be exceeded. Files are written to a
+temporary path and only replace the old file when their content differs.
+Memory use does not depend on the number of URLs.
+
+``LastmodStore`` keeps, per page key, the content hash last seen and the
+date it was first seen with that hash, so ``lastmod`` is the date a page
+last changed rather than the date of the run. The history is a JSON file
+committed with the data (one key per line, so a data change shows up as a
+small diff), which keeps the dates stable across machines and CI builds.
+A ``frozen`` store only reads the file: builds use it to check that the
+committed history matches the data (``changed`` and ``dropped`` are empty)
+without writing it.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from pipeline import jsonio
+
+SITE_URL = 'https://context.soundbluemusic.com'
+
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"\n'
+    '        xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+).encode('utf-8')
+URLSET_FOOTER = b'</urlset>'
+
+INDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<?xml-stylesheet type="text/xsl" href="/sitemap.xsl"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_FOOTER = '</sitemapindex>'
+
+
+def page_url(path):
+    return escape(SITE_URL + quote(path, safe='/'))
+
+
+def bilingual_urls(path, priority, changefreq, lastmod):
+    """The English and Korean <url> blocks of one page (2 URLs), as bytes."""
+    en_url = page_url(path)
+    ko_url = page_url('/ko' + ('' if path == '/' else path))
+    links = (f'    <xhtml:link rel="alternate" hreflang="en" href="{en_url}"/>\n'
+             f'    <xhtml:link rel="alternate" hreflang="ko" href="{ko_url}"/>\n'
+             f'    <xhtml:link rel="alternate" hreflang="x-default" href="{en_url}"/>\n')
+    return ''.join(
+        f'  <url>\n'
+        f'    <loc>{loc}</loc>\n'
+        f'    <lastmod>{lastmod}</lastmod>\n'
+        f'    <changefreq>{changefreq}</changefreq>\n'
+        f'    <priority>{priority}</priority>\n'
+        f'{links}'
+        f'  </url>\n'
+        for loc in (en_url, ko_url)
+    ).encode('utf-8')
+
+
+class _HashingFile:
+    """A temp file for ``path`` that hashes what is written to it."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = open(self.tmp_path, 'wb')
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.f.write(data)
+        self.sha256.update(data)
+        self.size += len(data)
+
+    def commit(self):
+        """Replace path with the temp file unless the content is identical. Returns whether it did."""
+        self.f.close()
+        try:
+            if self.path.stat().st_size == self.size:
+                with open(self.path, 'rb') as f:
+                    if hashlib.file_digest(f, 'sha256').digest() == self.sha256.digest():
+                        os.remove(self.tmp_path)
+                        return False
+        except OSError:
+            pass
+        os.replace(self.tmp_path, self.path)
+        return True
+
+    def abort(self):
+        self.f.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class UrlsetWriter:
+    """
+    Writes ``<out_dir>/<rel_dir>/<name>.xml`` and, past the limits, its
+    continuation files. ``files`` lists ``(relative path, lastmod, urls)``
+    for every file once closed.
+    """
+
+    def __init__(self, out_dir, rel_dir, name, max_urls=MAX_URLS, max_bytes=MAX_BYTES):
+        self.out_dir = Path(out_dir)
+        self.rel_dir = rel_dir
+        self.name = name
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.files = []
+        self.written = 0
+        self.current = None
+
+    def _relpath(self, number):
+        suffix = '' if number == 1 else f'-{number}'
+        return f'{self.rel_dir}/{self.name}{suffix}.xml' if self.rel_dir else f'{self.name}{suffix}.xml'
+
+    def _open(self):
+        relpath = self._relpath(len(self.files) + 1)
+        self.current = _HashingFile(self.out_dir / relpath)
+        self.current.write(URLSET_HEADER)
+        self.files.append([relpath, '', 0])
+
+    def _finish(self):
+        self.current.write(URLSET_FOOTER)
+        self.written += self.current.commit()
+        self.current = None
+
+    def add(self, block, urls, lastmod):
+        """Append a block of ``urls`` <url> elements whose latest lastmod is ``lastmod``."""
+        if self.current is not None:
+            record = self.files[-1]
+            over_urls = record[2] + urls > self.max_urls
+            over_bytes = self.current.size + len(block) + len(URLSET_FOOTER) > self.max_bytes
+            if record[2] and (over_urls or over_bytes):
+                self._finish()
+        if self.current is None:
+            self._open()
+        self.current.write(block)
+        record = self.files[-1]
+        record[1] = max(record[1], lastmod)
+        record[2] += urls
+
+    def close(self):
+        if self.current is not None:
+            self._finish()
+        return [tuple(record) for record in self.files]
+
+    def abort(self):
+        if self.current is not None:
+            self.current.abort()
+            self.current = None
+
+
+def write_index(path, sitemaps):
+    """Write a sitemap index of ``(relative path, lastmod)``. Returns whether it changed."""
+    lines = [INDEX_HEADER]
+    for relpath, lastmod in sitemaps:
+        lines.append(f'  <sitemap>\n'
+                     f'    <loc>{page_url("/" + relpath)}</loc>\n')
+        if lastmod:
+            lines.append(f'    <lastmod>{lastmod}</lastmod>\n')
+        lines.append('  </sitemap>\n')
+    lines.append(INDEX_FOOTER)
+    out = _HashingFile(path)
+    out.write(''.join(lines).encode('utf-8'))
+    return out.commit()
+
+
+class LastmodStore:
+    """Page key -> (lastmod date, content hash), kept in a JSON file."""
+
+    def __init__(self, path, today, frozen=False):
+        self.path = Path(path)
+        self.today = today
+        self.frozen = frozen
+        try:
+            self.previous = jsonio.load(self.path)
+        except FileNotFoundError:
+            self.previous = {}
+        self.is_new = not self.previous
+        self.records = {}
+        self.changed = []
+
+    def lastmod(self, key, content_hash, default=None):
+        """
+        The page's lastmod: the stored date if its hash is unchanged,
+        otherwise ``default`` (or today) for a new or changed page.
+        """
+        old = self.previous.get(key)
+        if old and old[1] == content_hash:
+            date = old[0]
+        else:
+            date = default or self.today
+            self.changed.append(key)
+        self.records[key] = [date, content_hash]
+        return date
+
+    def dropped(self):
+        """Stored keys not seen in this run."""
+        return sorted(set(self.previous) - set(self.records))
+
+    def close(self):
+        """
+        Write the keys seen in this run, dropping the rest. Returns whether
+        the file changed. A frozen store is never written.
+        """
+        if self.frozen:
+            return False
+        lines = [f'  {jsonio.dumps(key, pretty=False).decode()}: '
+                 f'{jsonio.dumps(self.records[key], pretty=False).decode()}'
+                 for key in sorted(self.records)]
+        body = ',\n'.join(lines)
+        return jsonio.write_bytes(self.path, f'{{\n{body}\n}}\n'.encode('utf-8'))
+
+    def rollback(self):
+        """Leave the file as it was."""
+        self.records = {}
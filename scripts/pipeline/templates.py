@@ -0,0 +1,207 @@
+"""
+Templates that generate entry text from ``korean``, ``english`` and
+``categoryId``.
+
+``create_entry`` builds the converted entry (explanations and the four
+example levels); ``enrich_entry`` adds romanization, dialogue, variations
+and pronunciation. Both scripts and the compact storage format
+(``pipeline.compact``) use these, so a template change is made in one place.
+"""
+
+from typing import Any
+
+from pipeline.romanization import make_id, romanize
+
+# Bump whenever any template output below changes
+TEMPLATE_VERSION = 3
+
+
+def create_entry(korean: str, english: str, category_id: str,
+                 part_of_speech: str = "noun", prefix: str = "") -> dict[str, Any]:
+    """Context 앱 Entry 스키마로 변환"""
+    entry_id = make_id(korean, prefix)
+
+    return {
+        "id": entry_id,
+        "korean": korean,
+        "romanization": "",  # 빈 값으로 설정
+        "partOfSpeech": part_of_speech,
+        "categoryId": category_id,
+        "difficulty": "beginner",
+        "frequency": "common",
+        "tags": [],
+        "translations": {
+            "ko": {
+                "word": korean,
+                "explanation": f"{korean}의 뜻은 '{english}'입니다.",
+                "examples": {
+                    "beginner": f"\"{korean}\"는 한국어로 말해요.",
+                    "intermediate": f"한국에서는 \"{korean}\"를 자주 써요.",
+                    "advanced": f"\"{korean}\"는 한국어에서 중요한 표현입니다.",
+                    "master": f"\"{korean}\"의 문화적 맥락을 이해하면 더 자연스럽게 소통할 수 있습니다."
+                },
+                "variations": {
+                    "formal": [],
+                    "casual": [],
+                    "short": []
+                }
+            },
+            "en": {
+                "word": english,
+                "explanation": f"'{korean}' means '{english}' in English.",
+                "examples": {
+                    "beginner": f"We say \"{korean}\" in Korean.",
+                    "intermediate": f"In Korea, people often say \"{korean}\".",
+                    "advanced": f"\"{korean}\" is an important expression in Korean.",
+                    "master": f"Understanding the cultural context of \"{korean}\" makes communication more natural."
+                },
+                "variations": {
+                    "formal": [],
+                    "casual": [],
+                    "short": []
+                }
+            }
+        }
+    }
+
+
+# Dialogue templates per category: (context_ko, context_en, A_ko, B_ko, A_en, B_en).
+# Lines are str.format patterns over {ko} (Korean word) and {en} (English word).
+DIALOGUE_TEMPLATES = {
+    'greetings': ('일상에서 인사하며', 'Greeting in daily life',
+                  '{ko}!', '네, {ko}!',
+                  '{en}!', 'Yes, {en}!'),
+    'food': ('식당에서 주문하며', 'Ordering at a restaurant',
+             '{ko} 있어요?', '네, {ko} 있어요.',
+             'Do you have {en}?', 'Yes, we have {en}.'),
+    'emotions': ('감정을 표현하며', 'Expressing emotions',
+                 '지금 기분이 어때요?', '{ko} 느낌이에요.',
+                 'How do you feel now?', 'I feel {en}.'),
+    'daily-life': ('일상 대화에서', 'In daily conversation',
+                   '{ko}이/가 뭐예요?', '{ko}은/는 이거예요.',
+                   'What is {en}?', 'This is {en}.'),
+    'travel': ('여행 중 대화에서', 'While traveling',
+               '{ko} 어디 있어요?', '{ko}은/는 저기 있어요.',
+               'Where is {en}?', '{en} is over there.'),
+    'work': ('직장에서 대화하며', 'At the workplace',
+             '{ko} 처리했어요?', '네, {ko} 완료했어요.',
+             'Did you handle {en}?', 'Yes, I finished {en}.'),
+    'shopping': ('쇼핑하며', 'While shopping',
+                 '{ko} 얼마예요?', '{ko}은/는 만 원이에요.',
+                 'How much is {en}?', '{en} is 10,000 won.'),
+}
+
+DEFAULT_DIALOGUE = ('일상 대화에서', 'In daily conversation',
+                    '{ko}이/가 뭐예요?', '{ko}은/는 {en}(이)에요.',
+                    'What is "{ko}"?', '"{ko}" means "{en}".')
+
+
+def dialogue_lines(korean_word, english_word, category_id):
+    """(context_ko, context_en, A_ko, B_ko, A_en, B_en) for one word."""
+    context_ko, context_en, *lines = DIALOGUE_TEMPLATES.get(category_id, DEFAULT_DIALOGUE)
+    return (context_ko, context_en,
+            *(line.format(ko=korean_word, en=english_word) for line in lines))
+
+
+def build_dialogue(context_ko, context_en, a_ko, b_ko, a_en, b_en, romanization_a, romanization_b):
+    """The {'ko': ..., 'en': ...} dialogue structure from filled-in lines."""
+    return {
+        'ko': {
+            'context': context_ko,
+            'dialogue': [
+                {'speaker': 'A', 'text': a_ko, 'romanization': romanization_a, 'translation': a_en},
+                {'speaker': 'B', 'text': b_ko, 'romanization': romanization_b, 'translation': b_en},
+            ]
+        },
+        'en': {
+            'context': context_en,
+            'dialogue': [
+                {'speaker': 'A', 'text': a_en, 'romanization': '', 'translation': a_ko},
+                {'speaker': 'B', 'text': b_en, 'romanization': '', 'translation': b_ko},
+            ]
+        }
+    }
+
+
+def generate_dialogue(korean_word, english_word, category_id):
+    """Generate dialogue examples based on word and category."""
+    context_ko, context_en, a_ko, b_ko, a_en, b_en = dialogue_lines(korean_word, english_word, category_id)
+    return build_dialogue(context_ko, context_en, a_ko, b_ko, a_en, b_en, romanize(a_ko), romanize(b_ko))
+
+
+# Variation patterns per language and register, as str.format patterns over
+# {ko} and {en} like the dialogue lines. 'short' is not a pattern: it is the
+# first two syllables of the Korean word and the first English word.
+VARIATION_TEMPLATES = {
+    'ko': {
+        'formal': ('{ko}입니다.', '{ko}이/가 있습니다.'),
+        'casual': ('{ko}이야.', '{ko} 있어.'),
+    },
+    'en': {
+        'formal': ('It is {en}.', 'There is {en}.'),
+        'casual': ("It's {en}.", '{en}, you know.'),
+    },
+}
+
+
+def short_korean(korean_word):
+    """The Korean 'short' variation."""
+    return korean_word[:2] if len(korean_word) > 2 else korean_word
+
+
+def short_english(english_word):
+    """The English 'short' variation."""
+    return english_word.split()[0] if ' ' in english_word else english_word
+
+
+def generate_variations(korean_word, english_word, category_id):
+    """Generate formal/casual/short variations."""
+    ko, en = VARIATION_TEMPLATES['ko'], VARIATION_TEMPLATES['en']
+    return {
+        'ko': {
+            'formal': [line.format(ko=korean_word) for line in ko['formal']],
+            'casual': [line.format(ko=korean_word) for line in ko['casual']],
+            'short': [short_korean(korean_word)],
+        },
+        'en': {
+            'formal': [line.format(en=english_word) for line in en['formal']],
+            'casual': [line.format(en=english_word) for line in en['casual']],
+            'short': [short_english(english_word)],
+        }
+    }
+
+
+def enrich_entry(entry):
+    """Enrich a single entry with romanization, dialogue, and variations."""
+    korean = entry.get('korean', '')
+    english = entry.get('translations', {}).get('en', {}).get('word', '')
+    category_id = entry.get('categoryId', 'basic-words')
+
+    # Skip if already has romanization (original entries)
+    if entry.get('romanization'):
+        return entry
+
+    # Add romanization
+    entry['romanization'] = romanize(korean)
+
+    # Generate dialogue
+    dialogue_data = generate_dialogue(korean, english, category_id)
+
+    # Add dialogue to translations
+    if 'translations' in entry:
+        variations = generate_variations(korean, english, category_id)
+        if 'ko' in entry['translations']:
+            entry['translations']['ko']['dialogue'] = dialogue_data['ko']
+            entry['translations']['ko']['variations'] = variations['ko']
+        if 'en' in entry['translations']:
+            entry['translations']['en']['dialogue'] = dialogue_data['en']
+            entry['translations']['en']['variations'] = variations['en']
+
+    # Add pronunciation field
+    ipa = entry['romanization']
+    entry['pronunciation'] = {
+        'korean': f'[{korean}]',
+        'ipa': f'[{ipa}]'
+    }
+
+    return entry
@@ -0,0 +1,158 @@
+"""
+Per-stage instrumentation for the pipeline scripts.
+
+``Tracer.stage`` wraps one stage (a source file, an output file, a save
+step) and records its wall time, entry count, bytes read and written and
+the process's peak RSS when it ended. With a profile directory, each stage
+also runs under cProfile and leaves a ``NN-<stage>.pstats`` file.
+
+Stages that run elsewhere (a worker process) are added with ``record``.
+Run-wide numbers that belong to no single stage go in ``counters``. The
+collected trace can be printed as a table or written as JSON.
+"""
+
+import cProfile
+import os
+import re
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from pipeline import jsonio
+
+TRACE_VERSION = 1
+
+
+def max_rss_kb():
+    """Peak resident set size of this process so far, in KB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB on Linux
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class Stage:
+    """Counters for one stage, filled in by the code being traced."""
+
+    def __init__(self, name, **meta):
+        self.name = name
+        self.meta = meta
+        self.entries = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def read(self, path):
+        """Count the size of a file this stage read."""
+        self.bytes_read += file_size(path)
+
+    def wrote(self, path):
+        """Count the size of a file this stage wrote."""
+        self.bytes_written += file_size(path)
+
+
+class Tracer:
+    """Collects stage records for one pipeline run."""
+
+    def __init__(self, command, profile_dir=None):
+        self.command = command
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.stages = []
+        # Run-wide counters (cache hits, ...) reported alongside the stages
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        self._profiling = False
+
+    def _profile_path(self, name):
+        slug = re.sub(r'[^\w.-]+', '-', name).strip('-') or 'stage'
+        return self.profile_dir / f'{len(self.stages) + 1:02d}-{slug}.pstats'
+
+    @contextmanager
+    def stage(self, name, **meta):
+        """
+        Time the body as one stage. Stages may be entered inside a generator;
+        the time then includes whatever the consumer does between items.
+        """
+        stage = Stage(name, **meta)
+        profiler = None
+        # cProfile can't nest; an inner stage is timed but not profiled
+        if self.profile_dir and not self._profiling:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler = cProfile.Profile()
+            self._profiling = True
+        rss_before = max_rss_kb()
+        started = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield stage
+        finally:
+            if profiler:
+                profiler.disable()
+                self._profiling = False
+            seconds = time.perf_counter() - started
+            profile_path = None
+            if profiler:
+                profile_path = self._profile_path(name)
+                profiler.dump_stats(profile_path)
+            self.record(
+                name, seconds, stage.entries, stage.bytes_read, stage.bytes_written,
+                max_rss_kb(), rss_growth_kb=max_rss_kb() - rss_before,
+                profile=str(profile_path) if profile_path else None, **stage.meta,
+            )
+
+    def record(self, name, seconds, entries=0, bytes_read=0, bytes_written=0,
+               peak_rss_kb=None, **meta):
+        """Add a stage measured outside ``stage()``."""
+        record = {
+            'stage': name,
+            'seconds': round(seconds, 4),
+            'entries': entries,
+            'entriesPerSec': round(entries / seconds, 1) if seconds and entries else None,
+            'bytesRead': bytes_read,
+            'bytesWritten': bytes_written,
+            'peakRssKb': peak_rss_kb if peak_rss_kb is not None else max_rss_kb(),
+        }
+        if 'rss_growth_kb' in meta:
+            record['rssGrowthKb'] = meta.pop('rss_growth_kb')
+        record.update((key, value) for key, value in meta.items() if value is not None)
+        self.stages.append(record)
+        return record
+
+    def report(self):
+        return {
+            'version': TRACE_VERSION,
+            'command': self.command,
+            'argv': sys.argv[1:],
+            'startedAt': self.started_at,
+            'seconds': round(time.perf_counter() - self.started, 4),
+            'peakRssKb': max_rss_kb(),
+            'counters': self.counters,
+            'stages': self.stages,
+        }
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        jsonio.write_bytes(path, jsonio.dumps(self.report()), only_if_changed=False)
+
+    def print_summary(self, file=None):
+        file = file or sys.stdout
+        width = max([len(s['stage']) for s in self.stages] + [5])
+        print(f"\n{'stage':<{width}}  {'sec':>8}  {'entries/s':>10}  "
+              f"{'read MB':>8}  {'write MB':>8}  {'peak MB':>8}", file=file)
+        for s in self.stages:
+            rate = f"{s['entriesPerSec']:,.0f}" if s['entriesPerSec'] else '-'
+            print(f"{s['stage']:<{width}}  {s['seconds']:8.3f}  {rate:>10}  "
+                  f"{s['bytesRead'] / 1048576:8.2f}  {s['bytesWritten'] / 1048576:8.2f}  "
+                  f"{s['peakRssKb'] / 1024:8.1f}", file=file)
+        total = time.perf_counter() - self.started
+        print(f"{'total':<{width}}  {total:8.3f}", file=file)
@@ -0,0 +1,281 @@
+"""
+Concurrent, atomic output writer for the pipeline scripts.
+
+``AtomicWriter.submit`` hands a value and its target path to a thread
+pool and returns immediately, so the caller can go on converting the
+next category while the previous one is written. A worker thread
+serializes the value (``jsonio.dumps`` unless bytes are given), skips
+the write if the file already holds exactly those bytes, and otherwise
+writes a temp file next to the target.
+
+Temp files are renamed over their targets in batches. With ``durable``,
+a batch first fsyncs every temp file, then renames them all and fsyncs
+each parent directory once. That is one sync round per batch rather than
+one per file, which matters on slow external volumes. Until its batch
+commits, a target keeps its old content. A crash or Ctrl-C therefore
+leaves every file either old or new, never truncated, and ``abort``
+removes the temp files.
+
+At most ``max_in_flight`` submissions are queued or being written;
+``submit`` blocks beyond that, which bounds the memory held by pending
+values. Errors from the workers are raised by the next ``submit`` or by
+``close``.
+
+Each file gets a ``WriteRecord`` with its size and how long it spent
+queued, serializing, writing and in total until committed. ``trace``
+adds them to a ``Tracer``.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pipeline import jsonio
+
+WRITE_THREADS = 4
+MAX_IN_FLIGHT = 8
+FSYNC_BATCH = 16
+
+
+class WriteRecord:
+    __slots__ = ('path', 'bytes', 'written', 'submitted', 'queued', 'serialize', 'write', 'total')
+
+    def __init__(self, path, submitted):
+        self.path = path
+        self.submitted = submitted
+        self.bytes = 0
+        self.written = False
+        self.queued = self.serialize = self.write = self.total = 0.0
+
+    def as_dict(self):
+        return {
+            'path': str(self.path),
+            'bytes': self.bytes,
+            'written': self.written,
+            'queuedSeconds': round(self.queued, 4),
+            'serializeSeconds': round(self.serialize, 4),
+            'writeSeconds': round(self.write, 4),
+            'totalSeconds': round(self.total, 4),
+        }
+
+
+class AtomicWriter:
+    """Thread pool that writes files atomically, in fsync batches."""
+
+    def __init__(self, threads=WRITE_THREADS, max_in_flight=MAX_IN_FLIGHT, durable=True,
+                 fsync_batch=FSYNC_BATCH, pretty=True):
+        self.pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix='atomic-writer')
+        self.max_in_flight = max(1, max_in_flight)
+        self.slots = threading.BoundedSemaphore(self.max_in_flight)
+        self.durable = durable
+        self.fsync_batch = max(1, fsync_batch)
+        self.pretty = pretty
+        self.lock = threading.Lock()
+        # (record, temp path, target path) written but not yet renamed
+        self.staged = []
+        # Targets submitted and not committed (including failed writes)
+        self.pending = set()
+        self.records = []
+        self.errors = []
+        self.batches = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _raise_errors(self):
+        if self.errors:
+            raise self.errors[0]
+
+    def submit(self, path, value, trailing_newline=False, only_if_changed=True):
+        """
+        Queue value (JSON-encodable, or bytes written as-is) to be written
+        to path. Blocks while ``max_in_flight`` writes are outstanding.
+        """
+        if self.closed:
+            raise RuntimeError('writer is closed')
+        self._raise_errors()
+        path = Path(path)
+        with self.lock:
+            if path in self.pending:
+                raise ValueError(f'{path} is already queued for writing')
+            self.pending.add(path)
+        self.slots.acquire()
+        record = WriteRecord(path, time.perf_counter())
+        try:
+            self.pool.submit(self._write, record, value, trailing_newline, only_if_changed)
+        except BaseException:
+            self.slots.release()
+            raise
+        return record
+
+    def _write(self, record, value, trailing_newline, only_if_changed):
+        tmp_path = None
+        try:
+            started = time.perf_counter()
+            record.queued = started - record.submitted
+            data = value if isinstance(value, bytes) else jsonio.dumps(value, self.pretty)
+            if trailing_newline:
+                data += b'\n'
+            serialized = time.perf_counter()
+            record.serialize = serialized - started
+            record.bytes = len(data)
+
+            path = record.path
+            if only_if_changed and _same_content(path, data):
+                record.total = time.perf_counter() - record.submitted
+                with self.lock:
+                    self.pending.discard(path)
+                    self.records.append(record)
+                return
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                if self.durable:
+                    f.flush()
+            record.write = time.perf_counter() - serialized
+            record.written = True
+            with self.lock:
+                self.staged.append((record, tmp_path, path))
+                batch = self._take_batch(self.fsync_batch)
+            self._commit(batch)
+        except BaseException as error:
+            if tmp_path is not None and not record.written:
+                tmp_path.unlink(missing_ok=True)
+            with self.lock:
+                self.errors.append(error)
+        finally:
+            self.slots.release()
+
+    def _take_batch(self, minimum):
+        """The staged files to commit, if at least minimum are waiting (call with the lock held)."""
+        if len(self.staged) < minimum:
+            return []
+        batch, self.staged = self.staged, []
+        return batch
+
+    def _commit(self, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            if self.durable:
+                for _, tmp_path, _ in batch:
+                    fd = os.open(tmp_path, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+            for _, tmp_path, path in batch:
+                os.replace(tmp_path, path)
+            if self.durable:
+                for directory in {path.parent for _, _, path in batch}:
+                    _fsync_directory(directory)
+        except BaseException:
+            self._discard(batch)
+            raise
+        committed = time.perf_counter()
+        with self.lock:
+            self.batches += 1
+            for record, _, path in batch:
+                record.write += committed - started
+                record.total = committed - record.submitted
+                self.pending.discard(path)
+                self.records.append(record)
+
+    def flush(self):
+        """Wait for every queued write and commit whatever is staged."""
+        for _ in range(self.max_in_flight):
+            self.slots.acquire()
+        for _ in range(self.max_in_flight):
+            self.slots.release()
+        with self.lock:
+            batch = self._take_batch(1)
+        if not self.errors:
+            self._commit(batch)
+        else:
+            self._discard(batch)
+        self._raise_errors()
+
+    def close(self):
+        """Finish every write; raises the first worker error, if any."""
+        if self.closed:
+            return
+        try:
+            self.flush()
+        except BaseException:
+            self.abort()
+            raise
+        self.pool.shutdown(wait=True)
+        self.closed = True
+
+    def abort(self):
+        """Stop writing: queued writes are dropped and staged temp files removed."""
+        self.closed = True
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        with self.lock:
+            batch = self._take_batch(1)
+        self._discard(batch)
+
+    @staticmethod
+    def _discard(batch):
+        for _, tmp_path, _ in batch:
+            tmp_path.unlink(missing_ok=True)
+
+    def stats(self):
+        """Summary of the committed writes: counts, bytes and latency percentiles."""
+        totals = sorted(record.total for record in self.records)
+
+        def percentile(p):
+            return round(totals[min(len(totals) - 1, int(p * len(totals)))], 4) if totals else None
+
+        return {
+            'files': len(self.records),
+            'written': sum(record.written for record in self.records),
+            'unchanged': sum(not record.written for record in self.records),
+            'bytes': sum(record.bytes for record in self.records if record.written),
+            'fsyncBatches': self.batches if self.durable else 0,
+            'latencyP50': percentile(0.5),
+            'latencyP95': percentile(0.95),
+            'latencyMax': percentile(1.0),
+        }
+
+    def trace(self, tracer):
+        """Add one stage per file (latency from submit to commit) and the summary to tracer."""
+        for record in sorted(self.records, key=lambda record: record.submitted):
+            tracer.record(f'write {record.path.name}', record.total, 0, 0,
+                          record.bytes if record.written else 0,
+                          queued=round(record.queued, 4), serialize=round(record.serialize, 4),
+                          write=round(record.write, 4), unchanged=not record.written or None)
+        tracer.counters['writes'] = self.stats()
+
+
+def _same_content(path, data):
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # not supported for directories on some platforms / filesystems
+        pass
+    finally:
+        os.close(fd)
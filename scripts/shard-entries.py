@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+엔트리 파일 → 크기 제한 샤드 + meta.json 샤드 매니페스트
+data/context/entries/<카테고리>.json → data/context/shards/<카테고리>/NNNN.json
+
+카테고리별로 ID 순으로 정렬해 샤드당 최대 256 KB 로 나눈다.
+meta.json 의 files.shards 에 샤드별 범위, 개수, 바이트, 해시를 기록한다.
+기존 files.entries 목록은 그대로 둔다.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from pipeline import jsonio
+from pipeline.jsonstream import iter_array
+from pipeline.shards import SHARD_FORMAT_VERSION, SHARD_MAX_BYTES, write_category_shards
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data" / "context"
+
+
+def update_meta(meta_path: Path, categories: dict, max_bytes: int) -> None:
+    try:
+        meta = jsonio.load(meta_path)
+    except FileNotFoundError:
+        meta = {"version": "1.0.0", "files": {}, "counts": {}}
+
+    meta.setdefault("files", {})["shards"] = {
+        "version": SHARD_FORMAT_VERSION,
+        "maxBytes": max_bytes,
+        "order": "id",
+        "categories": categories,
+    }
+    counts = meta.setdefault("counts", {})
+    counts["entries"] = sum(c["count"] for c in categories.values())
+    counts["shards"] = sum(len(c["shards"]) for c in categories.values())
+
+    # sync-stats.ts 와 같은 형식 (JSON.stringify(meta, null, 2))
+    jsonio.dump(meta, meta_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카테고리 파일을 크기 제한 샤드로 나누고 meta.json 에 기록")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="entries/ 와 meta.json 이 있는 디렉터리")
+    parser.add_argument("--max-bytes", type=int, default=SHARD_MAX_BYTES,
+                        help=f"샤드 최대 크기 (기본 {SHARD_MAX_BYTES // 1024} KB)")
+    args = parser.parse_args()
+
+    print("=== 샤드 생성 시작 ===\n")
+    started = time.perf_counter()
+
+    data_dir = args.data_dir
+    shards_dir = data_dir / "shards"
+    categories = {}
+    written = 0
+    for filepath in sorted((data_dir / "entries").glob("*.json")):
+        category = filepath.stem
+        record, changed = write_category_shards(
+            category, iter_array(filepath), shards_dir, data_dir, args.max_bytes)
+        categories[category] = record
+        written += changed
+        print(f"   {category}: {record['count']}개 → 샤드 {len(record['shards'])}개"
+              f" ({changed}개 갱신)")
+
+    # 없어진 카테고리의 샤드 디렉터리 정리
+    if shards_dir.exists():
+        for path in shards_dir.iterdir():
+            if path.is_dir() and path.name not in categories:
+                for shard in path.glob("*.json"):
+                    os.remove(shard)
+                path.rmdir()
+
+    update_meta(data_dir / "meta.json", categories, args.max_bytes)
+
+    total = sum(len(c["shards"]) for c in categories.values())
+    print(f"\n샤드 {total}개 중 {written}개 갱신, meta.json 업데이트")
+    print(f"=== 완료 ({time.perf_counter() - started:.2f}s) ===")
+
+
+if __name__ == "__main__":
+    main()
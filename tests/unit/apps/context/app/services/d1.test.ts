@@ -6,6 +6,7 @@
  */
 
 import { describe, expect, it, vi, beforeEach } from 'vitest';
+import { getHomonymsByKoreanFromD1 } from '../../../../../../apps/context/app/services/d1';
 
 // Mock D1 Database 타입
 interface MockD1Result<T> {
@@ -71,6 +72,38 @@ const mockConversationRow = {
   ]),
 };
 
+// 동음이의어 조회 결과 행 (D1 이 LEFT JOIN 으로 돌려주는 모양)
+// entry_translations 행이 있으면 word_ko/word_en, 없으면 translations 만 채워짐
+const mockHomonymRows = [
+  {
+    id: 'bae-fruit',
+    korean: '배',
+    romanization: 'bae',
+    category_id: 'food',
+    word_ko: '배',
+    word_en: 'pear',
+    translations: null as string | null,
+  },
+  {
+    id: 'bae-ship',
+    korean: '배',
+    romanization: 'bae',
+    category_id: 'travel',
+    word_ko: null as string | null,
+    word_en: null as string | null,
+    translations: JSON.stringify({ ko: { word: '배' }, en: { word: 'ship' } }),
+  },
+  {
+    id: 'bae-belly',
+    korean: '배',
+    romanization: 'bae',
+    category_id: 'body',
+    word_ko: null as string | null,
+    word_en: null as string | null,
+    translations: '{"ko": {"word": "배"',
+  },
+];
+
 // Mock D1 생성 함수
 function createMockD1(options?: {
   entryRows?: typeof mockEntryRow[];
@@ -78,6 +111,7 @@ function createMockD1(options?: {
   conversationRows?: typeof mockConversationRow[];
   shouldThrow?: boolean;
   entryCountRows?: { category_id: string; count: number }[];
+  homonymRows?: (typeof mockHomonymRows)[number][];
 }): MockD1Database {
   const {
     entryRows = [],
@@ -85,6 +119,7 @@ function createMockD1(options?: {
     conversationRows = [],
     shouldThrow = false,
     entryCountRows = [],
+    homonymRows = [],
   } = options || {};
 
   return {
@@ -126,6 +161,13 @@ function createMockD1(options?: {
             return { results: results as T[], success: true, meta: {} };
           }
 
+          // SELECT ... FROM entries e LEFT JOIN entry_translations ... WHERE e.korean = ?
+          if (query.includes('LEFT JOIN entry_translations') && query.includes('WHERE e.korean')) {
+            const korean = boundValues[0];
+            const results = homonymRows.filter((r) => r.korean === korean);
+            return { results: results as T[], success: true, meta: {} };
+          }
+
           // SELECT ... FROM categories
           if (query.includes('FROM categories')) {
             return { results: categoryRows as T[], success: true, meta: {} };
@@ -693,4 +735,50 @@ describe('D1 Service', () => {
       expect(entry?.difficulty).toBe('beginner');
     });
   });
+
+  describe('getHomonymsByKoreanFromD1', () => {
+    // 실제 모듈의 함수 (Cloudflare 런타임 의존성 없음)
+    const getHomonyms = (db: MockD1Database, korean: string) =>
+      getHomonymsByKoreanFromD1(
+        db as unknown as Parameters<typeof getHomonymsByKoreanFromD1>[0],
+        korean,
+      );
+
+    it('should read words from entry_translations', async () => {
+      const db = createMockD1({ homonymRows: mockHomonymRows });
+      const result = await getHomonyms(db, '배');
+
+      expect(result[0]).toEqual({
+        id: 'bae-fruit',
+        korean: '배',
+        romanization: 'bae',
+        categoryId: 'food',
+        word: { ko: '배', en: 'pear' },
+      });
+    });
+
+    it('should fall back to translations JSON without entry_translations rows', async () => {
+      const db = createMockD1({ homonymRows: mockHomonymRows });
+      const result = await getHomonyms(db, '배');
+
+      expect(result[1]?.word).toEqual({ ko: '배', en: 'ship' });
+    });
+
+    it('should use empty words for malformed translations without failing other rows', async () => {
+      const db = createMockD1({ homonymRows: mockHomonymRows });
+      const result = await getHomonyms(db, '배');
+
+      expect(result.map((entry) => entry.id)).toEqual(['bae-fruit', 'bae-ship', 'bae-belly']);
+      expect(result[2]?.word).toEqual({ ko: '', en: '' });
+    });
+
+    it('should return empty array when D1 throws error', async () => {
+      const consoleSpy = vi.spyOn(console, 'error').mockImplementation(() => {});
+      const db = createMockD1({ shouldThrow: true });
+      const result = await getHomonyms(db, '배');
+
+      expect(result).toEqual([]);
+      consoleSpy.mockRestore();
+    });
+  });
 });
@@ -0,0 +1,117 @@
+/**
+ * @fileoverview Context 앱 ID 리다이렉트 테이블 테스트
+ *
+ * 픽스처는 scripts/pipeline/id_migration.py 의 save_redirects 로 만든 테이블입니다
+ * (tests/fixtures/id-redirects/id-redirects.json → id-redirects.bin, {} → empty.bin).
+ * 파이프라인과 해시 / 레이아웃이 한 비트라도 다르면 hit 가 다른 슬롯을 읽어 실패합니다.
+ */
+
+import { readFileSync } from 'node:fs';
+import { join } from 'node:path';
+import { beforeEach, describe, expect, it, vi } from 'vitest';
+import {
+  ID_REDIRECTS_PATH,
+  IdRedirectTable,
+  type loadIdRedirects,
+} from '../../../../../../apps/context/app/services/id-redirects';
+
+const FIXTURE_DIR = join(process.cwd(), 'tests/fixtures/id-redirects');
+
+function readTable(name: string): ArrayBuffer {
+  const data = readFileSync(join(FIXTURE_DIR, name));
+  return data.buffer.slice(data.byteOffset, data.byteOffset + data.byteLength) as ArrayBuffer;
+}
+
+const redirects: Record<string, string> = JSON.parse(
+  readFileSync(join(FIXTURE_DIR, 'id-redirects.json'), 'utf8'),
+).redirects;
+
+describe('IdRedirectTable', () => {
+  it('should read the header written by the pipeline', () => {
+    const table = new IdRedirectTable(readTable('id-redirects.bin'));
+    expect(table.size).toBe(7);
+  });
+
+  it('should resolve every old ID to its new ID', () => {
+    const table = new IdRedirectTable(readTable('id-redirects.bin'));
+    expect(table.lookup('w-블rogeu')).toBe('w-beulrogeu');
+    expect(table.lookup('nupda')).toBe('d-bod-nupda');
+    for (const [oldId, newId] of Object.entries(redirects)) {
+      expect(table.lookup(oldId)).toBe(newId);
+    }
+  });
+
+  it('should reject IDs that are not in the table', () => {
+    const table = new IdRedirectTable(readTable('id-redirects.bin'));
+    // 새 ID 와 현재 ID 는 이전 ID 가 아님
+    expect(table.lookup('w-beulrogeu')).toBeNull();
+    expect(table.lookup('annyeong')).toBeNull();
+    expect(table.lookup('')).toBeNull();
+  });
+
+  it('should compare the stored ID in a colliding slot', () => {
+    const table = new IdRedirectTable(readTable('id-redirects.bin'));
+    // 둘 다 'ek-yesul' 의 슬롯으로 해시됨 (길이가 다른 접두어 / 확장)
+    expect(table.lookup('ek-yesul')).toBe('d-art-yesul');
+    expect(table.lookup('ek-yesul-1')).toBeNull();
+    expect(table.lookup('ek-yesu')).toBeNull();
+    // 'nupda' 의 슬롯으로 해시되는 다른 ID
+    expect(table.lookup('nupda-13')).toBeNull();
+  });
+
+  it('should return null for an empty table', () => {
+    const table = new IdRedirectTable(readTable('empty.bin'));
+    expect(table.size).toBe(0);
+    expect(table.lookup('w-블rogeu')).toBeNull();
+  });
+
+  it('should reject data that is not a redirect table', () => {
+    const buffer = readTable('id-redirects.bin');
+    new Uint8Array(buffer)[0] = 0;
+    expect(() => new IdRedirectTable(buffer)).toThrow('Not an ID redirect table');
+    expect(() => new IdRedirectTable(new ArrayBuffer(24))).toThrow('Not an ID redirect table');
+  });
+});
+
+describe('loadIdRedirects', () => {
+  let load: typeof loadIdRedirects;
+
+  beforeEach(async () => {
+    // 모듈 수준 캐시를 테스트마다 비움
+    vi.resetModules();
+    ({ loadIdRedirects: load } = await import(
+      '../../../../../../apps/context/app/services/id-redirects'
+    ));
+  });
+
+  function createAssets(response: (input: unknown) => Promise<Response>) {
+    const fetch = vi.fn(response);
+    return { assets: { fetch } as unknown as Parameters<typeof loadIdRedirects>[0], fetch };
+  }
+
+  it('should fetch the table from assets once', async () => {
+    const { assets, fetch } = createAssets(async () => new Response(readTable('id-redirects.bin')));
+    const table = await load(assets, 'https://context.example');
+    await load(assets, 'https://context.example');
+    expect(table?.lookup('w-사과')).toBe('w-sagwa');
+    expect(fetch).toHaveBeenCalledTimes(1);
+    expect(String(fetch.mock.calls[0]?.[0])).toBe(`https://context.example${ID_REDIRECTS_PATH}`);
+  });
+
+  it('should return null when the table is missing', async () => {
+    const { assets } = createAssets(async () => new Response(null, { status: 404 }));
+    expect(await load(assets, 'https://context.example')).toBeNull();
+  });
+
+  it('should retry after a failed fetch', async () => {
+    let calls = 0;
+    const { assets } = createAssets(async () => {
+      calls++;
+      if (calls === 1) throw new Error('network');
+      return new Response(readTable('id-redirects.bin'));
+    });
+    expect(await load(assets, 'https://context.example')).toBeNull();
+    const table = await load(assets, 'https://context.example');
+    expect(table?.size).toBe(7);
+  });
+});
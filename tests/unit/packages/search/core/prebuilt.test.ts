@@ -0,0 +1,282 @@
+/**
+ * @fileoverview Tests for PrebuiltIndex
+ *
+ * Fixture: tests/fixtures/search-index (entries/, conversations.json).
+ * Regenerate search/ with:
+ *   python3 scripts/build-search-index.py --data-dir tests/fixtures/search-index
+ */
+
+import { readFileSync } from 'node:fs';
+import { join } from 'node:path';
+import {
+  PREBUILT_INDEX_VERSION,
+  PrebuiltIndex,
+  type PrebuiltManifest,
+  chosungSequence,
+  jamoSequence,
+  prebuiltShardKey,
+  tokenizePrebuilt,
+} from '@soundblue/search/core';
+import { describe, expect, it } from 'vitest';
+
+const FIXTURE_DIR = join(process.cwd(), 'tests/fixtures/search-index');
+
+function createFetcher() {
+  const fetched: string[] = [];
+  const fetchFile = async (file: string): Promise<unknown> => {
+    fetched.push(file);
+    return JSON.parse(readFileSync(join(FIXTURE_DIR, file), 'utf8'));
+  };
+  return { fetched, fetchFile };
+}
+
+async function loadIndex(boost: Record<string, number> = {}) {
+  const { fetched, fetchFile } = createFetcher();
+  const index = await PrebuiltIndex.load('search/manifest.json', fetchFile, boost);
+  return { index, fetched };
+}
+
+describe('tokenizePrebuilt', () => {
+  it('should split on spaces and punctuation and lowercase', () => {
+    expect(tokenizePrebuilt('Chuseok (harvest festival)')).toEqual([
+      'chuseok',
+      'harvest',
+      'festival',
+    ]);
+    expect(tokenizePrebuilt('사과 주스')).toEqual(['사과', '주스']);
+  });
+
+  it('should return no terms for punctuation only', () => {
+    expect(tokenizePrebuilt(' ?! ')).toEqual([]);
+  });
+});
+
+describe('prebuiltShardKey', () => {
+  it('should key Hangul terms by chosung index', () => {
+    expect(prebuiltShardKey('사과')).toBe('ko-09');
+    expect(prebuiltShardKey('안녕')).toBe('ko-11');
+    expect(prebuiltShardKey('출석')).toBe('ko-14');
+    expect(prebuiltShardKey('가')).toBe('ko-00');
+    expect(prebuiltShardKey('힣')).toBe('ko-18');
+  });
+
+  it('should key Latin terms by first letter', () => {
+    expect(prebuiltShardKey('apple')).toBe('a');
+    expect(prebuiltShardKey('sagwa')).toBe('s');
+  });
+
+  it('should group digits and other characters', () => {
+    expect(prebuiltShardKey('2024')).toBe('0');
+    expect(prebuiltShardKey('éclair')).toBe('other');
+    expect(prebuiltShardKey('ㅊㅅ')).toBe('other');
+  });
+
+  it('should match the shards the pipeline wrote', async () => {
+    const { fetchFile } = createFetcher();
+    const manifest = (await fetchFile('search/manifest.json')) as PrebuiltManifest;
+    for (const [key, record] of Object.entries(manifest.shards)) {
+      const shard = (await fetchFile(record.file)) as { terms: string[] };
+      for (const term of shard.terms) {
+        expect(prebuiltShardKey(term)).toBe(key);
+      }
+    }
+  });
+});
+
+describe('PrebuiltIndex', () => {
+  it('should load the manifest and document table only', async () => {
+    const { index, fetched } = await loadIndex();
+    expect(index.documentCount).toBe(9);
+    expect(fetched).toEqual(['search/manifest.json', 'search/docs.json']);
+  });
+
+  it('should reject a different index version', async () => {
+    const { fetchFile } = createFetcher();
+    const manifest = (await fetchFile('search/manifest.json')) as PrebuiltManifest;
+    const documents = (await fetchFile(manifest.documents.file)) as unknown[][];
+    const version = PREBUILT_INDEX_VERSION + 1;
+    expect(() => new PrebuiltIndex({ ...manifest, version }, documents, fetchFile)).toThrow(
+      `Unsupported search index version ${version}`,
+    );
+  });
+
+  describe('search', () => {
+    it('should decode delta-encoded postings and field masks', async () => {
+      const { index } = await loadIndex();
+      // apple: [(7 << 3) | 4, (1 << 3) | 4] → 문서 7, 8 의 translations.en.word
+      const results = await index.search('apple');
+      expect(results.map((result) => result.id)).toEqual(['sagwa', 'sagwa-juseu']);
+      expect(results[0]?.match).toEqual({ apple: ['translations.en.word'] });
+      expect(results[0]?.item).toEqual({
+        id: 'sagwa',
+        korean: '사과',
+        romanization: 'sagwa',
+        categoryId: 'food',
+        difficulty: 'beginner',
+      });
+    });
+
+    it('should fetch only the shard of each query word, once', async () => {
+      const { index, fetched } = await loadIndex();
+      await index.search('출석');
+      await index.search('출발');
+      expect(fetched.slice(2)).toEqual(['search/ko-14.json']);
+    });
+
+    it('should require every word and match the last as a prefix', async () => {
+      const { index } = await loadIndex();
+      const results = await index.search('사과 주');
+      expect(results.map((result) => result.id)).toEqual(['sagwa-juseu']);
+      expect(results[0]?.score).toBe(1.5);
+    });
+
+    it('should score prefix matches lower than exact matches', async () => {
+      const { index } = await loadIndex();
+      const results = await index.search('안녕');
+      expect(results.map((result) => [result.id, result.score])).toEqual([
+        ['annyeong', 1],
+        ['annyeonghaseyo', 0.5],
+      ]);
+    });
+
+    it('should apply field boosts', async () => {
+      const { index } = await loadIndex({ romanization: 3 });
+      const results = await index.search('sagwa');
+      expect(results.map((result) => [result.id, result.score])).toEqual([
+        ['sagwa', 3],
+        ['sagwa-juseu', 3],
+      ]);
+    });
+
+    it('should respect the limit', async () => {
+      const { index } = await loadIndex();
+      expect(await index.search('a', 2)).toHaveLength(2);
+    });
+
+    it('should return nothing for a missing shard or empty query', async () => {
+      const { index } = await loadIndex();
+      expect(await index.search('zebra')).toEqual([]);
+      expect(await index.search('   ')).toEqual([]);
+    });
+  });
+
+  describe('suggest', () => {
+    it('should suggest terms by document count, then alphabetically', async () => {
+      const { index } = await loadIndex();
+      expect(await index.suggest('a', 3)).toEqual(['apple', 'annyeong', 'annyeonghaseyo']);
+    });
+
+    it('should complete the last word of the query', async () => {
+      const { index } = await loadIndex();
+      expect(await index.suggest('사과 주')).toEqual(['주스']);
+      expect(await index.suggest('출')).toEqual(['출발', '출석']);
+    });
+
+    it('should return nothing without a matching term', async () => {
+      const { index } = await loadIndex();
+      expect(await index.suggest('zz')).toEqual([]);
+      expect(await index.suggest('ax')).toEqual([]);
+      expect(await index.suggest('')).toEqual([]);
+    });
+  });
+
+  describe('searchChosung', () => {
+    it('should match words by their chosung', async () => {
+      const { index } = await loadIndex();
+      const results = await index.searchChosung('ㅊㅅ');
+      // 출석, 추석 과 대화 제목 '출석 부르기'
+      expect(results.map((item) => item.id)).toEqual(['chulseok', 'chuseok', 'school-1']);
+      expect(results[2]?.korean).toBe('출석 부르기');
+    });
+
+    it('should accept partly composed input', async () => {
+      const { index } = await loadIndex();
+      expect((await index.searchChosung('출ㅂ')).map((item) => item.id)).toEqual(['chulbal']);
+      expect((await index.searchChosung('ㅅㄱㅈ')).map((item) => item.id)).toEqual([
+        'sagwa-juseu',
+      ]);
+    });
+
+    it('should look up a single chosung and respect the limit', async () => {
+      const { index } = await loadIndex();
+      expect((await index.searchChosung('ㅇ')).map((item) => item.id)).toEqual([
+        'annyeong',
+        'annyeonghaseyo',
+        'apateu',
+      ]);
+      expect((await index.searchChosung('ㅇ', 1)).map((item) => item.id)).toEqual(['annyeong']);
+    });
+
+    it('should match a sequence across words and miss absent ones', async () => {
+      const { index } = await loadIndex();
+      // '출석 부르기' → ㅊㅅㅂㄹㄱ
+      expect((await index.searchChosung('ㅊㅅㅂ')).map((item) => item.id)).toEqual(['school-1']);
+      expect(await index.searchChosung('ㅊㅋ')).toEqual([]);
+    });
+
+    it('should not fetch the index for a query without Hangul', async () => {
+      const { index, fetched } = await loadIndex();
+      expect(await index.searchChosung('abc')).toEqual([]);
+      expect(fetched).not.toContain('search/chosung.json');
+    });
+  });
+
+  describe('searchJamo', () => {
+    it('should find a word with a one-jamo typo', async () => {
+      const { index } = await loadIndex();
+      const results = await index.searchJamo('안녕하새요');
+      expect(results.map((result) => result.item.id)).toEqual(['annyeonghaseyo']);
+      // 파이프라인의 search_jamo 와 같은 점수 (Dice 계수 16/22)
+      expect(results[0]?.score).toBeCloseTo(0.7273, 4);
+    });
+
+    it('should rank a half-typed word by coverage', async () => {
+      const { index } = await loadIndex();
+      const results = await index.searchJamo('출바');
+      expect(results.map((result) => [result.item.id, result.score])).toEqual([
+        ['chulbal', 0.9],
+        ['chulseok', 0.45],
+        ['school-1', 0.45],
+      ]);
+    });
+
+    it('should apply minSimilarity and the limit', async () => {
+      const { index } = await loadIndex();
+      expect((await index.searchJamo('출바', undefined, 0.9)).map((r) => r.item.id)).toEqual([
+        'chulbal',
+      ]);
+      expect((await index.searchJamo('사고', 1)).map((r) => r.item.id)).toEqual(['sagwa']);
+    });
+
+    it('should return nothing for unrelated or non-Hangul input', async () => {
+      const { index } = await loadIndex();
+      expect(await index.searchJamo('컴퓨터')).toEqual([]);
+      expect(await index.searchJamo('hello')).toEqual([]);
+    });
+  });
+});
+
+describe('chosungSequence', () => {
+  it('should take the chosung of syllables and keep typed consonants', () => {
+    expect(chosungSequence('출석')).toBe('ㅊㅅ');
+    expect(chosungSequence('출ㅂ')).toBe('ㅊㅂ');
+    expect(chosungSequence('사과 주스')).toBe('ㅅㄱㅈㅅ');
+  });
+
+  it('should drop vowels and other characters', () => {
+    expect(chosungSequence('ㅏabc')).toBe('');
+  });
+});
+
+describe('jamoSequence', () => {
+  it('should split syllables in typing order', () => {
+    expect(jamoSequence('출석')).toBe('ㅊㅜㄹㅅㅓㄱ');
+    expect(jamoSequence('과')).toBe('ㄱㅗㅏ');
+    expect(jamoSequence('닭')).toBe('ㄷㅏㄹㄱ');
+  });
+
+  it('should split compound compatibility jamo', () => {
+    expect(jamoSequence('ㅘㄳ')).toBe('ㅗㅏㄱㅅ');
+    expect(jamoSequence('a1')).toBe('');
+  });
+});